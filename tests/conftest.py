@@ -0,0 +1,27 @@
+# The tools are loose scripts that import their siblings by module name, so
+# put each tool folder on sys.path the way running the script would.
+
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOOL_DIRS = [
+    os.path.join(ROOT, "tools"),
+    os.path.join(ROOT, "tools", "cost_of_living"),
+    os.path.join(ROOT, "tools", "test_tools"),
+    os.path.join(ROOT, "tools", "calculators", "contract_rates"),
+]
+for path in TOOL_DIRS:
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def load_script(relative_path, name):
+    """Import a script whose file name is not a valid module name."""
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, relative_path))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
@@ -0,0 +1,67 @@
+# bill_engine.calculate_bills() must price every bill exactly as the
+# interactive calculate_bill() does.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bill_engine import calculate_bills
+from conftest import load_script
+
+AMOUNTS = ["Gross Bill ($)", "Solar Credit ($)", "Net Bill ($)", "Cost Per Day ($)"]
+
+
+@pytest.fixture(scope="module")
+def comparison():
+    return load_script("tools/cost_of_living/Electricity&GasPriceComparison_with_output.py",
+                       "comparison")
+
+
+def _assert_matches(comparison, service, usage, rates):
+    batch = calculate_bills(service, pd.DataFrame(usage), pd.DataFrame(rates))
+    expected = [comparison.calculate_bill(service, rate["supplier_name"], rate["supplier_type"],
+                                          household, rate)
+                for household in usage for rate in rates]
+    for col in AMOUNTS:
+        assert batch[col].tolist() == [bill[col] for bill in expected], col
+
+
+def test_electricity_batch_matches_calculate_bill(comparison):
+    rng = np.random.default_rng(1)
+    usage = [{"peak_usage": round(rng.uniform(0, 900), 3),
+              "offpeak_usage": round(rng.uniform(0, 600), 3),
+              "shoulder_usage": round(rng.uniform(0, 300), 3),
+              "solar_export_kwh": round(rng.uniform(0, 400), 3),
+              "billing_days": int(rng.integers(28, 95))} for _ in range(40)]
+    rates = [{"supplier_name": f"E{i}", "supplier_type": "Prospective",
+              "peak_rate": round(rng.uniform(20, 45), 4),
+              "offpeak_rate": round(rng.uniform(10, 25), 4),
+              "shoulder_rate": round(rng.uniform(15, 35), 4),
+              "daily_supply_charge": round(rng.uniform(80, 130), 4),
+              "feed_in_rate": round(rng.uniform(0, 12), 4)} for i in range(15)]
+    _assert_matches(comparison, "Electricity", usage, rates)
+
+
+def test_gas_batch_matches_calculate_bill(comparison):
+    rng = np.random.default_rng(2)
+    usage = [{"tier1_units": round(rng.uniform(0, 2000), 2),
+              "tier2_units": round(rng.uniform(0, 1500), 2),
+              "tier3_units": round(rng.uniform(0, 800), 2),
+              "billing_days": int(rng.integers(28, 95))} for _ in range(40)]
+    rates = [{"supplier_name": f"G{i}", "supplier_type": "Prospective",
+              "tier1_rate": round(rng.uniform(2, 6), 4),
+              "tier2_rate": round(rng.uniform(2, 6), 4),
+              "tier3_rate": round(rng.uniform(2, 6), 4),
+              "daily_supply_charge": round(rng.uniform(60, 110), 4)} for i in range(15)]
+    _assert_matches(comparison, "Gas", usage, rates)
+
+
+def test_aligned_prices_row_pairs():
+    usage = pd.DataFrame({"peak_usage": [100.0, 200.0], "offpeak_usage": [50.0, 0.0],
+                          "billing_days": [30, 60]})
+    rates = pd.DataFrame({"supplier_name": ["A", "B"], "supplier_type": ["Current", "Prospective"],
+                          "peak_rate": [30.0, 25.0], "offpeak_rate": [15.0, 10.0],
+                          "daily_supply_charge": [100.0, 90.0]})
+    aligned = calculate_bills("Electricity", usage, rates, aligned=True)
+    full = calculate_bills("Electricity", usage, rates)
+    assert aligned["Net Bill ($)"].tolist() == full["Net Bill ($)"].iloc[[0, 3]].tolist()
@@ -0,0 +1,93 @@
+# The HTTP front end prices requests like price_requests(), rejects
+# malformed ones and shuts down cleanly.
+
+import asyncio
+import json
+import random
+import time
+
+from comparison_service import (ComparisonService, MicroBatcher, _json_default,
+                                 load_comparison_script, price_requests, validate_request)
+from service_load_test import make_request, post_json
+
+GAS_REQUEST = {"service": "gas",
+               "usage": {"billing_days": 91, "tier1_units": 900.0, "tier2_units": 400.0,
+                         "tier3_units": 0.0},
+               "tariffs": [{"supplier_name": "Current", "supplier_type": "current",
+                            "daily_supply_charge": 80.0, "tier1_rate": 3.2,
+                            "tier2_rate": 2.9, "tier3_rate": 2.5},
+                           {"supplier_name": "Offer", "daily_supply_charge": 95.0,
+                            "tier1_rate": 2.8, "tier2_rate": 2.6, "tier3_rate": 2.4}]}
+
+
+async def _exchange(service, raw):
+    server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+    async with server:
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+    return response
+
+
+def test_bad_content_length_is_a_400():
+    service = ComparisonService(port=0)
+    for length in [b"abc", b"-5"]:
+        response = asyncio.run(_exchange(
+            service, b"POST /compare HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n"))
+        assert response.startswith(b"HTTP/1.1 400 ")
+        assert b"invalid Content-Length" in response
+
+
+def test_close_waits_for_batches_in_flight():
+    async def run():
+        def price(requests):
+            time.sleep(0.05)
+            return [len(requests)] * len(requests)
+
+        batcher = MicroBatcher(price, max_wait=0)
+        pending = [asyncio.ensure_future(batcher.submit({})) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        assert batcher._tasks
+        await batcher.close()
+        assert not batcher._tasks
+        return await asyncio.gather(*pending)
+
+    assert asyncio.run(run()) == [3, 3, 3]
+
+
+def test_batched_compare_matches_price_requests():
+    rng = random.Random(11)
+    payloads = [make_request(rng, 4) for _ in range(7)] + [GAS_REQUEST]
+    service = ComparisonService(port=0, max_wait_ms=50)
+
+    async def run():
+        server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+        async with server:
+            port = server.sockets[0].getsockname()[1]
+
+            async def post(payload):
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                try:
+                    return await post_json(reader, writer, "127.0.0.1", "/compare", payload)
+                finally:
+                    writer.close()
+
+            replies = await asyncio.gather(*[post(payload) for payload in payloads])
+        await service.batcher.close()
+        return replies
+
+    replies = asyncio.run(run())
+    assert [status for status, _ in replies] == [200] * len(payloads)
+    # Concurrent requests are priced together rather than one by one.
+    assert service.batcher.batches < len(payloads)
+
+    direct = price_requests([validate_request(payload) for payload in payloads],
+                            load_comparison_script())
+    expected = json.loads(json.dumps(direct, default=_json_default))
+    assert [reply["results"] for _, reply in replies] == expected
+    for results in expected:
+        assert [row["Rank"] for row in results] == list(range(1, len(results) + 1))
+        assert any(row["% Saved vs Current"] for row in results)
@@ -0,0 +1,50 @@
+# The interactive loop: continue mode keeps earlier rows without pricing the
+# catalogue a second time.
+
+import pytest
+
+from conftest import load_script
+from tariff_catalogue import TariffCatalogue
+
+USAGE = {"peak_usage": 300.0, "offpeak_usage": 150.0, "billing_days": 30,
+         "solar_export_kwh": 0}
+RATES = {"peak_rate": 30.0, "offpeak_rate": 15.0, "daily_supply_charge": 100.0,
+         "feed_in_rate": 0}
+
+
+@pytest.fixture(scope="module")
+def comparison():
+    return load_script("tools/cost_of_living/Electricity&GasPriceComparison_with_output.py",
+                       "comparison")
+
+
+def test_continue_mode_prices_the_catalogue_once(comparison, tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / "catalogue.db")
+    with TariffCatalogue(path) as catalogue:
+        catalogue.add("Electricity", "Cat A", dict(RATES, peak_rate=25.0))
+        catalogue.add("Electricity", "Cat B", dict(RATES, offpeak_rate=12.0))
+
+    tables = []
+    passes = iter([True, False])  # start another comparison once, then stop
+
+    class Table(comparison.ResultsTable):
+        def __init__(self, rows=None):
+            super().__init__(rows)
+            tables.append(self)
+
+    def yes_no(prompt):
+        if "start another comparison" in prompt:
+            return next(passes)
+        return "Compare against all" in prompt
+
+    monkeypatch.setattr(comparison, "ResultsTable", Table)
+    monkeypatch.setattr(comparison, "get_yes_no", yes_no)
+    monkeypatch.setattr(comparison, "get_service_choice", lambda: "electricity")
+    monkeypatch.setattr(comparison, "get_electricity_usage", lambda: dict(USAGE))
+    monkeypatch.setattr(comparison, "get_electricity_rates", lambda usage: dict(RATES))
+    monkeypatch.setattr(comparison, "get_user_input", lambda prompt: "Current Co")
+    comparison.main(path)
+    capsys.readouterr()
+
+    suppliers = sorted(row["Supplier"] for row in tables[0].rows)
+    assert suppliers == ["Cat A", "Cat B", "Current Co"]
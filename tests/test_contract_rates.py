@@ -0,0 +1,42 @@
+# Batch mode skips invalid rows one by one instead of losing their chunk.
+
+import csv
+
+import pytest
+
+from contract_rates_calculator import CSV_HEADER, run_batch
+
+ROWS = [
+    {"input_type": "1", "amount": "120000", "contract_length": "6", "contract_unit": "M"},
+    {"input_type": "3", "amount": "nan", "contract_length": "6", "contract_unit": "M"},
+    {"input_type": "3", "amount": "850", "contract_length": "inf", "contract_unit": "W"},
+    {"input_type": "2", "amount": "-inf", "contract_length": "3", "contract_unit": "M"},
+    {"input_type": "3", "amount": "850", "contract_length": "12", "contract_unit": "W"},
+]
+
+
+def test_non_finite_rows_are_skipped(tmp_path, capsys):
+    source = tmp_path / "requests.csv"
+    with open(source, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(ROWS[0]))
+        writer.writeheader()
+        writer.writerows(ROWS)
+    output = tmp_path / "rates.csv"
+
+    assert run_batch(str(source), str(output)) == (2, 3)
+    with open(output, newline="") as f:
+        results = list(csv.reader(f))
+    assert results[0] == CSV_HEADER
+    assert [row[0] for row in results[1:]] == ["incl", "incl"]
+    errors = capsys.readouterr().err
+    assert [f"requests.csv:{line}: skipped" in errors for line in (3, 4, 5)] == [True] * 3
+
+
+@pytest.mark.parametrize("amount", ["nan", "inf"])
+def test_single_bad_row_leaves_the_rest_of_the_chunk(tmp_path, amount, capsys):
+    source = tmp_path / "requests.csv"
+    with open(source, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(ROWS[0]))
+        writer.writeheader()
+        writer.writerows([ROWS[0]] * 3 + [dict(ROWS[0], amount=amount)] + [ROWS[4]] * 3)
+    assert run_batch(str(source), str(tmp_path / "rates.csv")) == (6, 1)
@@ -0,0 +1,72 @@
+# Integer-cents rounding: the scalar and array paths agree, and both match
+# the decimal module for every supported rounding mode.
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from money import (ROUNDING_MODES, divide_cents, from_cents, round_money,
+                   scale_cents, to_cents)
+
+# Ties at half a cent (as written), either sign, plus ordinary amounts.
+AMOUNTS = [0.0, 0.005, 0.015, 0.025, 1.005, 2.675, 10.125, 1234.565,
+           -0.005, -1.005, -2.675, 0.004, 0.006, 99.999, 0.3, 7.0]
+
+
+def _decimal_cents(amount, rounding):
+    return int((Decimal(repr(amount)) * 100).quantize(Decimal(1), rounding=rounding))
+
+
+@pytest.mark.parametrize("rounding", ROUNDING_MODES)
+def test_to_cents_matches_decimal(rounding):
+    expected = [_decimal_cents(amount, rounding) for amount in AMOUNTS]
+    assert [to_cents(amount, rounding) for amount in AMOUNTS] == expected
+    assert to_cents(np.array(AMOUNTS), rounding).tolist() == expected
+
+
+def test_half_up_is_the_default():
+    assert to_cents(1.005) == 101
+    assert to_cents(-1.005) == -101
+    assert round_money(2.675) == 2.68
+    assert round_money(np.array([2.675, 0.125])).tolist() == [2.68, 0.13]
+
+
+def test_float_noise_is_not_rounded_away_from_zero():
+    # 0.1 + 0.2 is 0.30000000000000004; that is 30 cents, not 31.
+    assert to_cents(0.1 + 0.2, "ROUND_UP") == 30
+    assert to_cents(np.array([0.1 + 0.2]), "ROUND_CEILING").tolist() == [30]
+
+
+@pytest.mark.parametrize("rounding", ROUNDING_MODES)
+def test_divide_and_scale_scalar_matches_array(rounding):
+    cents = [0, 1, 5, 101, 250, 999, 12345, -7, -250]
+    divisors = [1, 2, 3, 4, 7, 8, 30, 90, 365]
+    for divisor in divisors:
+        batch = divide_cents(np.array(cents), divisor, rounding).tolist()
+        assert batch == [divide_cents(c, divisor, rounding) for c in cents]
+        expected = [int((Decimal(c) / Decimal(divisor)).quantize(Decimal(1), rounding=rounding))
+                    for c in cents]
+        assert batch == expected
+    factors = [0.115, 0.12, 1.5, 0.5, 1.2]
+    for factor in factors:
+        batch = scale_cents(np.array(cents), factor, rounding).tolist()
+        assert batch == [scale_cents(c, factor, rounding) for c in cents]
+
+
+def test_divide_cents_ties():
+    assert divide_cents(5, 2) == 3
+    assert divide_cents(-5, 2) == -3
+    assert divide_cents(5, 2, "ROUND_HALF_EVEN") == 2
+    assert divide_cents(7, 2, "ROUND_HALF_EVEN") == 4
+
+
+def test_from_cents_and_errors():
+    assert from_cents(101) == 1.01
+    assert from_cents(np.array([101, -5])).tolist() == [1.01, -0.05]
+    with pytest.raises(ValueError):
+        to_cents(1.0, "ROUND_SIDEWAYS")
+    with pytest.raises(ValueError):
+        to_cents(float("nan"))
+    with pytest.raises(ValueError):
+        to_cents(np.array([1.0, np.inf]))
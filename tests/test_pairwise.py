@@ -0,0 +1,176 @@
+# Generated suites are checked against brute force: every combination of
+# values the model allows must appear in some test case.
+
+import csv
+import os
+import subprocess
+import sys
+from itertools import combinations, product
+
+import pytest
+
+from pairwise import calculate_pairwise_test_cases, calculate_smallest_test_cases
+from pairwise_constraints import Constraints
+from pairwise_engine import DONT_CARE, PairCoverage, covering_rows, decode
+
+MODELS = [
+    [("A", ["a1", "a2"]), ("B", ["b1", "b2"]), ("C", ["c1", "c2"])],
+    [("Browser", ["Chrome", "Firefox", "Safari", "Edge"]), ("OS", ["Windows", "macOS", "Linux"]),
+     ("Locale", ["en", "fr"]), ("Screen", ["small", "large"]), ("Login", ["yes", "no"])],
+    [(f"P{i}", [f"v{j}" for j in range(size)]) for i, size in enumerate([5, 4, 3, 3, 2, 2, 2])],
+]
+
+
+def _uncovered(parameters, cases, strength):
+    """Every ``strength``-way combination of values that no test case contains."""
+    seen = {tuple(case[name] for name, _ in parameters) for case in cases}
+    missing = []
+    for combo in combinations(range(len(parameters)), strength):
+        for values in product(*(parameters[p][1] for p in combo)):
+            if not any(all(row[p] == value for p, value in zip(combo, values)) for row in seen):
+                missing.append(dict(zip((parameters[p][0] for p in combo), values)))
+    return missing
+
+
+@pytest.mark.parametrize("parameters", MODELS)
+def test_every_pair_is_covered(parameters):
+    cases = calculate_pairwise_test_cases(parameters)
+    assert _uncovered(parameters, cases, 2) == []
+    assert all(set(case) == {name for name, _ in parameters} for case in cases)
+
+
+def test_pairwise_is_smaller_than_exhaustive():
+    parameters = MODELS[2]
+    cases = calculate_pairwise_test_cases(parameters)
+    # At least the largest two parameters' product, far below the full product.
+    assert 5 * 4 <= len(cases) < 5 * 4 * 3 * 3 * 2 * 2 * 2 // 4
+
+
+@pytest.mark.parametrize("strength", [3, 4])
+def test_every_t_way_combination_is_covered(strength):
+    parameters = MODELS[1] + [("Theme", ["light", "dark"])]
+    cases = calculate_pairwise_test_cases(parameters, strength=strength)
+    assert _uncovered(parameters, cases, strength) == []
+
+
+def test_full_strength_is_exhaustive():
+    parameters = MODELS[0]
+    cases = calculate_pairwise_test_cases(parameters, strength=3)
+    assert len(cases) == 8
+    assert _uncovered(parameters, cases, 3) == []
+
+
+# Rules in the constraints-file syntax, each with the same rule as a check on
+# a whole test case.
+RULES = [
+    ("Browser = Safari, OS = Windows",
+     lambda c: c["Browser"] == "Safari" and c["OS"] == "Windows"),
+    ("IF Browser = Safari THEN OS = macOS",
+     lambda c: c["Browser"] == "Safari" and c["OS"] != "macOS"),
+    ("IF OS = Linux THEN Browser not in (Safari, Edge)",
+     lambda c: c["OS"] == "Linux" and c["Browser"] in ("Safari", "Edge")),
+    ("Locale = fr AND Screen = small AND Login = no",
+     lambda c: c["Locale"] == "fr" and c["Screen"] == "small" and c["Login"] == "no"),
+]
+
+
+def _valid_cases(parameters, broken):
+    names = [name for name, _ in parameters]
+    every = [dict(zip(names, values)) for values in product(*(v for _, v in parameters))]
+    return [case for case in every if not any(rule(case) for rule in broken)]
+
+
+@pytest.mark.parametrize("strength", [2, 3])
+def test_constraints_are_respected_and_valid_tuples_covered(strength):
+    parameters = MODELS[1]
+    constraints = Constraints(parameters)
+    for text, _ in RULES:
+        constraints.add_rule(text)
+    names, values, rows, excluded = covering_rows(parameters, strength, constraints)
+    cases = decode(rows, names, values)
+
+    broken = [rule for _, rule in RULES]
+    assert not [case for case in cases if any(rule(case) for rule in broken)]
+    # Combinations no valid test case can hold are the excluded ones; every
+    # other combination is covered.
+    impossible = _uncovered(parameters, _valid_cases(parameters, broken), strength)
+    assert _uncovered(parameters, cases, strength) == impossible
+    assert excluded == len(impossible) > 0
+
+
+@pytest.mark.parametrize("strength", [2, 3])
+def test_a_seed_regenerates_the_same_suite(strength):
+    parameters = MODELS[2]
+    runs = [calculate_pairwise_test_cases(parameters, strength, seed=seed) for seed in [7, 7, 8]]
+    assert runs[0] == runs[1]
+    assert runs[0] != runs[2]
+    for cases in runs:
+        assert _uncovered(parameters, cases, strength) == []
+
+
+def test_smallest_suite_is_reproducible_from_its_seed(capsys):
+    parameters = MODELS[2]
+    seed, cases = calculate_smallest_test_cases(parameters, [None, 1, 2, 3], workers=1)
+    capsys.readouterr()
+    assert calculate_pairwise_test_cases(parameters, seed=seed) == cases
+    # The worker pool finds the same suites as running in this process.
+    assert calculate_smallest_test_cases(parameters, [None, 1, 2, 3], workers=2) == (seed, cases)
+
+
+def test_streaming_to_a_closed_pipe_exits_cleanly(tmp_path):
+    model = tmp_path / "parameters.csv"
+    with open(model, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([f"P{i}" for i in range(8)])
+        writer.writerows([f"v{j}"] * 8 for j in range(6))
+    script = os.path.join(os.path.dirname(__file__), "..", "tools", "test_tools", "pairwise.py")
+    # Like "| head -1": read the header, then stop reading.
+    process = subprocess.Popen([sys.executable, script, "--input", str(model), "--output", "-",
+                                "--quiet"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    assert process.stdout.readline().startswith(b"P0,")
+    process.stdout.close()
+    _, errors = process.communicate(timeout=60)
+    assert process.returncode == 0
+    assert b"BrokenPipe" not in errors
+
+
+class _ShortSearch(Constraints):
+    """Constraints whose completion search gives up on any row with OS set next to Chrome.
+
+    This stands in for complete() running out of its search budget, so a
+    value of OS can never be checked for a Chrome test case and the engine
+    has to leave OS as a don't-care until the row is completed.
+    """
+
+    def complete(self, row, budget=10000):
+        if row[0] == 0 and row[1] != DONT_CARE:
+            return None
+        return super().complete(row, budget)
+
+
+def test_unchecked_values_are_completed_before_covering(monkeypatch):
+    parameters = MODELS[1]
+    constraints = _ShortSearch(parameters)
+    for text, _ in RULES:
+        constraints.add_rule(text)
+    dont_cares = []
+    best_value = PairCoverage.best_value
+
+    def spy(self, *args, **kwargs):
+        value = best_value(self, *args, **kwargs)
+        dont_cares.append(value == DONT_CARE)
+        return value
+
+    monkeypatch.setattr(PairCoverage, "best_value", spy)
+    names, values, rows, excluded = covering_rows(parameters, 2, constraints)
+    assert any(dont_cares)
+
+    assert all(DONT_CARE not in row for row in rows)
+    cases = decode(rows, names, values)
+    broken = [rule for _, rule in RULES]
+    assert not [case for case in cases if any(rule(case) for rule in broken)]
+    # Only pairs of Chrome with an OS could not be checked; every other valid
+    # pair is covered.
+    impossible = _uncovered(parameters, _valid_cases(parameters, broken), 2)
+    missing = [pair for pair in _uncovered(parameters, cases, 2) if pair not in impossible]
+    assert all(pair.get("Browser") == "Chrome" and "OS" in pair for pair in missing)
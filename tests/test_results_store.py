@@ -0,0 +1,87 @@
+import pandas as pd
+import pytest
+
+from results_store import SCHEMA_VERSION, ResultsSink, read_csv_schema, read_results
+
+COLUMNS = ["Service", "Supplier", "Peak Rate (c/kWh)", "Shoulder Rate (c/kWh)", "Net Bill ($)"]
+
+
+def _rows(supplier, net):
+    return pd.DataFrame([{"Service": "Electricity", "Supplier": supplier,
+                          "Peak Rate (c/kWh)": 30.0, "Shoulder Rate (c/kWh)": 25.0,
+                          "Net Bill ($)": net}])
+
+
+@pytest.mark.parametrize("legacy_rows", [0, 2])
+def test_legacy_results_file_is_migrated(tmp_path, legacy_rows):
+    # The tool used to append plain df.to_csv() output with a header only on
+    # the first write, and had no shoulder rate column.
+    path = str(tmp_path / "comparison_results.csv")
+    legacy = pd.DataFrame({"Service": ["Gas"] * legacy_rows, "Supplier": ["Old"] * legacy_rows,
+                           "Peak Rate (c/kWh)": [None] * legacy_rows,
+                           "Net Bill ($)": [12.5] * legacy_rows},
+                          columns=["Service", "Supplier", "Peak Rate (c/kWh)", "Net Bill ($)"])
+    legacy.to_csv(path, index=False)
+
+    with ResultsSink(path) as sink:
+        sink.write(_rows("New", 99.1))
+
+    assert read_csv_schema(path) == (SCHEMA_VERSION, COLUMNS)
+    results = read_results(path)
+    assert results["Supplier"].tolist() == ["Old"] * legacy_rows + ["New"]
+    assert results["Net Bill ($)"].tolist() == [12.5] * legacy_rows + [99.1]
+
+
+def test_mismatched_schema_is_rejected(tmp_path):
+    path = str(tmp_path / "results.csv")
+    pd.DataFrame(columns=["Something Else"]).to_csv(path, index=False)
+    with pytest.raises(ValueError):
+        with ResultsSink(path) as sink:
+            sink.write(_rows("New", 1.0))
+
+
+def test_appends_keep_one_header(tmp_path):
+    path = str(tmp_path / "results.csv")
+    for net in (1.0, 2.0):
+        with ResultsSink(path) as sink:
+            sink.write(_rows("A", net))
+    assert read_results(path)["Net Bill ($)"].tolist() == [1.0, 2.0]
+
+
+def test_parquet_electricity_and_gas_chunks_read_back(tmp_path):
+    pytest.importorskip("pyarrow")
+    from bill_engine import calculate_bills
+
+    path = str(tmp_path / "results")
+    electricity = calculate_bills(
+        "Electricity", pd.DataFrame([{"household": "H1", "peak_usage": 300.0, "offpeak_usage": 100.0,
+                                      "billing_days": 30, "solar_export_kwh": 0.0}]),
+        pd.DataFrame([{"supplier_name": "E", "supplier_type": "Current", "peak_rate": 30.0,
+                       "offpeak_rate": 15.0, "daily_supply_charge": 100.0}]))
+    gas = calculate_bills(
+        "Gas", pd.DataFrame([{"household": "H2", "billing_days": 30, "tier1_units": 500.0,
+                              "tier2_units": 0.0, "tier3_units": 0.0}]),
+        pd.DataFrame([{"supplier_name": "G", "supplier_type": "Current", "tier1_rate": 3.0,
+                       "tier2_rate": 2.5, "tier3_rate": 2.0, "daily_supply_charge": 80.0}]))
+    # Separate runs append to the same dataset; each chunk leaves the other
+    # fuel's rate columns blank.
+    for chunk in (electricity, gas):
+        with ResultsSink(path, format="parquet") as sink:
+            sink.write(chunk)
+
+    results = read_results(path).sort_values("Service", ignore_index=True)
+    assert results["Service"].tolist() == ["Electricity", "Gas"]
+    assert results["Peak Rate (c/kWh)"].isna().tolist() == [False, True]
+    assert results["Tier1 Rate (c/unit)"].isna().tolist() == [True, False]
+    assert results["Net Bill ($)"].tolist() == electricity["Net Bill ($)"].tolist() + \
+        gas["Net Bill ($)"].tolist()
+
+
+def test_parquet_dataset_with_other_columns_is_rejected(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "results")
+    with ResultsSink(path, format="parquet") as sink:
+        sink.write(_rows("A", 1.0))
+    with pytest.raises(ValueError):
+        with ResultsSink(path, columns=COLUMNS[:-1], format="parquet") as sink:
+            sink.write(_rows("B", 2.0).drop(columns="Net Bill ($)"))
@@ -0,0 +1,55 @@
+# --solar-profile prices the shared tariffs plus the chosen household's own,
+# never other households' current tariffs.
+
+import pandas as pd
+import pytest
+
+from conftest import load_script
+from results_store import read_results
+
+TARIFFS = pd.DataFrame([
+    {"household": "", "service": "electricity", "supplier_type": "prospective",
+     "supplier_name": "Shared", "peak_rate": 28.0, "offpeak_rate": 14.0,
+     "daily_supply_charge": 95.0, "feed_in_rate": 5.0},
+    {"household": "H1", "service": "electricity", "supplier_type": "current",
+     "supplier_name": "Mine", "peak_rate": 32.0, "offpeak_rate": 18.0,
+     "daily_supply_charge": 105.0, "feed_in_rate": 4.0},
+    {"household": "H2", "service": "electricity", "supplier_type": "current",
+     "supplier_name": "Theirs", "peak_rate": 20.0, "offpeak_rate": 10.0,
+     "daily_supply_charge": 80.0, "feed_in_rate": 7.0},
+])
+
+
+@pytest.fixture(scope="module")
+def comparison():
+    return load_script("tools/cost_of_living/Electricity&GasPriceComparison_with_output.py",
+                       "comparison")
+
+
+@pytest.fixture
+def files(tmp_path):
+    profile = tmp_path / "profile.csv"
+    times = pd.date_range("2024-07-01", periods=48 * 7, freq="30min")
+    pd.DataFrame({"timestamp": times, "consumption_kwh": 0.4,
+                  "generation_kwh": [0.8 if 9 <= t.hour < 15 else 0.0 for t in times]}
+                 ).to_csv(profile, index=False)
+    tariffs = tmp_path / "tariffs.csv"
+    TARIFFS.to_csv(tariffs, index=False)
+    return str(profile), str(tariffs), str(tmp_path / "solar.csv")
+
+
+@pytest.mark.parametrize("household, suppliers", [
+    ("H1", ["Mine", "Shared"]),
+    (None, ["Shared"]),
+])
+def test_only_the_households_own_tariffs_are_priced(comparison, files, household, suppliers):
+    profile, tariffs, output = files
+    comparison.run_solar(profile, tariffs, output, household=household)
+    results = read_results(output)
+    assert sorted(results["Supplier"]) == suppliers
+
+
+def test_unknown_household_is_rejected(comparison, files):
+    profile, tariffs, output = files
+    with pytest.raises(ValueError, match="H3"):
+        comparison.run_solar(profile, tariffs, output, household="H3")
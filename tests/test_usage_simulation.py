@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from usage_simulation import nearest_rank
+
+
+@pytest.mark.parametrize("n", [1, 2, 19, 20, 100, 1001])
+@pytest.mark.parametrize("pct", [0, 5, 50, 95, 99.5, 100])
+def test_nearest_rank_matches_inverted_cdf(n, pct):
+    values = np.random.default_rng(n).normal(size=n)
+    expected = np.percentile(values, pct, method="inverted_cdf")
+    assert np.sort(values)[nearest_rank(pct, n)] == expected
+
+
+def test_p95_is_not_biased_low():
+    # A floor of 0.95 * (n - 1) gives index 27 of 30; nearest rank is 28.
+    assert nearest_rank(95, 30) == 28
+    assert nearest_rank(5, 30) == 1
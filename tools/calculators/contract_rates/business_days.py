@@ -0,0 +1,88 @@
+# Calendar-aware working days for the contract rate calculator.
+#
+# A BusinessCalendar counts the real business days between dates: weekdays
+# (per a NumPy weekmask) that are not public holidays. Holidays come from
+# local files, one date per line, optionally followed by a name:
+#   # date,name
+#   2025-01-01,New Year's Day
+#   2025-01-27,Australia Day
+# Blank lines and lines starting with "#" are ignored, as is a header row.
+#
+# Counting uses a precomputed index: a running total of business days for
+# every date in whole calendar years, so any count is two array lookups and
+# thousands of contracts are counted in one vectorised step. The index
+# grows by whole years when a date falls outside it.
+
+import csv
+
+import numpy as np
+
+WEEKDAYS = "1111100"
+
+
+def load_holidays(paths):
+    """Holiday dates (datetime64[D]) from one or more calendar files."""
+    if isinstance(paths, str):
+        paths = [paths]
+    dates = []
+    for path in paths:
+        with open(path, newline="") as file:
+            rows = [row for row in csv.reader(file)
+                    if row and row[0].strip() and not row[0].lstrip().startswith("#")]
+        for line, row in enumerate(rows):
+            try:
+                dates.append(np.datetime64(row[0].strip(), "D"))
+            except ValueError:
+                if line == 0:
+                    continue  # header row
+                raise ValueError(f"{path}: invalid holiday date '{row[0].strip()}'") from None
+    return np.array(dates, dtype="datetime64[D]")
+
+
+class BusinessCalendar:
+    def __init__(self, holidays=(), weekmask=WEEKDAYS):
+        self.holidays = np.unique(np.asarray(holidays, dtype="datetime64[D]"))
+        self.weekmask = weekmask
+        self._calendar = np.busdaycalendar(weekmask=weekmask, holidays=self.holidays)
+        self._origin = None
+        self._running = None
+        if len(self.holidays):
+            self._cover(self.holidays[0], self.holidays[-1])
+
+    @classmethod
+    def from_files(cls, paths, weekmask=WEEKDAYS):
+        return cls(load_holidays(paths), weekmask)
+
+    def _cover(self, first, last):
+        """Extend the index to whole years spanning first..last."""
+        if self._origin is not None:
+            if first >= self._origin and last < self._origin + len(self._running) - 1:
+                return
+            first = min(first, self._origin)
+            last = max(last, self._origin + len(self._running) - 2)
+        start = first.astype("datetime64[Y]").astype("datetime64[D]")
+        stop = (last.astype("datetime64[Y]") + 1).astype("datetime64[D]")
+        days = np.arange(start, stop, dtype="datetime64[D]")
+        # _running[i] = business days before origin + i.
+        self._running = np.concatenate(
+            [[0], np.cumsum(np.is_busday(days, busdaycal=self._calendar))])
+        self._origin = start
+
+    def count(self, start_dates, end_dates):
+        """Business days from start to end date, both included (0 if end is before start).
+
+        Takes single dates or arrays (which broadcast) of anything
+        np.datetime64 accepts, e.g. "2025-07-01".
+        """
+        start = np.asarray(start_dates, dtype="datetime64[D]")
+        end = np.asarray(end_dates, dtype="datetime64[D]")
+        if start.size == 0 or end.size == 0:
+            return np.zeros(np.broadcast(start, end).shape, dtype=np.int64)
+        self._cover(min(start.min(), end.min()), max(start.max(), end.max()))
+        first = (start - self._origin).astype(np.int64)
+        last = (end - self._origin).astype(np.int64) + 1
+        counts = np.maximum(self._running[last] - self._running[first], 0)
+        return int(counts) if counts.ndim == 0 else counts
+
+    def is_business_day(self, dates):
+        return np.is_busday(np.asarray(dates, dtype="datetime64[D]"), busdaycal=self._calendar)
@@ -1,176 +1,307 @@
-import os
+import argparse
 import csv
-from projects.Tools_and_games.tools.contract_rates.contract_rates_models import RateCalculator, ContractEstimator
+import datetime
+import math
+import os
+import sys
+
+from contract_rates_models import RATE_COLUMNS, RateCalculator, ContractEstimator
+
+# money.py is shared with the other calculators in tools/.
+_TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _TOOLS_DIR not in sys.path:
+    sys.path.append(_TOOLS_DIR)
+
+from money import round_money  # noqa: E402
 
-# Instantiate helpers
-calculator = RateCalculator()
-estimator = ContractEstimator()
 contractMarkup = 1.2  # Define contract markup rate
 
-# --- User input section ---
-print("Choose input type:")
-print("1. Annual full-time income (including super)")
-print("2. Annual full-time income (excluding super)")
-print("3. Daily rate (including super)")
-print("4. Daily rate (excluding super)")
-print("5. Hourly rate (including super)")
-print("6. Hourly rate (excluding super)")
-
-# Validate input type with retry
-valid_choices = ["1", "2", "3", "4", "5", "6"]
-choice = ""
-while choice not in valid_choices:
-    choice = input("Enter choice (1-6): ")
-    if choice not in valid_choices:
-        print("Invalid choice. Please enter a number between 1 and 6.")
-input_type = "incl" if choice in ["1", "3", "5"] else "excl"
-
-if choice == "1":
-    annual_incl = -1
-    while annual_incl <= 0:
-        try:
-            annual_incl = float(
-                input("Enter annual income (including super): "))
-            if annual_incl <= 0:
-                print("Please enter a positive number.")
-        except ValueError:
-            print("Invalid input. Please enter a valid number.")
-    day_rate = round(annual_incl / calculator.working_days, 2)
-elif choice == "2":
-    base_annual = -1
-    while base_annual <= 0:
-        try:
-            base_annual = float(
-                input("Enter annual income (excluding super): "))
-            if base_annual <= 0:
-                print("Please enter a positive number.")
-        except ValueError:
-            print("Invalid input. Please enter a valid number.")
-    contractFTEquivalent = base_annual * contractMarkup
-    day_rate = round(contractFTEquivalent / calculator.working_days, 2)
-elif choice == "3":
-    daily_incl = -1
-    while daily_incl <= 0:
-        try:
-            daily_incl = float(input("Enter daily rate (including super): "))
-            if daily_incl <= 0:
-                print("Please enter a positive number.")
-        except ValueError:
-            print("Invalid input. Please enter a valid number.")
-    day_rate = daily_incl  # no markup when super is included
-elif choice == "4":
-    base_day = -1
-    while base_day <= 0:
-        try:
-            base_day = float(input("Enter daily rate (excluding super): "))
-            if base_day <= 0:
-                print("Please enter a positive number.")
-        except ValueError:
-            print("Invalid input. Please enter a valid number.")
-    day_rate = round(base_day * (1 + calculator.super_rate), 2)
-elif choice == "5":
-    hourly_incl = -1
-    while hourly_incl <= 0:
+# Input types by menu choice: (description, amount kind, includes super)
+INPUT_CHOICES = {
+    "1": ("Annual full-time income (including super)", "annual", True),
+    "2": ("Annual full-time income (excluding super)", "annual", False),
+    "3": ("Daily rate (including super)", "daily", True),
+    "4": ("Daily rate (excluding super)", "daily", False),
+    "5": ("Hourly rate (including super)", "hourly", True),
+    "6": ("Hourly rate (excluding super)", "hourly", False),
+}
+# Batch files may also name the input type, e.g. "daily_excl".
+INPUT_NAMES = {f"{kind}_{'incl' if incl else 'excl'}": choice
+               for choice, (_, kind, incl) in INPUT_CHOICES.items()}
+valid_units = {"D": "days", "W": "weeks", "M": "months", "Y": "years"}
+
+CONTRACT_COLUMNS = ["Contract Base", "Contract Super", "Contract Total"]
+CSV_HEADER = RATE_COLUMNS[:3] + ["Contract Days"] + RATE_COLUMNS[3:] + CONTRACT_COLUMNS
+
+
+def day_rate_for(choice, amount, calculator, markup=contractMarkup):
+    """Day rate including super for an amount entered as menu ``choice``."""
+    if choice == "1":
+        return round_money(amount / calculator.working_days)
+    elif choice == "2":
+        contractFTEquivalent = amount * markup
+        return round_money(contractFTEquivalent / calculator.working_days)
+    elif choice == "3":
+        return amount  # no markup when super is included
+    elif choice == "4":
+        return round_money(amount * (1 + calculator.super_rate))
+    elif choice == "5":
+        return round_money(amount * calculator.hours_per_day)  # no markup when super is included
+    elif choice == "6":
+        base_day = amount * calculator.hours_per_day
+        return round_money(base_day * (1 + calculator.super_rate))
+    raise ValueError(f"Invalid input type '{choice}'")
+
+
+def parse_choice(value):
+    value = str(value).strip().lower()
+    if value in INPUT_CHOICES:
+        return value
+    if value in INPUT_NAMES:
+        return INPUT_NAMES[value]
+    raise ValueError(f"Invalid input type '{value}' (use 1-6 or e.g. daily_excl)")
+
+
+def parse_unit(value):
+    value = str(value).strip().lower()
+    for letter, unit in valid_units.items():
+        if value in [letter.lower(), unit, unit[:-1]]:
+            return unit
+    raise ValueError(f"Invalid contract unit '{value}' (use D, W, M or Y)")
+
+
+def parse_date_range(start, end):
+    """(start, end) dates from YYYY-MM-DD strings; end may not be before start."""
+    start = datetime.date.fromisoformat(str(start).strip())
+    end = datetime.date.fromisoformat(str(end).strip())
+    if end < start:
+        raise ValueError(f"end date {end} is before start date {start}")
+    return start, end
+
+
+# === Interactive Mode ===
+
+
+def prompt_positive(prompt):
+    value = -1
+    while value <= 0:
         try:
-            hourly_incl = float(input("Enter hourly rate (including super): "))
-            if hourly_incl <= 0:
+            value = float(input(prompt))
+            if value <= 0:
                 print("Please enter a positive number.")
         except ValueError:
             print("Invalid input. Please enter a valid number.")
-    day_rate = round(hourly_incl * calculator.hours_per_day,
-                     2)  # no markup when super is included
-elif choice == "6":
-    hourly_base = -1
-    while hourly_base <= 0:
+    return value
+
+
+def run_interactive(calculator, estimator):
+    # --- User input section ---
+    print("Choose input type:")
+    for choice, (description, _, _) in INPUT_CHOICES.items():
+        print(f"{choice}. {description}")
+
+    # Validate input type with retry
+    choice = ""
+    while choice not in INPUT_CHOICES:
+        choice = input("Enter choice (1-6): ")
+        if choice not in INPUT_CHOICES:
+            print("Invalid choice. Please enter a number between 1 and 6.")
+    description, kind, includes_super = INPUT_CHOICES[choice]
+    input_type = "incl" if includes_super else "excl"
+
+    amount = prompt_positive(
+        f"Enter {kind} {'income' if kind == 'annual' else 'rate'} "
+        f"({'including' if includes_super else 'excluding'} super): ")
+    day_rate = day_rate_for(choice, amount, calculator)
+
+    # --- Contract duration ---
+    contract_days = None
+    while contract_days is None:
+        start = input("Enter contract start date (YYYY-MM-DD), or press Enter to give a length: ")
+        if not start.strip():
+            break
         try:
-            hourly_base = float(input("Enter hourly rate (excluding super): "))
-            if hourly_base <= 0:
-                print("Please enter a positive number.")
-        except ValueError:
-            print("Invalid input. Please enter a valid number.")
-    base_day = hourly_base * calculator.hours_per_day
-    day_rate = round(base_day * (1 + calculator.super_rate), 2)
-else:
-    print("Invalid choice.")
-    exit()
-
-# --- Contract duration ---
-contract_length = -1
-while contract_length <= 0:
-    try:
-        contract_length = float(input("Enter contract length (numeric): "))
-        if contract_length <= 0:
-            print("Please enter a positive number.")
-    except ValueError:
-        print("Invalid input. Please enter a valid number.")
-# Validate contract unit with retry
-valid_units = {"D": "days", "W": "weeks", "M": "months", "Y": "years"}
-contract_unit = ""
-while contract_unit not in valid_units:
-    contract_unit = input(
-        "Enter contract unit (days [D], weeks [W], months [M], years [Y]): ").upper()
-    if contract_unit not in valid_units:
-        print("Invalid input. Please enter one of D, W, M, Y.")
-
-contract_days = estimator.estimate_working_days(
-    contract_length, valid_units[contract_unit])
-
-# --- Calculations ---
-rate_info = calculator.calculate(day_rate, input_type)
-contract_info = estimator.calculate_contract_earnings(
-    rate_info["Raw"]["base_day_rate"],
-    rate_info["Raw"]["full_day_rate"],
-    contract_days,
-    input_type
-)
-
-# --- Output ---
-
-print("\n--- Rate Breakdown ---\n")
-
-for category in ["Hourly", "Daily", "Monthly", "Annual"]:
-    for label, (base, super_part, total) in rate_info[category].items():
-        print(f"{category} {label}: ${base:.2f} + ${super_part:.2f} = ${total:.2f}")
-    print()
-
-print("--- Contract Earnings Estimate ---")
-for label, value in contract_info.items():
-    print(f"{label}: ${value:.2f}")
-
-# --- Optional CSV Output ---
-save_csv = input("Would you like to save this to CSV? (Y/N): ").strip().upper()
-if save_csv == "Y":
-    csv_file = "rate_calculations.csv"
-    file_exists = os.path.isfile(csv_file)
-
-    with open(csv_file, mode="a", newline="") as file:
-        writer = csv.writer(file)
-
-        if not file_exists:
+            contract_days = estimator.count_working_days(
+                *parse_date_range(start, input("Enter contract end date (YYYY-MM-DD): ")))
+        except ValueError as e:
+            print(f"Invalid dates: {e}")
+
+    if contract_days is None:
+        contract_length = prompt_positive("Enter contract length (numeric): ")
+        # Validate contract unit with retry
+        contract_unit = ""
+        while contract_unit not in valid_units:
+            contract_unit = input(
+                "Enter contract unit (days [D], weeks [W], months [M], years [Y]): ").upper()
+            if contract_unit not in valid_units:
+                print("Invalid input. Please enter one of D, W, M, Y.")
+
+        contract_days = estimator.estimate_working_days(
+            contract_length, valid_units[contract_unit])
+
+    # --- Calculations ---
+    rate_info = calculator.calculate(day_rate, input_type)
+    contract_info = estimator.calculate_contract_earnings(
+        rate_info["Raw"]["base_day_rate"],
+        rate_info["Raw"]["full_day_rate"],
+        contract_days,
+        input_type
+    )
+
+    # --- Output ---
+
+    print("\n--- Rate Breakdown ---\n")
+
+    for category in ["Hourly", "Daily", "Monthly", "Annual"]:
+        for label, (base, super_part, total) in rate_info[category].items():
+            print(f"{category} {label}: ${base:.2f} + ${super_part:.2f} = ${total:.2f}")
+        print()
+
+    print("--- Contract Earnings Estimate ---")
+    for label, value in contract_info.items():
+        print(f"{label}: ${value:.2f}")
+
+    # --- Optional CSV Output ---
+    save_csv = input("Would you like to save this to CSV? (Y/N): ").strip().upper()
+    if save_csv == "Y":
+        csv_file = "rate_calculations.csv"
+        file_exists = os.path.isfile(csv_file)
+
+        with open(csv_file, mode="a", newline="") as file:
+            writer = csv.writer(file)
+
+            if not file_exists:
+                writer.writerow(CSV_HEADER)
+
+            hourly = list(rate_info["Hourly"].values())[0]
+            daily = list(rate_info["Daily"].values())[0]
+            monthly = list(rate_info["Monthly"].values())[0]
+            annual = list(rate_info["Annual"].values())[0]
+
             writer.writerow([
-                "Input Type", "Base Daily Rate", "Full Daily Rate", "Contract Days",
-                "Hourly Base", "Hourly Super", "Hourly Total",
-                "Daily Base", "Daily Super", "Daily Total",
-                "Monthly Base", "Monthly Super", "Monthly Total",
-                "Annual Base", "Annual Super", "Annual Total",
-                *contract_info.keys()
+                input_type,
+                rate_info["Raw"]["base_day_rate"],
+                rate_info["Raw"]["full_day_rate"],
+                contract_days,
+                *hourly,
+                *daily,
+                *monthly,
+                *annual,
+                *contract_info.values()
             ])
 
-        hourly = list(rate_info["Hourly"].values())[0]
-        daily = list(rate_info["Daily"].values())[0]
-        monthly = list(rate_info["Monthly"].values())[0]
-        annual = list(rate_info["Annual"].values())[0]
-
-        writer.writerow([
-            input_type,
-            rate_info["Raw"]["base_day_rate"],
-            rate_info["Raw"]["full_day_rate"],
-            contract_days,
-            *hourly,
-            *daily,
-            *monthly,
-            *annual,
-            *contract_info.values()
-        ])
-
-    print(f"Saved to {csv_file}.")
+        print(f"Saved to {csv_file}.")
+
+
+# === Batch Mode ===
+
+
+def iter_batch_rows(rows, calculator, estimator, markup=contractMarkup, chunk_size=5000):
+    """Yield (line, CSV_HEADER-ordered values or error message) for input dicts.
+
+    Rows need input_type (1-6 or e.g. daily_excl), amount, and either
+    contract_length and contract_unit (D/W/M/Y) or start_date and end_date
+    (YYYY-MM-DD, counted in real business days). Rates and date ranges are
+    worked out a chunk at a time with RateCalculator.calculate_batch() and
+    ContractEstimator.count_working_days().
+    """
+    chunk = []
+    for line, row in enumerate(rows, start=2):
+        try:
+            choice = parse_choice(row["input_type"])
+            amount = float(row["amount"])
+            # float() also accepts "nan" and "inf", which no rate can be worked out from.
+            if not (math.isfinite(amount) and amount > 0):
+                raise ValueError("amount must be a positive number")
+            if (row.get("start_date") or "").strip():
+                contract_days = parse_date_range(row["start_date"], row.get("end_date"))
+            else:
+                contract_length = float(row["contract_length"])
+                if not (math.isfinite(contract_length) and contract_length > 0):
+                    raise ValueError("contract_length must be a positive number")
+                contract_days = estimator.estimate_working_days(
+                    contract_length, parse_unit(row["contract_unit"]))
+        except (KeyError, TypeError, ValueError) as e:
+            yield line, f"{type(e).__name__}: {e}"
+            continue
+        input_type = "incl" if INPUT_CHOICES[choice][2] else "excl"
+        chunk.append((line, input_type, day_rate_for(choice, amount, calculator, markup),
+                      contract_days))
+        if len(chunk) >= chunk_size:
+            yield from _price_chunk(chunk, calculator, estimator)
+            chunk = []
+    if chunk:
+        yield from _price_chunk(chunk, calculator, estimator)
+
+
+def _price_chunk(chunk, calculator, estimator):
+    lines, input_types, day_rates, contract_days = zip(*chunk)
+    dated = [i for i, days in enumerate(contract_days) if isinstance(days, tuple)]
+    if dated:
+        starts, ends = zip(*(contract_days[i] for i in dated))
+        contract_days = list(contract_days)
+        for i, days in zip(dated, estimator.count_working_days(starts, ends).tolist()):
+            contract_days[i] = days
+    rates = calculator.calculate_batch(day_rates, input_types)
+    rates.update(zip(CONTRACT_COLUMNS, estimator.calculate_contract_earnings_batch(
+        rates["Base Daily Rate"], rates["Full Daily Rate"], list(contract_days), input_types)))
+    # Plain floats print the same as the interactive CSV export.
+    columns = [rates[col].tolist() for col in RATE_COLUMNS + CONTRACT_COLUMNS]
+    for i, (line, values) in enumerate(zip(lines, zip(*columns))):
+        yield line, list(values[:3]) + [contract_days[i]] + list(values[3:])
+
+
+def run_batch(input_path, output_path="-", calculator=None, estimator=None, markup=contractMarkup):
+    """Stream a CSV of rate requests into one results CSV; returns (written, skipped)."""
+    calculator = calculator or RateCalculator()
+    estimator = estimator or ContractEstimator(calculator.working_days, calculator.super_rate)
+    written = skipped = 0
+    with open(input_path, newline="") as source:
+        out = sys.stdout if output_path == "-" else open(output_path, "w", newline="")
+        try:
+            writer = csv.writer(out)
+            writer.writerow(CSV_HEADER)
+            for line, result in iter_batch_rows(csv.DictReader(source), calculator,
+                                                estimator, markup):
+                if isinstance(result, str):
+                    print(f"{input_path}:{line}: skipped ({result})", file=sys.stderr)
+                    skipped += 1
+                else:
+                    writer.writerow(result)
+                    written += 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    return written, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Contract rate calculator. Runs interactively unless --input is given.")
+    parser.add_argument("--input", type=str,
+                        help="CSV with input_type,amount,contract_length,contract_unit "
+                             "(or start_date,end_date) columns (batch mode)")
+    parser.add_argument("--output", type=str, default="-",
+                        help="Batch results CSV ('-' for stdout)")
+    parser.add_argument("--markup", type=float, default=contractMarkup,
+                        help="Contract markup applied to annual income excluding super")
+    parser.add_argument("--holidays", type=str, nargs="+",
+                        help="Public holiday file(s) for contracts given by start and end date")
+    args = parser.parse_args(argv)
+
+    # Instantiate helpers
+    calculator = RateCalculator()
+    calendar = None
+    if args.holidays:
+        from business_days import BusinessCalendar
+        calendar = BusinessCalendar.from_files(args.holidays)
+    estimator = ContractEstimator(calendar=calendar)
+    if args.input:
+        written, skipped = run_batch(args.input, args.output, calculator, estimator, args.markup)
+        print(f"Wrote {written} row(s){f', skipped {skipped}' if skipped else ''}.", file=sys.stderr)
+    else:
+        run_interactive(calculator, estimator)
+
+
+if __name__ == "__main__":
+    main()
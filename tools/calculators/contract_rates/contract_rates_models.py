@@ -1,5 +1,25 @@
 # Tools_and_games/rates/models.py
 
+import os
+import sys
+
+# money.py is shared with the other calculators in tools/.
+_TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _TOOLS_DIR not in sys.path:
+    sys.path.append(_TOOLS_DIR)
+
+from money import divide_cents, from_cents, scale_cents, to_cents  # noqa: E402
+
+# Column order of RateCalculator.calculate_batch() (and the calculator's CSV export).
+RATE_COLUMNS = [
+    "Input Type", "Base Daily Rate", "Full Daily Rate",
+    "Hourly Base", "Hourly Super", "Hourly Total",
+    "Daily Base", "Daily Super", "Daily Total",
+    "Monthly Base", "Monthly Super", "Monthly Total",
+    "Annual Base", "Annual Super", "Annual Total",
+]
+
+
 class RateCalculator:
     def __init__(self, working_days=220, super_rate=0.115, hours_per_day=8.0, months_in_year=12):
         self.working_days = working_days
@@ -7,78 +27,96 @@ class RateCalculator:
         self.hours_per_day = hours_per_day
         self.months_in_year = months_in_year
 
-    def calculate(self, day_rate_incl_super, input_type):
-        base_day_rate = round(day_rate_incl_super / (1 + self.super_rate), 2)
-        super_daily = round(day_rate_incl_super - base_day_rate, 2)
-
-        base_hour_rate = round(base_day_rate / self.hours_per_day, 2)
-        full_hour_rate = round(day_rate_incl_super / self.hours_per_day, 2)
-        super_hourly = round(full_hour_rate - base_hour_rate, 2)
-
-        annual_base = round(base_day_rate * self.working_days, 2)
-        annual_super = round(annual_base * self.super_rate, 2)
-        annual_package = round(annual_base + annual_super, 2)
-
-        annual_incl_super = round(day_rate_incl_super * self.working_days, 2)
-        super_annual_incl = round(
-            annual_incl_super - base_day_rate * self.working_days, 2)
-
-        monthly_base = round(annual_base / self.months_in_year, 2)
-        monthly_super = round(monthly_base * self.super_rate, 2)
-        monthly_package = round(monthly_base + monthly_super, 2)
-
-        monthly_incl_super = round(annual_incl_super / self.months_in_year, 2)
-        super_monthly_incl = round(monthly_incl_super - monthly_base, 2)
-
-        result = {
-            "Hourly": {},
-            "Daily": {},
-            "Monthly": {},
-            "Annual": {},
-            "Raw": {
-                "base_day_rate": base_day_rate,
-                "full_day_rate": day_rate_incl_super,
-            }
+    def _cents(self, day_cents):
+        """Every figure calculate() reports, in whole cents, for day rates in cents.
+
+        Works the same on a single int or an int64 array of day rates.
+        """
+        base_day = divide_cents(day_cents, 1 + self.super_rate)
+        base_hour = divide_cents(base_day, self.hours_per_day)
+        full_hour = divide_cents(day_cents, self.hours_per_day)
+
+        annual_base = scale_cents(base_day, self.working_days)
+        annual_super = scale_cents(annual_base, self.super_rate)
+        annual_incl = scale_cents(day_cents, self.working_days)
+
+        monthly_base = divide_cents(annual_base, self.months_in_year)
+        monthly_super = scale_cents(monthly_base, self.super_rate)
+        monthly_incl = divide_cents(annual_incl, self.months_in_year)
+
+        hourly_super = scale_cents(base_hour, self.super_rate)
+        daily_super = scale_cents(base_day, self.super_rate)
+
+        # Super is the difference when it is included and every total is the
+        # sum of its parts, so rows always add up to the cent.
+        return {
+            "base_day": base_day,
+            "Hourly": (base_hour,
+                       (full_hour - base_hour, full_hour),
+                       (hourly_super, base_hour + hourly_super)),
+            "Daily": (base_day,
+                      (day_cents - base_day, day_cents),
+                      (daily_super, base_day + daily_super)),
+            "Monthly": (monthly_base,
+                        (monthly_incl - monthly_base, monthly_incl),
+                        (monthly_super, monthly_base + monthly_super)),
+            "Annual": (annual_base,
+                       (annual_incl - annual_base, annual_incl),
+                       (annual_super, annual_base + annual_super)),
         }
 
-        if input_type == "incl":
-            result["Hourly"]["Incl Super"] = (
-                base_hour_rate, super_hourly, full_hour_rate)
-            result["Daily"]["Incl Super"] = (
-                base_day_rate, super_daily, day_rate_incl_super)
-            result["Monthly"]["Incl Super"] = (
-                monthly_base, super_monthly_incl, monthly_incl_super)
-            result["Annual"]["Incl Super"] = (
-                annual_base, super_annual_incl, annual_incl_super)
-        elif input_type == "excl":
-            result["Hourly"]["Super On Top"] = (
-                base_hour_rate,
-                round(base_hour_rate * self.super_rate, 2),
-                round(base_hour_rate * (1 + self.super_rate), 2),
-            )
-            result["Daily"]["Super On Top"] = (
-                base_day_rate,
-                round(base_day_rate * self.super_rate, 2),
-                round(base_day_rate * (1 + self.super_rate), 2),
-            )
-            result["Monthly"]["Super On Top"] = (
-                monthly_base,
-                monthly_super,
-                monthly_package,
-            )
-            result["Annual"]["Super On Top"] = (
-                annual_base,
-                annual_super,
-                annual_package,
-            )
+    def calculate(self, day_rate_incl_super, input_type):
+        if input_type not in ("incl", "excl"):
+            raise ValueError("input_type must be 'incl' or 'excl'")
+        day_cents = to_cents(day_rate_incl_super)
+        cents = self._cents(day_cents)
+        label = "Incl Super" if input_type == "incl" else "Super On Top"
 
+        result = {}
+        for period in ["Hourly", "Daily", "Monthly", "Annual"]:
+            base, incl, excl = cents[period]
+            super_part, total = incl if input_type == "incl" else excl
+            result[period] = {label: (from_cents(base), from_cents(super_part), from_cents(total))}
+        result["Raw"] = {
+            "base_day_rate": from_cents(cents["base_day"]),
+            "full_day_rate": from_cents(day_cents),
+        }
         return result
 
+    def calculate_batch(self, day_rates_incl_super, input_types="incl"):
+        """calculate() for many day rates at once, as columns.
+
+        ``input_types`` is one "incl"/"excl" for every rate or one per rate.
+        Returns a dict of NumPy arrays keyed by RATE_COLUMNS whose values
+        match calculate()'s tuples (base, super, total) row for row.
+        """
+        import numpy as np
+
+        day_cents = to_cents(np.asarray(day_rates_incl_super, dtype=float))
+        input_type = np.broadcast_to(np.asarray(input_types, dtype=object), day_cents.shape)
+        incl = input_type == "incl"
+        if not (incl | (input_type == "excl")).all():
+            raise ValueError("input_type must be 'incl' or 'excl'")
+
+        cents = self._cents(day_cents)
+        columns = {
+            "Input Type": np.asarray(input_type, dtype=str),
+            "Base Daily Rate": from_cents(cents["base_day"]),
+            "Full Daily Rate": from_cents(day_cents),
+        }
+        for period in ["Hourly", "Daily", "Monthly", "Annual"]:
+            base, (incl_super, incl_total), (excl_super, excl_total) = cents[period]
+            columns[f"{period} Base"] = from_cents(base)
+            columns[f"{period} Super"] = from_cents(np.where(incl, incl_super, excl_super))
+            columns[f"{period} Total"] = from_cents(np.where(incl, incl_total, excl_total))
+        return columns
+
 
 class ContractEstimator:
-    def __init__(self, working_days=220, super_rate=0.115):
+    def __init__(self, working_days=220, super_rate=0.115, calendar=None):
         self.working_days = working_days
         self.super_rate = super_rate
+        self.calendar = calendar  # business_days.BusinessCalendar for date ranges
 
     def estimate_working_days(self, duration, unit):
         unit = unit.lower()
@@ -93,23 +131,55 @@ class ContractEstimator:
         else:
             raise ValueError("Invalid contract unit")
 
+    def count_working_days(self, start_dates, end_dates):
+        """Real business days from start to end date (both included), skipping
+        weekends and the calendar's holidays. Takes single dates or arrays."""
+        if self.calendar is None:
+            from business_days import BusinessCalendar
+            self.calendar = BusinessCalendar()
+        return self.calendar.count(start_dates, end_dates)
+
+    def _contract_cents(self, base_day_rate, full_day_rate, contract_days):
+        base = scale_cents(to_cents(base_day_rate), contract_days)
+        super_val = scale_cents(base, self.super_rate)
+        incl = scale_cents(to_cents(full_day_rate), contract_days)
+        return base, super_val, incl
+
     def calculate_contract_earnings(self, base_day_rate, full_day_rate, contract_days, input_type):
-        base = round(base_day_rate * contract_days, 2)
-        super_val = round(base * self.super_rate, 2)
-        incl = round(full_day_rate * contract_days, 2)
-        package = round(base + super_val, 2)
+        base, super_val, incl = self._contract_cents(base_day_rate, full_day_rate, contract_days)
 
         if input_type == "incl":
             return {
-                "Base": base,
-                "Super (Derived)": incl - base,
-                "Total (Incl Super)": incl,
+                "Base": from_cents(base),
+                "Super (Derived)": from_cents(incl - base),
+                "Total (Incl Super)": from_cents(incl),
             }
         elif input_type == "excl":
             return {
-                "Base": base,
-                "Super": super_val,
-                "Total (Super On Top)": package,
+                "Base": from_cents(base),
+                "Super": from_cents(super_val),
+                "Total (Super On Top)": from_cents(base + super_val),
             }
         else:
             raise ValueError("Invalid input type")
+
+    def calculate_contract_earnings_batch(self, base_day_rates, full_day_rates, contract_days,
+                                          input_types="incl"):
+        """calculate_contract_earnings() over arrays.
+
+        Returns (base, super, total) arrays whose values match the scalar
+        method's three entries row for row.
+        """
+        import numpy as np
+
+        base_day_rates = np.asarray(base_day_rates, dtype=float)
+        input_type = np.broadcast_to(np.asarray(input_types, dtype=object), base_day_rates.shape)
+        incl = input_type == "incl"
+        if not (incl | (input_type == "excl")).all():
+            raise ValueError("Invalid input type")
+
+        base, super_val, incl_total = self._contract_cents(
+            base_day_rates, np.asarray(full_day_rates, dtype=float), contract_days)
+        return (from_cents(base),
+                from_cents(np.where(incl, incl_total - base, super_val)),
+                from_cents(np.where(incl, incl_total, base + super_val)))
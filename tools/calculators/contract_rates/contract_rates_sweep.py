@@ -0,0 +1,206 @@
+# What-if sensitivity tables for the contract rate calculator.
+#
+# Evaluates every combination of amount (day rate, income or hourly rate,
+# per --input-type), contract length, super rate, working days per year and
+# contract markup. The grid is split into one block per (super rate,
+# working days, markup) assumption; each block is priced with
+# RateCalculator.calculate_batch() in a process pool and streamed to a
+# Parquet (needs pyarrow) or CSV file as soon as it is ready, in grid order.
+#
+# Value lists take either comma-separated values or start:stop:step ranges
+# (stop included), e.g.
+#   python contract_rates_sweep.py --amounts 500:1500:50 --lengths 3,6,12 \
+#       --super-rates 0.115,0.12,0.125 --working-days 210:230:5 --markups 1.1,1.2,1.3
+#
+# The markup only changes annual income excluding super (input type 2);
+# for the other input types the markup axis is dropped.
+
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import sys
+
+import numpy as np
+
+from contract_rates_calculator import (CONTRACT_COLUMNS, INPUT_CHOICES, contractMarkup,
+                                       day_rate_for, parse_choice, parse_unit)
+from contract_rates_models import RATE_COLUMNS, RateCalculator, ContractEstimator
+
+GRID_COLUMNS = ["Super Rate", "Working Days", "Markup", "Amount", "Contract Length",
+                "Contract Unit", "Contract Days"]
+SWEEP_COLUMNS = GRID_COLUMNS + RATE_COLUMNS + CONTRACT_COLUMNS
+
+
+def parse_values(text, cast=float):
+    """Values from "a,b,c" and/or "start:stop:step" (stop included) parts."""
+    values = []
+    for part in str(text).split(","):
+        part = part.strip()
+        if ":" in part:
+            start, stop, step = (float(v) for v in part.split(":"))
+            if step <= 0:
+                raise ValueError(f"Range step must be positive in '{part}'")
+            count = int(round((stop - start) / step)) + 1
+            # Round away float drift, e.g. 0.115 + 2 * 0.005.
+            values.extend(cast(round(start + i * step, 10)) for i in range(max(count, 0)))
+        elif part:
+            values.append(cast(part))
+    if not values:
+        raise ValueError(f"No values in '{text}'")
+    return values
+
+
+def sweep_block(task):
+    """All amounts x lengths for one (super rate, working days, markup) assumption.
+
+    Returns a dict of SWEEP_COLUMNS arrays, amounts outer and lengths inner.
+    """
+    (super_rate, working_days, markup), choice, amounts, lengths, unit, hours_per_day = task
+    calculator = RateCalculator(working_days, super_rate, hours_per_day)
+    estimator = ContractEstimator(working_days, super_rate)
+    input_type = "incl" if INPUT_CHOICES[choice][2] else "excl"
+
+    day_rates = [day_rate_for(choice, amount, calculator, markup) for amount in amounts]
+    rates = calculator.calculate_batch(day_rates, input_type)
+    days = np.array([estimator.estimate_working_days(length, unit) for length in lengths])
+
+    n_amounts, n_lengths = len(amounts), len(lengths)
+    row_rate = np.repeat(np.arange(n_amounts), n_lengths)
+    row_days = np.tile(days, n_amounts)
+    contract = estimator.calculate_contract_earnings_batch(
+        rates["Base Daily Rate"][row_rate], rates["Full Daily Rate"][row_rate],
+        row_days, input_type)
+
+    n_rows = n_amounts * n_lengths
+    columns = {
+        "Super Rate": np.full(n_rows, float(super_rate)),
+        "Working Days": np.full(n_rows, int(working_days)),
+        "Markup": np.full(n_rows, float(markup)),
+        "Amount": np.repeat(np.asarray(amounts, dtype=float), n_lengths),
+        "Contract Length": np.tile(np.asarray(lengths, dtype=float), n_amounts),
+        "Contract Unit": np.full(n_rows, unit, dtype=object),
+        "Contract Days": row_days,
+    }
+    for col in RATE_COLUMNS:
+        columns[col] = rates[col][row_rate]
+    columns.update(zip(CONTRACT_COLUMNS, contract))
+    return columns
+
+
+def iter_sweep(choice, amounts, lengths, unit, super_rates, working_days, markups,
+               hours_per_day=8.0, workers=None):
+    """Yield sweep_block() results for every assumption, in grid order."""
+    assumptions = itertools.product(super_rates, working_days, markups)
+    tasks = ((assumption, choice, amounts, lengths, unit, hours_per_day)
+             for assumption in assumptions)
+    if workers == 1:
+        yield from map(sweep_block, tasks)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap(sweep_block, tasks)
+
+
+# === Output ===
+
+
+class SweepWriter:
+    """Streams sweep blocks to a Parquet file (one row group per block) or a CSV."""
+
+    def __init__(self, path, fmt="parquet"):
+        self.path = path
+        self.format = fmt
+        self.rows = 0
+        if fmt == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError("Parquet output needs pyarrow (pip install pyarrow)") from None
+            self._writer = None
+        else:
+            self._file = sys.stdout if path == "-" else open(path, "w", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(SWEEP_COLUMNS)
+
+    def write(self, columns):
+        if self.format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.table({col: columns[col] for col in SWEEP_COLUMNS})
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            # Plain floats print the same as the calculator's own CSV output.
+            self._writer.writerows(zip(*(columns[col].tolist() for col in SWEEP_COLUMNS)))
+        self.rows += len(columns["Amount"])
+
+    def close(self):
+        if self.format == "parquet":
+            if self._writer is not None:
+                self._writer.close()
+        elif self._file is not sys.stdout:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Sensitivity grid of contract rates over super rate, working days and markup")
+    parser.add_argument("--input-type", type=str, default="3",
+                        help="What --amounts are: 1-6 as in the calculator menu, or e.g. daily_incl")
+    parser.add_argument("--amounts", type=str, required=True,
+                        help="Amounts, e.g. 600,650 or 500:1500:50")
+    parser.add_argument("--lengths", type=str, default="12", help="Contract lengths")
+    parser.add_argument("--unit", type=str, default="M", help="Contract unit (D, W, M or Y)")
+    parser.add_argument("--super-rates", type=str, default="0.115", help="Super rates, e.g. 0.115,0.12")
+    parser.add_argument("--working-days", type=str, default="220", help="Working days per year")
+    parser.add_argument("--markups", type=str, default=str(contractMarkup),
+                        help="Contract markups (annual income excluding super only)")
+    parser.add_argument("--hours-per-day", type=float, default=8.0)
+    parser.add_argument("--output", type=str, default="rate_sweep.parquet",
+                        help="Output file ('-' for CSV on stdout)")
+    parser.add_argument("--format", choices=["parquet", "csv"],
+                        help="Output format (default: from the --output extension)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Worker processes (1 runs in this process)")
+    args = parser.parse_args(argv)
+
+    try:
+        choice = parse_choice(args.input_type)
+        unit = parse_unit(args.unit)
+        amounts = parse_values(args.amounts)
+        lengths = parse_values(args.lengths)
+        super_rates = parse_values(args.super_rates)
+        working_days = parse_values(args.working_days, int)
+        markups = parse_values(args.markups)
+    except ValueError as e:
+        parser.error(str(e))
+    if min(amounts + lengths + working_days) <= 0:
+        parser.error("amounts, lengths and working days must be positive")
+    if choice != "2" and len(markups) > 1:
+        print("Markup only applies to annual income excluding super; "
+              f"using {markups[0]} for every row.", file=sys.stderr)
+        markups = markups[:1]
+
+    fmt = args.format or ("csv" if args.output == "-" or args.output.lower().endswith(".csv")
+                          else "parquet")
+    if fmt == "parquet" and args.output == "-":
+        parser.error("Parquet output needs a file path")
+
+    with SweepWriter(args.output, fmt) as writer:
+        for block in iter_sweep(choice, amounts, lengths, unit, super_rates, working_days,
+                                markups, args.hours_per_day, args.workers):
+            writer.write(block)
+    print(f"Wrote {writer.rows} row(s) to {args.output}.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -21,9 +21,23 @@
 #  show the values using pandas frame
 
 
-import pandas as pd
+import argparse
 import os
+import sys
 from colorama import init, Fore, Style
+from block_tariff import block_charge, parse_limits
+from results_table import ResultsTable
+from tariff_catalogue import TariffCatalogue
+
+# money.py is shared with the other calculators in tools/.
+_TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _TOOLS_DIR not in sys.path:
+    sys.path.append(_TOOLS_DIR)
+
+from money import divide_cents, from_cents, to_cents  # noqa: E402
+
+# pandas / numpy and the modules built on them are imported inside the
+# functions that need them, so the interactive tool starts quickly.
 
 init(autoreset=True)
 
@@ -95,6 +109,10 @@ def get_service_choice():
 
 def get_electricity_usage():
     print("--- Electricity Usage & Billing Info ---")
+    if get_yes_no("Do you have a smart-meter interval data export (CSV)? (y/n): "):
+        return get_interval_usage()
+    if get_yes_no("Simulate solar / battery from hourly or half-hourly profiles (CSV)? (y/n): "):
+        return get_profile_usage()
     peak_usage = get_float(
         "Enter peak power consumption (kWh): ", allow_zero=False, min_value=0)
     offpeak_usage = get_float(
@@ -113,10 +131,88 @@ def get_electricity_usage():
     }
 
 
+def get_interval_usage():
+    from meter_data import load_tou_windows, read_interval_usage
+
+    while True:
+        path = get_user_input("Enter the path to the interval data CSV: ")
+        windows_path = get_user_input(
+            "Enter a time-of-use windows JSON file (leave blank for defaults): ")
+        try:
+            windows = load_tou_windows(windows_path) if windows_path else None
+            usage = read_interval_usage(path, windows)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not read interval data: {e}")
+            continue
+        print(f"Read {usage['billing_days']:.0f} days: peak {usage['peak_usage']} kWh, "
+              f"shoulder {usage['shoulder_usage']} kWh, off-peak {usage['offpeak_usage']} kWh, "
+              f"exported {usage['solar_export_kwh']} kWh")
+        return usage
+
+
+def get_battery():
+    capacity_kwh = get_float("Enter battery capacity in kWh (0 for no battery): ", min_value=0)
+    if capacity_kwh == 0:
+        return {}
+    return {
+        "capacity_kwh": capacity_kwh,
+        "power_kw": get_float("Enter battery power limit in kW (0 for no limit): ", min_value=0),
+        "efficiency": get_float("Enter round-trip efficiency in % (e.g. 90): ",
+                                allow_zero=False, min_value=0) / 100,
+    }
+
+
+def get_profile_usage():
+    from meter_data import load_tou_windows
+    from solar_battery import band_usage, dispatch, interval_hours, read_profiles, summarise
+
+    while True:
+        path = get_user_input(
+            "Enter the path to the profile CSV (timestamp,consumption_kwh,generation_kwh): ")
+        windows_path = get_user_input(
+            "Enter a time-of-use windows JSON file (leave blank for defaults): ")
+        try:
+            windows = load_tou_windows(windows_path) if windows_path else None
+            timestamps, load, solar = read_profiles(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not read profiles: {e}")
+            continue
+        break
+    flows = dispatch(load, solar, interval_hours(timestamps), **get_battery())
+    usage = {key: round(value, 3) for key, value in band_usage(
+        timestamps, flows["grid_import"], flows["grid_export"], windows).items()}
+    summary = summarise(load, solar, flows)
+    print(f"Simulated {usage['billing_days']:.0f} days: used {summary['self_consumed_kwh']} kWh of "
+          f"{summary['generation_kwh']} kWh solar on site ({summary['self_consumption_pct']}%), "
+          f"imported {summary['grid_import_kwh']} kWh, exported {summary['grid_export_kwh']} kWh")
+    return usage
+
+
+def get_electricity_rates(usage):
+    rate_data = {
+        "peak_rate": get_float("Enter the peak rate (in cents/kWh): ", min_value=0),
+        "offpeak_rate": get_float("Enter the off-peak rate (in cents/kWh): ", min_value=0),
+    }
+    if usage.get("shoulder_usage", 0) > 0:
+        rate_data["shoulder_rate"] = get_float(
+            "Enter the shoulder rate (in cents/kWh): ", min_value=0)
+    rate_data["daily_supply_charge"] = get_float(
+        "Enter the daily supply charge (in cents): ", min_value=0)
+    rate_data["feed_in_rate"] = get_float(
+        "Enter the solar feed-in tariff rate (in cents/kWh): ", min_value=0) if usage["solar_export_kwh"] > 0 else 0
+    return rate_data
+
+
 def get_gas_usage():
     print("--- Gas Usage & Billing Info ---")
     billing_days = get_float(
         "Enter number of billing days: ", allow_zero=False, min_value=0)
+    if not get_yes_no("Does your bill show usage split into three tiers? (y/n): "):
+        return {
+            "billing_days": billing_days,
+            "total_units": get_float(
+                "Enter total gas usage for the period (units): ", allow_zero=False, min_value=0)
+        }
     tier1_units = get_float(
         "Enter gas usage in first tier (units): ", allow_zero=False, min_value=0)
     tier2_units = get_float(
@@ -131,6 +227,29 @@ def get_gas_usage():
     }
 
 
+def get_gas_rates(usage):
+    rate_data = {"daily_supply_charge": get_float(
+        "Enter the daily supply charge (in cents): ", min_value=0)}
+    if "total_units" not in usage:
+        rate_data["tier1_rate"] = get_float("Enter the first tier rate (in cents/unit): ", min_value=0)
+        rate_data["tier2_rate"] = get_float("Enter the second tier rate (in cents/unit): ", min_value=0)
+        rate_data["tier3_rate"] = get_float("Enter the third tier rate (in cents/unit): ", min_value=0)
+        return rate_data
+
+    n_tiers = int(get_float("How many usage tiers does this tariff have? ",
+                            allow_zero=False, min_value=1))
+    limits = []
+    for tier in range(1, n_tiers + 1):
+        rate_data[f"tier{tier}_rate"] = get_float(
+            f"Enter the tier {tier} rate (in cents/unit): ", min_value=0)
+        if tier < n_tiers:
+            limits.append(get_float(
+                f"Enter the daily limit for tier {tier} (units/day): ", allow_zero=False, min_value=0))
+    rate_data["tier_limits"] = limits
+    rate_data["tier_limit_basis"] = "day"
+    return rate_data
+
+
 def show_cents_notice():
     print("⚠️ IMPORTANT: Enter all rates and charges in **cents** (as shown on your bill)")
     print("   For example:")
@@ -140,180 +259,120 @@ def show_cents_notice():
     print("   (The calculator will convert cents to dollars for calculations.)")
 
 
+def price_catalogue(service, usage, catalogue):
+    count = catalogue.count(service)
+    if count == 0 or not get_yes_no(
+            f"Compare against all {count} catalogued {service.lower()} tariffs? (y/n): "):
+        return []
+    import pandas as pd
+    from bill_engine import calculate_bills
+
+    df = calculate_bills(service, pd.DataFrame(
+        [usage]), catalogue.rate_table(service))
+    return df.drop(columns="Household").to_dict("records")
+
+
+def offer_to_catalogue(service, name, rate_data, catalogue):
+    if get_yes_no("Save this tariff to the catalogue for future comparisons? (y/n): "):
+        catalogue.add(service, name, rate_data)
+        print(f"📚 Saved {name} to {catalogue.path}")
+
+
 def export_to_csv(df, filename="comparison_results.csv"):
-    file_exists = os.path.isfile(filename)
-    df.to_csv(filename, mode='a', index=False, header=not file_exists)
+    from results_store import ResultsSink
+
+    try:
+        with ResultsSink(filename) as sink:
+            sink.write(df)
+    except ValueError as e:
+        print(Fore.RED + f"⚠️ {e}" + Style.RESET_ALL)
+        return
     print(f"📁 Results exported to {filename}")
 
 
-def print_colored_dataframe(df):
-    print("--- Final Comparison Summary ---")
+def savings_vs_current(df, group):
+    """% Saved vs Current for prospective rows, in one pass over all groups.
+
+    Rows without a current supplier in their group (or whose current net bill
+    is $0) get None.
+    """
+    supplier_type = df["Supplier Type"].astype(str).str.strip().str.lower()
+    current_net = df["Net Bill ($)"].where(supplier_type == "current").groupby(
+        group, sort=False).transform("first")
+    has_savings = (supplier_type == "prospective") & current_net.notna() & (
+        current_net != 0)
+    savings = (1 - df["Net Bill ($)"] / current_net) * 100
+    return savings.map(lambda pct: f"{pct:.1f}%").where(has_savings, None)
+
+
+def rank_results(df, group_cols):
+    """Rank each group by net bill and fill % Saved vs Current against its current supplier.
+
+    Groups keep the order they first appear in; rows within a group are
+    sorted by rank. The interactive summary is rendered by ResultsTable.
+    """
+    import pandas as pd
+
     if df.empty:
-        print(Fore.YELLOW + "⚠️ No data to display." + Style.RESET_ALL)
-        return
+        return df.assign(Rank=pd.Series(dtype=int))
 
-    display_df = df.copy()
-    display_df["% Saved vs Current"] = display_df["% Saved vs Current"].fillna(
-        "")
-    rate_cols = [
-        "Peak Rate (c/kWh)",
-        "Off-peak Rate (c/kWh)",
-        "Daily Supply (c)",
-        "Feed-in Rate (c/kWh)",
-        "Tier1 Rate (c/unit)",
-        "Tier2 Rate (c/unit)",
-        "Tier3 Rate (c/unit)"
-    ]
-
-    def has_data(col):
-        return col in display_df.columns and display_df[col].notna().any() and (display_df[col] != "").any()
-
-    for col in rate_cols:
-        if col in display_df.columns:
-            display_df[col] = display_df[col].fillna("")
-
-    warnings = []
-    for col in ["Service", "Supplier Type", "Supplier"]:
-        display_df[col] = display_df[col].astype(
-            str).str.strip().str.ljust(15)
-
-    display_df["Rank"] = 0  # Initialize column
-    base_fields = [("Service", 15), ("Supplier Type", 15),
-                   ("Supplier", 15), ("Billing Days", 14)]
-    optional_rate_fields = [(col, width) for col, width in [
-        ("Peak Rate (c/kWh)", 20),
-        ("Off-peak Rate (c/kWh)", 24),
-        ("Daily Supply (c)", 17),
-        ("Feed-in Rate (c/kWh)", 22),
-        ("Tier1 Rate (c/unit)", 21),
-        ("Tier2 Rate (c/unit)", 21),
-        ("Tier3 Rate (c/unit)", 21)
-    ] if has_data(col)]
-    tail_fields = [("Gross Bill ($)", 16), ("Solar Credit ($)", 18),
-                   ("Net Bill ($)", 14), ("Cost Per Day ($)", 18), ("% Saved vs Current", 20)]
-
-    display_fields = base_fields + optional_rate_fields + tail_fields
-    for col, _ in display_fields:
-        if col in display_df.columns:
-            display_df[col] = display_df[col].fillna("")
-
-    header_parts = [f"{'Rank':>4}  "] + \
-        [f"{name:<{width}}" for name, width in display_fields]
-    header = "".join(header_parts)
-    print(header)
-    print("-" * len(header))
-
-    for service in display_df["Service"].str.strip().str.capitalize().unique():
-        service_df = display_df[display_df["Service"].str.strip().str.capitalize()
-                                == service].copy()
-        current_rows = service_df[service_df["Supplier Type"].str.strip(
-        ).str.lower() == "current"]
-
-        if current_rows.empty:
-            warnings.append(
-                f"No current supplier for {service}; showing prospective options without savings.")
-            service_df.sort_values("Net Bill ($)", inplace=True)
-            service_df["Rank"] = range(1, len(service_df) + 1)
-            for idx, row in service_df.iterrows():
-                display_df.loc[row.name, "Rank"] = row["Rank"]
-
-            min_net = service_df["Net Bill ($)"].min()
-            max_net = service_df["Net Bill ($)"].max()
-
-            service_rows = display_df[display_df["Service"].str.strip(
-            ).str.capitalize() == service].sort_values("Rank")
-            for _, row in service_rows.iterrows():
-                color = Fore.RED if row["Net Bill ($)"] == max_net else Fore.GREEN if row[
-                    "Net Bill ($)"] == min_net else ""
-                bold = Style.BRIGHT if row["Net Bill ($)"] == min_net else ""
-                reset = Style.RESET_ALL
-                row_parts = [f"{str(row.get(name, '')):<{width}}"
-                             for name, width in display_fields]
-                formatted_row = f"{bold}{row['Rank']:<4}  " + \
-                    "".join(row_parts) + f"{reset}"
-                print(color + formatted_row + reset)
-            continue
+    df = df.assign(_group=df.groupby(group_cols, sort=False).ngroup())
+    savings = savings_vs_current(df, df["_group"])
+    if "% Saved vs Current" in df.columns:
+        savings = savings.where(savings.notna(), df["% Saved vs Current"])
+    df["% Saved vs Current"] = savings
+
+    df = df.sort_values(["_group", "Net Bill ($)"], kind="stable")
+    grouped = df.groupby("_group", sort=False)
+    df["Rank"] = grouped.cumcount() + 1
+    return df.drop(columns="_group")
 
-        current_net = current_rows["Net Bill ($)"].iloc[0]
-        if current_net == 0:
-            warnings.append(
-                f"Current {service} net bill is $0; showing entries without savings.")
-            service_df.sort_values("Net Bill ($)", inplace=True)
-            service_df["Rank"] = range(1, len(service_df) + 1)
-            for idx, row in service_df.iterrows():
-                display_df.loc[row.name, "Rank"] = row["Rank"]
-
-            min_net = service_df["Net Bill ($)"].min()
-            max_net = service_df["Net Bill ($)"].max()
-
-            service_rows = display_df[display_df["Service"].str.strip(
-            ).str.capitalize() == service].sort_values("Rank")
-            for _, row in service_rows.iterrows():
-                color = Fore.RED if row["Net Bill ($)"] == max_net else Fore.GREEN if row["Net Bill ($)"] == min_net else Fore.BLUE if row["Supplier Type"].strip(
-                ).lower() == "current" else ""
-                bold = Style.BRIGHT if row["Net Bill ($)"] == min_net else ""
-                reset = Style.RESET_ALL
-                row_parts = [f"{str(row.get(name, '')):<{width}}"
-                             for name, width in display_fields]
-                formatted_row = f"{bold}{row['Rank']:<4}  " + \
-                    "".join(row_parts) + f"{reset}"
-                print(color + formatted_row + reset)
-            continue
 
-        service_df.sort_values("Net Bill ($)", inplace=True)
-        service_df["Rank"] = range(1, len(service_df) + 1)
-
-        for idx, row in service_df.iterrows():
-            if row["Supplier Type"].strip().lower() == "prospective":
-                savings_pct = (1 - row["Net Bill ($)"] / current_net) * 100
-                display_df.loc[row.name,
-                               "% Saved vs Current"] = f"{savings_pct:.1f}%"
-            display_df.loc[row.name, "Rank"] = row["Rank"]
-
-        min_net = service_df["Net Bill ($)"].min()
-        max_net = service_df["Net Bill ($)"].max()
-
-        service_rows = display_df[display_df["Service"].str.strip(
-        ).str.capitalize() == service].sort_values("Rank")
-        for _, row in service_rows.iterrows():
-            color = Fore.RED if row["Net Bill ($)"] == max_net else Fore.GREEN if row["Net Bill ($)"] == min_net else Fore.BLUE if row["Supplier Type"].strip(
-            ).lower() == "current" else ""
-            bold = Style.BRIGHT if row["Net Bill ($)"] == min_net else ""
-            reset = Style.RESET_ALL
-            row_parts = [f"{str(row.get(name, '')):<{width}}"
-                         for name, width in display_fields]
-            formatted_row = f"{bold}{row['Rank']:<4}  " + \
-                "".join(row_parts) + f"{reset}"
-            print(color + formatted_row + reset)
-
-    if warnings:
-        print("\nNotes:")
-        for note in warnings:
-            print(f"- {note}")
-
-
-def add_savings(df):
-    """Compute % Saved vs Current for each service where a current supplier exists and net bill > 0."""
-    if df.empty or "% Saved vs Current" not in df.columns:
-        return df
-
-    df = df.copy()
-    for service in df["Service"].unique():
-        service_mask = df["Service"] == service
-        current_rows = df[service_mask & (
-            df["Supplier Type"].str.strip().str.lower() == "current")]
-        if current_rows.empty:
+def compare_bundles(df):
+    from bundle_optimizer import load_discounts, optimise_bundles, options_from_results
+
+    while True:
+        path = get_user_input(
+            "Enter a discount offers file (CSV/JSON, leave blank for none): ")
+        try:
+            offers = load_discounts(path) if path else []
+            break
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not read discount offers: {e}")
+
+    bundles = optimise_bundles(options_from_results(df, "Electricity"),
+                               options_from_results(df, "Gas"), offers)
+    print("\n--- Cheapest Dual-Fuel Bundles ---")
+    if not bundles:
+        print(Fore.YELLOW + "⚠️ Need at least one electricity and one gas option." + Style.RESET_ALL)
+        return
+    fields = [("Electricity Supplier", 22), ("Gas Supplier", 15), ("Offer", 15),
+              ("Electricity Net ($)", 21), ("Gas Net ($)", 13), ("Discount ($)", 14),
+              ("Bundle Total ($)", 16)]
+    lines = [f"{'Rank':>4}  " + "".join(f"{name:<{width}}" for name, width in fields)]
+    lines.append("-" * len(lines[0]))
+    for bundle in bundles:
+        row = f"{bundle['Rank']:<4}  " + \
+            "".join(f"{str(bundle[name]):<{width}}" for name, width in fields)
+        lines.append((Style.BRIGHT + Fore.GREEN if bundle["Rank"] == 1 else "") + row + Style.RESET_ALL)
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def simulate_uncertainty(df, usages):
+    from usage_simulation import rates_from_results, simulate_tariffs
+
+    scenarios = int(get_float(
+        "How many usage scenarios to simulate? (e.g. 100000): ", allow_zero=False, min_value=1))
+    print("\n--- Next-Year Bill Simulation ---")
+    for service, usage in usages.items():
+        if "total_units" in usage:
+            print(f"Skipping {service}: block-tariff totals are not simulated yet.")
             continue
-        current_net = current_rows["Net Bill ($)"].iloc[0]
-        if current_net == 0:
+        rates = rates_from_results(df, service)
+        if rates.empty:
             continue
-        alt_mask = service_mask & (
-            df["Supplier Type"].str.strip().str.lower() == "prospective")
-        df.loc[alt_mask, "% Saved vs Current"] = df.loc[alt_mask].apply(
-            lambda row: f"{(1 - row['Net Bill ($)'] / current_net) * 100:.1f}%",
-            axis=1
-        )
-    return df
+        summary = simulate_tariffs(service, usage, rates, n_scenarios=scenarios)
+        sys.stdout.write(summary.to_string(index=False) + "\n\n")
 
 # === Main Comparison Logic ===
 
@@ -325,10 +384,20 @@ def calculate_bill(service, supplier_name, supplier_type, usage_data, rate_data)
 
     if service == "Electricity":
         gross = (usage_data["peak_usage"] * rate_data["peak_rate"] +
-                 usage_data["offpeak_usage"] * rate_data["offpeak_rate"]) / 100
+                 usage_data["offpeak_usage"] * rate_data["offpeak_rate"] +
+                 usage_data.get("shoulder_usage", 0) * rate_data.get("shoulder_rate", rate_data["peak_rate"])) / 100
         fixed = billing_days * rate_data["daily_supply_charge"] / 100
         solar_credit = usage_data["solar_export_kwh"] * \
             rate_data["feed_in_rate"] / 100
+    elif usage_data.get("total_units") is not None or parse_limits(rate_data.get("tier_limits")):
+        # Block tariff: the total is re-split using the tariff's own tier limits.
+        total_units = usage_data.get("total_units")
+        if total_units is None:
+            total_units = usage_data["tier1_units"] + usage_data["tier2_units"] + \
+                usage_data["tier3_units"]
+        gross = block_charge(total_units, rate_data.get("tier_limits"),
+                             rate_data, billing_days, rate_data.get("tier_limit_basis", "day"))
+        fixed = billing_days * rate_data["daily_supply_charge"] / 100
     else:
         gross = (
             usage_data["tier1_units"] * rate_data["tier1_rate"] +
@@ -337,9 +406,12 @@ def calculate_bill(service, supplier_name, supplier_type, usage_data, rate_data)
         ) / 100
         fixed = billing_days * rate_data["daily_supply_charge"] / 100
 
-    gross_total = gross + fixed
+    # Whole cents, as bill_engine.bill_cents(): net is the rounded gross
+    # less the rounded credit, so the bill lines always add up.
+    gross_total = to_cents(gross + fixed)
+    solar_credit = to_cents(solar_credit)
     net = gross_total - solar_credit
-    per_day = net / billing_days
+    per_day = divide_cents(net, billing_days)
 
     return {
         "Service": service,
@@ -348,29 +420,204 @@ def calculate_bill(service, supplier_name, supplier_type, usage_data, rate_data)
         "Billing Days": billing_days,
         "Peak Rate (c/kWh)": rate_data.get("peak_rate") if service == "Electricity" else None,
         "Off-peak Rate (c/kWh)": rate_data.get("offpeak_rate") if service == "Electricity" else None,
+        "Shoulder Rate (c/kWh)": rate_data.get("shoulder_rate") if service == "Electricity" else None,
         "Daily Supply (c)": rate_data.get("daily_supply_charge"),
         "Feed-in Rate (c/kWh)": rate_data.get("feed_in_rate") if service == "Electricity" else None,
         "Tier1 Rate (c/unit)": rate_data.get("tier1_rate") if service == "Gas" else None,
         "Tier2 Rate (c/unit)": rate_data.get("tier2_rate") if service == "Gas" else None,
         "Tier3 Rate (c/unit)": rate_data.get("tier3_rate") if service == "Gas" else None,
-        "Gross Bill ($)": round(gross_total, 2),
-        "Solar Credit ($)": round(solar_credit, 2),
-        "Net Bill ($)": round(net, 2),
-        "Cost Per Day ($)": round(per_day, 2),
+        "Gross Bill ($)": from_cents(gross_total),
+        "Solar Credit ($)": from_cents(solar_credit),
+        "Net Bill ($)": from_cents(net),
+        "Cost Per Day ($)": from_cents(per_day),
         "% Saved vs Current": None
     }
 
+# === Batch Mode ===
+
+
+def compare_households(households, tariffs):
+    import pandas as pd
+    from bill_engine import calculate_bills
+
+    frames = []
+    for service in ["Electricity", "Gas"]:
+        usage = households[households["service"] == service]
+        service_tariffs = tariffs[tariffs["service"] == service]
+        if usage.empty or service_tariffs.empty:
+            continue
+
+        shared = service_tariffs[service_tariffs["household"].isna()]
+        if not shared.empty:
+            frames.append(calculate_bills(service, usage, shared))
+
+        own = service_tariffs[service_tariffs["household"].notna()]
+        matched = usage.merge(own, on=["household", "service"])
+        if not matched.empty:
+            frames.append(calculate_bills(
+                service, matched, matched, aligned=True))
+
+    if not frames:
+        return pd.DataFrame()
+
+    df = pd.concat(frames, ignore_index=True)
+    order = {household: i for i, household in enumerate(
+        households["household"].unique())}
+    df = df.assign(_order=df["Household"].map(order)).sort_values(
+        ["_order", "Service"], kind="stable").drop(columns="_order")
+    df = rank_results(df, ["Household", "Service"])
+    return df[["Household", "Rank"] + [col for col in df.columns if col not in ["Household", "Rank"]]]
+
+
+def ranked_output(df, as_csv):
+    """None for an empty chunk, else the DataFrame or (columns, header-less CSV text)."""
+    if df.empty:
+        return None
+    if as_csv:
+        return list(df.columns), df.to_csv(index=False, header=False)
+    return df
+
+
+def run_batch(households_path, tariffs_path, output="-", chunk_size=500, tou_windows_path=None,
+              catalogue_path=None, on_date=None, output_format="csv", workers=1):
+    import pandas as pd
+    from comparison_inputs import load_households, load_tariffs
+    from meter_data import load_tou_windows
+    from results_store import ResultsSink
+
+    tou_windows = load_tou_windows(
+        tou_windows_path) if tou_windows_path else None
+    households = load_households(households_path, tou_windows)
+    tariffs = load_tariffs(tariffs_path)
+    if catalogue_path:
+        with TariffCatalogue(catalogue_path) as catalogue:
+            tariffs = pd.concat([tariffs] + [catalogue.rate_table(service, on_date)
+                                             for service in households["service"].unique()],
+                                ignore_index=True)
+    household_ids = households["household"].unique()
+    chunks = (households[households["household"].isin(household_ids[start:start + chunk_size])]
+              for start in range(0, len(household_ids), chunk_size))
+    # CSV is rendered where the chunk is priced, so pool workers share the
+    # formatting work instead of funnelling it through this process.
+    as_csv = output == "-" or output_format == "csv"
+    if workers > 1:
+        from parallel_batch import compare_in_pool
+
+        ranked_chunks = compare_in_pool(chunks, tariffs, workers, as_csv)
+    else:
+        ranked_chunks = (ranked_output(compare_households(chunk, tariffs), as_csv)
+                         for chunk in chunks)
+
+    sink = None if output == "-" else ResultsSink(
+        output, format=output_format, buffer_rows=chunk_size * 10)
+    write_header = True
+    try:
+        for ranked in ranked_chunks:
+            if ranked is None:
+                continue
+            if sink is None:
+                columns, text = ranked
+                if write_header:
+                    sys.stdout.write(pd.DataFrame(columns=columns).to_csv(index=False))
+                    write_header = False
+                sys.stdout.write(text)
+                sys.stdout.flush()
+            elif as_csv:
+                sink.write_csv(*ranked)
+            else:
+                sink.write(ranked)
+    finally:
+        ranked_chunks.close()
+        if sink is not None:
+            sink.close()
+
+    if output != "-":
+        print(
+            f"📁 Ranked {len(household_ids)} household(s); results written to {output}", file=sys.stderr)
+
+
+def run_history(history_path, tariffs_path, output="-", tou_windows_path=None,
+                catalogue_path=None, on_date=None, output_format="csv", switching_cost=0.0):
+    import pandas as pd
+    from bill_history import load_bill_history, reprice_history
+    from comparison_inputs import load_tariffs
+    from meter_data import load_tou_windows
+    from results_store import ResultsSink
+
+    tou_windows = load_tou_windows(
+        tou_windows_path) if tou_windows_path else None
+    history = load_bill_history(history_path, tou_windows)
+    tariffs = load_tariffs(tariffs_path)
+    if catalogue_path:
+        with TariffCatalogue(catalogue_path) as catalogue:
+            tariffs = pd.concat([tariffs] + [catalogue.rate_table(service, on_date)
+                                             for service in history["service"].unique()],
+                                ignore_index=True)
+
+    df = reprice_history(history, tariffs, switching_cost)
+    if output == "-":
+        df.to_csv(sys.stdout, index=False)
+        return
+    with ResultsSink(output, format=output_format) as sink:
+        sink.write(df)
+    print(f"📁 Re-priced {len(history)} bill(s); results written to {output}", file=sys.stderr)
+
+
+def run_solar(profile_path, tariffs_path, output="-", tou_windows_path=None,
+              catalogue_path=None, on_date=None, output_format="csv", battery=None,
+              household=None):
+    """Price a solar/battery profile under the shared electricity tariffs.
+
+    As in batch mode, a tariff with a household id only applies to that
+    household: ``household`` picks whose tariffs (e.g. its current one) are
+    compared as well.
+    """
+    import pandas as pd
+    from comparison_inputs import load_tariffs
+    from meter_data import load_tou_windows
+    from results_store import ResultsSink
+    from solar_battery import price_profiles, read_profiles
+
+    windows = load_tou_windows(tou_windows_path) if tou_windows_path else None
+    timestamps, load, solar = read_profiles(profile_path)
+    tariffs = load_tariffs(tariffs_path)
+    if catalogue_path:
+        with TariffCatalogue(catalogue_path) as catalogue:
+            tariffs = pd.concat([tariffs, catalogue.rate_table("Electricity", on_date)],
+                                ignore_index=True)
+    tariffs = tariffs[tariffs["service"] == "Electricity"]
+    if household is not None and not (tariffs["household"] == household).any():
+        raise ValueError(f"{tariffs_path} has no electricity tariffs for household {household}")
+    tariffs = tariffs[tariffs["household"].isna() | (tariffs["household"] == household)]
+
+    df, summary = price_profiles(timestamps, load, solar, tariffs, windows, **(battery or {}))
+    for key, value in summary.items():
+        print(f"{key}: {value}", file=sys.stderr)
+    if output == "-":
+        df.to_csv(sys.stdout, index=False)
+        return
+    with ResultsSink(output, format=output_format) as sink:
+        sink.write(df)
+    print(f"📁 Priced {len(df)} tariff(s); results written to {output}", file=sys.stderr)
+
 # === Main Function ===
 
 
-def main():
-    results = []
+def main(catalogue_path="tariff_catalogue.db"):
+    results = ResultsTable()
+    usages = {}
+    # Services whose catalogue tariffs are already in results; continue mode
+    # would otherwise add them again on every pass.
+    catalogued = set()
     continue_mode = False
+    catalogue = TariffCatalogue(catalogue_path)
 
     while True:
         if results:
             if get_yes_no("Clear previous results and start fresh? (y/n): "):
-                results = []
+                results.clear()
+                usages = {}
+                catalogued = set()
                 continue_mode = False
             else:
                 continue_mode = True
@@ -386,66 +633,141 @@ def main():
 
         if compare_electricity:
             usage = get_electricity_usage()
+            usages["Electricity"] = usage
             show_cents_notice()
             if not continue_mode:
                 name = get_user_input(
                     "\nEnter current electricity supplier name: ")
-                rate_data = {
-                    "peak_rate": get_float("Enter the peak rate (in cents/kWh): ", min_value=0),
-                    "offpeak_rate": get_float("Enter the off-peak rate (in cents/kWh): ", min_value=0),
-                    "daily_supply_charge": get_float("Enter the daily supply charge (in cents): ", min_value=0),
-                    "feed_in_rate": get_float("Enter the solar feed-in tariff rate (in cents/kWh): ", min_value=0) if usage["solar_export_kwh"] > 0 else 0
-                }
+                rate_data = get_electricity_rates(usage)
                 results.append(calculate_bill(
                     "Electricity", name, "Current", usage, rate_data))
 
+            if "Electricity" not in catalogued:
+                priced = price_catalogue("Electricity", usage, catalogue)
+                if priced:
+                    catalogued.add("Electricity")
+                results.extend(priced)
+            results.mark_rendered()
             while get_yes_no("Add another electricity supplier to compare? (y/n): "):
                 name = get_user_input(
                     "Enter prospective electricity supplier name: ")
-                rate_data = {
-                    "peak_rate": get_float("Enter the peak rate (in cents/kWh): ", min_value=0),
-                    "offpeak_rate": get_float("Enter the off-peak rate (in cents/kWh): ", min_value=0),
-                    "daily_supply_charge": get_float("Enter the daily supply charge (in cents): ", min_value=0),
-                    "feed_in_rate": get_float("Enter the solar feed-in tariff rate (in cents/kWh): ", min_value=0) if usage["solar_export_kwh"] > 0 else 0
-                }
+                rate_data = get_electricity_rates(usage)
                 results.append(calculate_bill(
                     "Electricity", name, "Prospective", usage, rate_data))
+                print(results.render_changes())
+                offer_to_catalogue("Electricity", name, rate_data, catalogue)
 
         if compare_gas:
             usage = get_gas_usage()
+            usages["Gas"] = usage
             show_cents_notice()
             if not continue_mode:
                 name = get_user_input("\nEnter current gas supplier name: ")
-                rate_data = {
-                    "daily_supply_charge": get_float("Enter the daily supply charge (in cents): ", min_value=0),
-                    "tier1_rate": get_float("Enter the first tier rate (in cents/unit): ", min_value=0),
-                    "tier2_rate": get_float("Enter the second tier rate (in cents/unit): ", min_value=0),
-                    "tier3_rate": get_float("Enter the third tier rate (in cents/unit): ", min_value=0)
-                }
+                rate_data = get_gas_rates(usage)
                 results.append(calculate_bill(
                     "Gas", name, "Current", usage, rate_data))
 
+            if "Gas" not in catalogued:
+                priced = price_catalogue("Gas", usage, catalogue)
+                if priced:
+                    catalogued.add("Gas")
+                results.extend(priced)
+            results.mark_rendered()
             while get_yes_no("Add another gas supplier to compare? (y/n): "):
                 name = get_user_input("Enter prospective gas supplier name: ")
-                rate_data = {
-                    "daily_supply_charge": get_float("Enter the daily supply charge (in cents): ", min_value=0),
-                    "tier1_rate": get_float("Enter the first tier rate (in cents/unit): ", min_value=0),
-                    "tier2_rate": get_float("Enter the second tier rate (in cents/unit): ", min_value=0),
-                    "tier3_rate": get_float("Enter the third tier rate (in cents/unit): ", min_value=0)
-                }
+                rate_data = get_gas_rates(usage)
                 results.append(calculate_bill(
                     "Gas", name, "Prospective", usage, rate_data))
+                print(results.render_changes())
+                offer_to_catalogue("Gas", name, rate_data, catalogue)
+
+        print("--- Final Comparison Summary ---")
+        print(results.render())
 
-        df = add_savings(pd.DataFrame(results))
-        print_colored_dataframe(df)
+        if choice == "both" and get_yes_no("\nFind the cheapest dual-fuel bundles? (y/n): "):
+            compare_bundles(results.to_dataframe())
+
+        if get_yes_no("\nSimulate next year's bills under usage uncertainty? (y/n): "):
+            simulate_uncertainty(results.to_dataframe(), usages)
 
         if get_yes_no("\nWould you like to export these results to CSV? (y/n): "):
-            export_to_csv(df)
+            export_to_csv(results.to_dataframe())
 
         if not get_yes_no("\nWould you like to start another comparison? (y/n): "):
             print("\n✅ Thank you for using the Utility Comparison Tool. Goodbye!")
             break
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Electricity & gas price comparison tool. Runs interactively "
+                    "unless --households and --tariffs are given.")
+    parser.add_argument("--households", type=str,
+                        help="CSV or JSON file of household usage (batch mode)")
+    parser.add_argument("--history", type=str,
+                        help="CSV or JSON file of past bills to re-price under --tariffs "
+                             "(rolling 12-month costs and break-even)")
+    parser.add_argument("--solar-profile", type=str,
+                        help="CSV of interval consumption and solar generation to simulate "
+                             "and price under every shared electricity tariff in --tariffs")
+    parser.add_argument("--household", type=str,
+                        help="Household id for --solar-profile: its own tariffs in --tariffs "
+                             "(e.g. its current one) are compared too")
+    parser.add_argument("--battery-kwh", type=float, default=0.0,
+                        help="Battery capacity for --solar-profile (0 for none)")
+    parser.add_argument("--battery-kw", type=float,
+                        help="Battery charge/discharge power limit in kW")
+    parser.add_argument("--battery-efficiency", type=float, default=0.9,
+                        help="Battery round-trip efficiency as a fraction")
+    parser.add_argument("--switch-cost", type=float, default=0.0,
+                        help="Default switching cost in dollars for --history break-even "
+                             "(tariffs may set their own switching_cost)")
+    parser.add_argument("--tariffs", type=str,
+                        help="CSV or JSON file of current and prospective tariffs (batch mode)")
+    parser.add_argument("--output", type=str, default="-",
+                        help="File to write ranked results to ('-' for stdout)")
+    parser.add_argument("--format", type=str, choices=["csv", "parquet"], default="csv",
+                        help="Output format for --output files (parquet needs pyarrow and writes a dataset directory)")
+    parser.add_argument("--chunk-size", type=int, default=500,
+                        help="Households priced and written per batch")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for batch mode; households are sharded across them")
+    parser.add_argument("--tou-windows", type=str,
+                        help="JSON file of time-of-use windows for households with a meter_file")
+    parser.add_argument("--catalogue", type=str,
+                        help="Tariff catalogue database (interactive default: tariff_catalogue.db; "
+                             "in batch mode every matching catalogued tariff is compared)")
+    parser.add_argument("--on-date", type=str,
+                        help="Compare catalogued tariffs in force on this date (YYYY-MM-DD, default today)")
+    parser.add_argument("--import-catalogue", type=str, metavar="TARIFFS_FILE",
+                        help="Add the shared tariffs in a CSV/JSON tariffs file to the catalogue and exit")
+    args = parser.parse_args(argv)
+    if sum(bool(path) for path in [args.households, args.history, args.solar_profile]) > 1:
+        parser.error("use only one of --households, --history and --solar-profile")
+    if bool(args.households or args.history or args.solar_profile) != bool(args.tariffs):
+        parser.error("batch mode needs --tariffs with --households, --history or --solar-profile")
+    if args.household is not None and not args.solar_profile:
+        parser.error("--household only applies to --solar-profile")
+    return args
+
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.import_catalogue:
+        with TariffCatalogue(args.catalogue or "tariff_catalogue.db") as catalogue:
+            added = catalogue.import_file(args.import_catalogue)
+        print(f"📚 Added {added} tariff(s) to {catalogue.path}")
+    elif args.solar_profile:
+        run_solar(args.solar_profile, args.tariffs, args.output, args.tou_windows,
+                  args.catalogue, args.on_date, args.format,
+                  {"capacity_kwh": args.battery_kwh, "power_kw": args.battery_kw,
+                   "efficiency": args.battery_efficiency}, args.household)
+    elif args.history:
+        run_history(args.history, args.tariffs, args.output, args.tou_windows,
+                    args.catalogue, args.on_date, args.format, args.switch_cost)
+    elif args.households:
+        run_batch(args.households, args.tariffs,
+                  args.output, args.chunk_size, args.tou_windows,
+                  args.catalogue, args.on_date, args.format, args.workers)
+    else:
+        main(args.catalogue or "tariff_catalogue.db")
@@ -0,0 +1,64 @@
+# Startup-time benchmark for the utility comparison tool.
+#
+# Loads the comparison script in fresh interpreters (without running main())
+# and reports the median wall time next to a bare interpreter, plus whether
+# pandas / numpy were imported. Use --max-ms to fail (exit 1) when startup
+# regresses past a budget, e.g. in CI.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      "Electricity&GasPriceComparison_with_output.py")
+
+LOAD_SNIPPET = (
+    "import json, runpy, sys; "
+    "runpy.run_path({script!r}, run_name='startup_benchmark'); "
+    "print(json.dumps({{name: name in sys.modules for name in ['pandas', 'numpy']}}))"
+)
+
+
+def time_command(args, runs):
+    timings = []
+    output = ""
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run(args, capture_output=True, text=True,
+                                check=True, cwd=os.path.dirname(SCRIPT)).stdout
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), output
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Startup-time benchmark for the comparison tool")
+    parser.add_argument("--runs", type=int, default=10,
+                        help="Interpreter launches per measurement")
+    parser.add_argument("--max-ms", type=float,
+                        help="Fail if the script's startup overhead exceeds this many milliseconds")
+    args = parser.parse_args()
+
+    baseline_ms, _ = time_command([sys.executable, "-c", "pass"], args.runs)
+    script_ms, output = time_command(
+        [sys.executable, "-c", LOAD_SNIPPET.format(script=SCRIPT)], args.runs)
+    loaded = json.loads(output.strip().splitlines()[-1])
+    overhead_ms = script_ms - baseline_ms
+
+    print(f"Bare interpreter:   {baseline_ms:8.1f} ms")
+    print(f"Comparison script:  {script_ms:8.1f} ms")
+    print(f"Startup overhead:   {overhead_ms:8.1f} ms")
+    for name, imported in loaded.items():
+        print(f"{name} imported at startup: {'yes' if imported else 'no'}")
+
+    if args.max_ms is not None and overhead_ms > args.max_ms:
+        print(f"❌ Startup overhead {overhead_ms:.1f} ms exceeds budget of {args.max_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
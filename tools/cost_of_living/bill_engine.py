@@ -0,0 +1,252 @@
+# Vectorised bill engine for the electricity & gas comparison tool.
+# Prices every household in a usage table against every tariff in a rate table
+# in one pass. The arithmetic follows calculate_bill() step for step so the
+# batch results can be checked row-for-row against the interactive path.
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from block_tariff import limits_matrix, split_usage_array
+
+# money.py is shared with the other calculators in tools/.
+_TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _TOOLS_DIR not in sys.path:
+    sys.path.append(_TOOLS_DIR)
+
+from money import divide_cents, from_cents, to_cents  # noqa: E402
+
+ELECTRICITY_USAGE_COLUMNS = ["peak_usage", "offpeak_usage", "billing_days",
+                             "solar_export_kwh", "shoulder_usage"]
+ELECTRICITY_RATE_COLUMNS = ["peak_rate", "offpeak_rate", "daily_supply_charge",
+                            "feed_in_rate", "shoulder_rate"]
+# Columns that may be left out of a table and default to zero. A missing
+# shoulder_rate means a two-rate tariff, so shoulder kWh are charged at the
+# peak rate instead.
+OPTIONAL_COLUMNS = ["solar_export_kwh", "shoulder_usage", "feed_in_rate"]
+GAS_USAGE_COLUMNS = ["billing_days", "tier1_units",
+                     "tier2_units", "tier3_units"]
+GAS_RATE_COLUMNS = ["daily_supply_charge", "tier1_rate",
+                    "tier2_rate", "tier3_rate"]
+
+RESULT_COLUMNS = [
+    "Service", "Supplier Type", "Supplier", "Billing Days",
+    "Peak Rate (c/kWh)", "Off-peak Rate (c/kWh)", "Shoulder Rate (c/kWh)",
+    "Daily Supply (c)",
+    "Feed-in Rate (c/kWh)", "Tier1 Rate (c/unit)", "Tier2 Rate (c/unit)",
+    "Tier3 Rate (c/unit)", "Gross Bill ($)", "Solar Credit ($)",
+    "Net Bill ($)", "Cost Per Day ($)", "% Saved vs Current"
+]
+
+# === Rounding ===
+
+
+def bill_cents(gross_total, solar_credit, billing_days):
+    """Whole-cent (gross, credit, net, per_day) for unrounded kernel results.
+
+    Net is the rounded gross less the rounded credit, so the bill lines
+    always add up; calculate_bill() does the same for a single bill.
+    """
+    gross = to_cents(gross_total)
+    credit = to_cents(solar_credit)
+    net = gross - credit
+    return gross, credit, net, divide_cents(net, billing_days)
+
+# === Cost Kernels ===
+
+
+def electricity_costs(peak_usage, offpeak_usage, billing_days, solar_export_kwh,
+                      shoulder_usage, peak_rate, offpeak_rate, daily_supply_charge,
+                      feed_in_rate, shoulder_rate):
+    """Unrounded (gross_total, solar_credit, net, per_day); arguments broadcast."""
+    gross = (peak_usage * peak_rate + offpeak_usage * offpeak_rate +
+             shoulder_usage * shoulder_rate) / 100
+    fixed = billing_days * daily_supply_charge / 100
+    solar_credit = solar_export_kwh * feed_in_rate / 100
+    gross_total = gross + fixed
+    net = gross_total - solar_credit
+    per_day = net / billing_days
+    return gross_total, solar_credit, net, per_day
+
+
+def gas_costs(billing_days, tier1_units, tier2_units, tier3_units,
+              daily_supply_charge, tier1_rate, tier2_rate, tier3_rate):
+    """Unrounded (gross_total, solar_credit, net, per_day); arguments broadcast."""
+    gross = (
+        tier1_units * tier1_rate +
+        tier2_units * tier2_rate +
+        tier3_units * tier3_rate
+    ) / 100
+    fixed = billing_days * daily_supply_charge / 100
+    solar_credit = np.zeros(np.broadcast(gross, fixed).shape)
+    gross_total = gross + fixed
+    net = gross_total - solar_credit
+    per_day = net / billing_days
+    return gross_total, solar_credit, net, per_day
+
+
+def block_gas_costs(billing_days, tier_units, daily_supply_charge, tier_rates):
+    """Like gas_costs() for block tariffs; tier_units has a trailing tier axis."""
+    usage_charge = 0
+    for tier, rate in enumerate(tier_rates):
+        usage_charge = usage_charge + tier_units[..., tier] * rate
+    gross = usage_charge / 100
+    fixed = billing_days * daily_supply_charge / 100
+    solar_credit = np.zeros(np.broadcast(gross, fixed).shape)
+    gross_total = gross + fixed
+    net = gross_total - solar_credit
+    per_day = net / billing_days
+    return gross_total, solar_credit, net, per_day
+
+# === Table Pricing ===
+
+
+def _column(table, name, default=None):
+    if name in table:
+        values = np.asarray(table[name], dtype=float)
+        return values if default is None else np.where(np.isnan(values), default, values)
+    if default is None:
+        raise KeyError(f"Missing required column '{name}'")
+    return np.broadcast_to(np.asarray(default, dtype=float),
+                           len(next(iter(table.values())))).copy()
+
+
+def _as_table(data):
+    if isinstance(data, pd.DataFrame):
+        return {col: data[col].to_numpy() for col in data.columns}
+    return {col: np.asarray(values) for col, values in data.items()}
+
+
+def _block_tier_rates(rates, limits):
+    """Per-tariff rate columns for every tier of the widest block tariff.
+
+    A tariff with fewer tiers may leave the higher rates blank (they price
+    no units), but every tariff needs a rate for each tier it defines.
+    """
+    n_tiers = np.isfinite(limits).sum(axis=1) + 1
+    tier_rates = []
+    for tier in range(1, limits.shape[1] + 2):
+        rate = _column(rates, f"tier{tier}_rate", default=np.nan)
+        unpriced = np.flatnonzero(np.isnan(rate) & (n_tiers >= tier))
+        if len(unpriced):
+            supplier = rates["supplier_name"][unpriced[0]] if "supplier_name" in rates \
+                else f"row {unpriced[0]}"
+            raise ValueError(f"Gas tariff {supplier} has {n_tiers[unpriced[0]]} tiers "
+                             f"but no tier{tier}_rate")
+        tier_rates.append(np.nan_to_num(rate))
+    return tier_rates
+
+
+def price_matrix(service, usage, rates, aligned=False):
+    """Price every usage row against every rate row.
+
+    Returns unrounded (gross_total, solar_credit, net, per_day) arrays shaped
+    (households, tariffs). With ``aligned=True`` usage row i is priced only
+    against rate row i and the arrays are one-dimensional.
+    """
+    usage = _as_table(usage)
+    rates = _as_table(rates)
+    u_axis = slice(None) if aligned else (slice(None), None)
+    r_axis = slice(None) if aligned else (None, slice(None))
+    if service == "Electricity":
+        u = [_column(usage, col, default=0 if col in OPTIONAL_COLUMNS else None)[u_axis]
+             for col in ELECTRICITY_USAGE_COLUMNS]
+        r = [_column(rates, col, default=0 if col in OPTIONAL_COLUMNS else None)[r_axis]
+             for col in ELECTRICITY_RATE_COLUMNS[:-1]]
+        r.append(_column(rates, "shoulder_rate", default=_column(rates, "peak_rate"))[r_axis])
+        return electricity_costs(*u, *r)
+    has_tiers = all(col in usage for col in GAS_USAGE_COLUMNS)
+    if "total_units" not in usage and "tier_limits" not in rates:
+        u = [_column(usage, col)[u_axis] for col in GAS_USAGE_COLUMNS]
+        r = [_column(rates, col)[r_axis] for col in GAS_RATE_COLUMNS]
+        return gas_costs(*u, *r)
+
+    # Block tariffs re-split each household's total (given, or the sum of its
+    # billed tiers) with their own tier_limits; a total priced against a
+    # tariff without limits is charged at its tier 1 rate.
+    n_rates = len(_column(rates, "daily_supply_charge"))
+    limits = limits_matrix(rates.get("tier_limits", [None] * n_rates))
+    has_limits = np.isfinite(limits).any(axis=1)
+    basis_is_day = np.array([str(basis).strip().lower() != "period"
+                             for basis in rates.get("tier_limit_basis", [None] * n_rates)])
+    billing_days = _column(usage, "billing_days")[u_axis]
+    n_usage = len(_column(usage, "billing_days"))
+    given_total = _column(usage, "total_units", default=np.full(n_usage, np.nan))
+    if has_tiers:
+        tier_sum = _column(usage, "tier1_units") + _column(usage, "tier2_units") + \
+            _column(usage, "tier3_units")
+        total_units = np.where(np.isnan(given_total), tier_sum, given_total)
+    else:
+        total_units = given_total
+    tier_units = split_usage_array(total_units[u_axis], limits, billing_days, basis_is_day)
+    tier_rates = [rate[r_axis] for rate in _block_tier_rates(rates, limits)]
+    costs = block_gas_costs(billing_days, tier_units,
+                            _column(rates, "daily_supply_charge")[r_axis], tier_rates)
+    if not has_tiers:
+        return costs
+
+    # Billed tiers priced against a flat-tier tariff keep their own split.
+    legacy = gas_costs(*[_column(usage, col)[u_axis] for col in GAS_USAGE_COLUMNS],
+                       *[_column(rates, col)[r_axis] for col in GAS_RATE_COLUMNS])
+    use_block = ~np.isnan(given_total)[u_axis] | has_limits[r_axis]
+    return tuple(np.where(use_block, block, flat) for block, flat in zip(costs, legacy))
+
+
+def calculate_bills(service, usage, rates, aligned=False):
+    """Batch equivalent of calculate_bill() over usage x rate tables.
+
+    ``usage`` holds one household per row (optionally with a ``household``
+    id column) and ``rates`` one tariff per row with ``supplier_name`` and
+    ``supplier_type`` columns. Either may be a DataFrame or a mapping of
+    column name to array. The result has one row per household/tariff pair,
+    household-major, with a leading "Household" column followed by the same
+    columns calculate_bill() returns. With ``aligned=True`` the two tables
+    must be the same length and row i of each is priced together.
+    """
+    usage = _as_table(usage)
+    rates = _as_table(rates)
+    gross_total, solar_credit, _, _ = price_matrix(service, usage, rates, aligned=aligned)
+    billing_days = _column(usage, "billing_days")
+    n_households = len(billing_days)
+
+    households = usage.get("household", np.arange(n_households))
+    if aligned:
+        household_idx = tariff_idx = np.arange(n_households)
+    else:
+        n_tariffs = gross_total.shape[1]
+        household_idx = np.repeat(np.arange(n_households), n_tariffs)
+        tariff_idx = np.tile(np.arange(n_tariffs), n_households)
+
+    def rate_col(name, applies):
+        if applies and name in rates:
+            return np.asarray(rates[name], dtype=float)[tariff_idx]
+        if applies and name == "feed_in_rate":
+            return np.zeros(len(tariff_idx))
+        return np.full(len(tariff_idx), None, dtype=object)
+
+    gross, credit, net, per_day = bill_cents(gross_total.ravel(), solar_credit.ravel(),
+                                             billing_days[household_idx])
+    is_electricity = service == "Electricity"
+    is_gas = service == "Gas"
+    return pd.DataFrame({
+        "Household": np.asarray(households)[household_idx],
+        "Service": service,
+        "Supplier Type": np.asarray(rates["supplier_type"], dtype=object)[tariff_idx],
+        "Supplier": np.asarray(rates["supplier_name"], dtype=object)[tariff_idx],
+        "Billing Days": billing_days[household_idx],
+        "Peak Rate (c/kWh)": rate_col("peak_rate", is_electricity),
+        "Off-peak Rate (c/kWh)": rate_col("offpeak_rate", is_electricity),
+        "Shoulder Rate (c/kWh)": rate_col("shoulder_rate", is_electricity),
+        "Daily Supply (c)": rate_col("daily_supply_charge", True),
+        "Feed-in Rate (c/kWh)": rate_col("feed_in_rate", is_electricity),
+        "Tier1 Rate (c/unit)": rate_col("tier1_rate", is_gas),
+        "Tier2 Rate (c/unit)": rate_col("tier2_rate", is_gas),
+        "Tier3 Rate (c/unit)": rate_col("tier3_rate", is_gas),
+        "Gross Bill ($)": from_cents(gross),
+        "Solar Credit ($)": from_cents(credit),
+        "Net Bill ($)": from_cents(net),
+        "Cost Per Day ($)": from_cents(per_day),
+        "% Saved vs Current": np.full(len(tariff_idx), None, dtype=object),
+    }, columns=["Household"] + RESULT_COLUMNS)
@@ -0,0 +1,126 @@
+# Bill-history re-pricing for the utility comparison tool.
+#
+# Loads every bill a household has had (both fuels, any number of periods)
+# and re-prices each period under every candidate tariff, with one
+# period x tariff bill_engine call per household and fuel. For every bill
+# the trailing 12 months of re-priced bills are summed and annualised, and
+# each tariff's annual saving against the household's current tariff gives
+# the months it takes to earn back any switching cost.
+#
+# History file (CSV or JSON list / {"bills": [...]}), one row per bill:
+#   household,service,period_start,period_end,peak_usage,offpeak_usage,solar_export_kwh,tier1_units,tier2_units,tier3_units
+#   H001,electricity,2024-01-01,2024-03-31,820,410,150,,,
+#   H001,gas,2024-01-05,2024-04-04,,,,1200,800,0
+# Usage fields are the same as the batch-mode households file (including
+# total_units and meter_file). billing_days may be given instead of
+# period_start. Tariffs may carry a "switching_cost" in dollars (exit plus
+# sign-up fees); otherwise the run-wide default is used.
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from bill_engine import bill_cents, price_matrix
+from comparison_inputs import load_table, prepare_households
+
+# money.py is shared with the other calculators in tools/.
+_TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _TOOLS_DIR not in sys.path:
+    sys.path.append(_TOOLS_DIR)
+
+from money import from_cents, round_money  # noqa: E402
+
+WINDOW_DAYS = 365
+
+HISTORY_COLUMNS = [
+    "Household", "Service", "Period End", "Rank", "Supplier Type", "Supplier",
+    "Bill Net ($)", "Rolling Net ($)", "Days Covered", "Annualised Net ($)",
+    "Annual Saving vs Current ($)", "Break-even (months)"
+]
+
+
+def load_bill_history(path, tou_windows=None):
+    df = load_table(path, "bills")
+    if "period_end" not in df.columns:
+        raise ValueError(f"{path} is missing the 'period_end' column")
+    df["period_end"] = pd.to_datetime(df["period_end"])
+    if "billing_days" not in df.columns:
+        df["billing_days"] = np.nan
+    if "period_start" in df.columns:
+        # Bill periods include both their start and end dates.
+        derived = (df["period_end"] - pd.to_datetime(df["period_start"])).dt.days + 1
+        df["billing_days"] = df["billing_days"].fillna(derived)
+    df = prepare_households(df, path, tou_windows)
+    return df.sort_values(["household", "service", "period_end"],
+                          kind="stable").reset_index(drop=True)
+
+
+def rolling_totals(period_end, billing_days, values, window_days=WINDOW_DAYS):
+    """Sums of ``values`` rows and of billing days over the bills that ended
+    within ``window_days`` up to and including each bill (bills sorted by end)."""
+    ends = np.asarray(period_end, dtype="datetime64[D]").astype(np.int64)
+    first = np.searchsorted(ends, ends - window_days, side="right")
+    last = np.arange(1, len(ends) + 1)
+    cum_values = np.concatenate([np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0)])
+    cum_days = np.concatenate([[0.0], np.cumsum(np.asarray(billing_days, dtype=float))])
+    return cum_values[last] - cum_values[first], cum_days[last] - cum_days[first]
+
+
+def reprice_history(history, tariffs, switching_cost=0.0, window_days=WINDOW_DAYS):
+    """Rolling annualised cost, saving and break-even for every bill x tariff.
+
+    ``tariffs`` is a batch-mode tariff table: rows with a household id only
+    apply to that household, and its "Current" row is the savings baseline.
+    """
+    frames = []
+    for (household, service), periods in history.groupby(["household", "service"], sort=False):
+        applies = (tariffs["service"] == service) & (
+            tariffs["household"].isna() | (tariffs["household"] == household))
+        candidates = tariffs[applies].reset_index(drop=True)
+        if candidates.empty:
+            continue
+
+        # Each bill is rounded to the cent, as calculate_bill() would bill it.
+        gross_total, solar_credit, _, _ = price_matrix(service, periods, candidates)
+        net = from_cents(bill_cents(gross_total, solar_credit,
+                                    periods["billing_days"].to_numpy(dtype=float)[:, None])[2])
+        rolling, covered = rolling_totals(periods["period_end"], periods["billing_days"],
+                                          net, window_days)
+        annual = round_money(rolling / covered[:, None] * 365)
+
+        is_current = (candidates["supplier_type"].astype(str).str.strip().str.lower()
+                      == "current").to_numpy()
+        if is_current.any():
+            saving = round_money(annual[:, [is_current.argmax()]] - annual)
+        else:
+            saving = np.full(annual.shape, np.nan)
+        cost = candidates["switching_cost"].fillna(switching_cost).to_numpy(dtype=float) \
+            if "switching_cost" in candidates.columns else np.full(len(candidates), switching_cost)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            break_even = np.where(saving > 0, np.round(cost * 12 / saving, 1), np.nan)
+
+        n_periods, n_tariffs = net.shape
+        frames.append(pd.DataFrame({
+            "Household": household,
+            "Service": service,
+            "Period End": np.repeat(periods["period_end"].dt.strftime("%Y-%m-%d").to_numpy(), n_tariffs),
+            "Supplier Type": np.tile(candidates["supplier_type"].to_numpy(), n_periods),
+            "Supplier": np.tile(candidates["supplier_name"].to_numpy(), n_periods),
+            "Bill Net ($)": net.ravel(),
+            "Rolling Net ($)": round_money(rolling).ravel(),
+            "Days Covered": np.repeat(covered, n_tariffs),
+            "Annualised Net ($)": annual.ravel(),
+            "Annual Saving vs Current ($)": saving.ravel(),
+            "Break-even (months)": break_even.ravel(),
+            "_period": np.repeat(np.arange(n_periods), n_tariffs),
+        }))
+
+    if not frames:
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+    df = pd.concat(frames, ignore_index=True)
+    df["_group"] = df.groupby(["Household", "Service", "_period"], sort=False).ngroup()
+    df = df.sort_values(["_group", "Annualised Net ($)"], kind="stable")
+    df["Rank"] = df.groupby("_group", sort=False).cumcount() + 1
+    return df[HISTORY_COLUMNS].reset_index(drop=True)
@@ -0,0 +1,86 @@
+# Block (stepped) tariff engine for gas bills.
+#
+# A block tariff charges the first N units at one rate, the next M at
+# another and so on, with the last tier unbounded. Tier limits are given as
+# block sizes per day (pro-rated by billing days) or per billing period, for
+# any number of tiers. split_usage() handles one bill; split_usage_array()
+# splits whole usage x tariff tables at once from cumulative thresholds.
+
+
+def parse_limits(limits):
+    """Block sizes from a list or a ';'-separated string such as "7.5;7.5"."""
+    if limits is None:
+        return []
+    if isinstance(limits, str):
+        return [float(part) for part in limits.replace(",", ";").split(";") if part.strip()]
+    if isinstance(limits, float) and limits != limits:  # NaN from a blank CSV cell
+        return []
+    return [float(limit) for limit in limits]
+
+
+def tier_rates(rate_data, n_tiers):
+    """Rates (cents per unit) for tiers 1..n_tiers; every tier needs one."""
+    rates = [rate_data.get(f"tier{tier}_rate") for tier in range(1, n_tiers + 1)]
+    missing = [f"tier{tier}_rate" for tier, rate in enumerate(rates, start=1)
+               if rate is None or rate != rate]
+    if missing:
+        raise ValueError(f"Block tariff with {n_tiers} tiers needs {', '.join(missing)}")
+    return rates
+
+
+def split_usage(total_units, limits, billing_days, basis="day"):
+    """Units per tier for one bill; one more tier than there are limits."""
+    scale = 1.0 if str(basis).strip().lower() == "period" else billing_days
+    # Same cumulative-threshold arithmetic as split_usage_array(), so the
+    # scalar and array paths agree to the last bit.
+    units = []
+    lower = 0.0
+    cumulative = 0.0
+    for limit in parse_limits(limits):
+        cumulative += limit
+        upper = cumulative * scale
+        units.append(max(total_units - lower, 0) - max(total_units - upper, 0))
+        lower = upper
+    units.append(max(total_units - lower, 0))
+    return units
+
+
+def block_charge(total_units, limits, rate_data, billing_days, basis="day"):
+    """Usage charge in dollars for a block tariff (rates in cents per unit)."""
+    units = split_usage(total_units, limits, billing_days, basis)
+    return sum(unit * rate for unit, rate in zip(units, tier_rates(rate_data, len(units)))) / 100
+
+
+def split_usage_array(total_units, limits, billing_days, basis_is_day):
+    """Vectorised split of totals into tiers from cumulative thresholds.
+
+    ``limits`` is a (tariffs, tiers - 1) array of block sizes padded with
+    inf and ``basis_is_day`` a per-tariff boolean array. ``total_units`` and
+    ``billing_days`` must broadcast against the tariff axis: shape
+    (households, 1) prices every household against every tariff, shape
+    (tariffs,) pairs them row by row. Returns units with a trailing tier
+    axis, e.g. (households, tariffs, tiers).
+    """
+    import numpy as np
+
+    limits = np.asarray(limits, dtype=float)
+    scale = np.where(np.asarray(basis_is_day, dtype=bool),
+                     np.asarray(billing_days, dtype=float), 1.0)[..., None]
+    upper = np.cumsum(limits, axis=-1) * scale
+    zeros = np.zeros(upper.shape[:-1] + (1,))
+    lower = np.concatenate([zeros, upper], axis=-1)
+    upper = np.concatenate([upper, np.full(zeros.shape, np.inf)], axis=-1)
+    total = np.asarray(total_units, dtype=float)[..., None]
+    return np.maximum(total - lower, 0) - np.maximum(total - upper, 0)
+
+
+def limits_matrix(limit_column):
+    """Pad per-tariff limit lists into a (tariffs, max_tiers - 1) array of block sizes."""
+    import numpy as np
+
+    parsed = [parse_limits(limits) for limits in limit_column]
+    width = max([len(limits) for limits in parsed] + [0])
+    matrix = np.full((len(parsed), width), np.inf)
+    for row, limits in enumerate(parsed):
+        matrix[row, :len(limits)] = limits
+    return matrix
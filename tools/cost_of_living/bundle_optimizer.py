@@ -0,0 +1,135 @@
+# Dual-fuel bundle optimiser for the utility comparison tool.
+#
+# Searches electricity x gas x discount-offer combinations for the cheapest
+# bundles without enumerating every pair. Each option gets a lower bound
+# (its net bill less the most any offer could take off it); options are
+# visited cheapest-bound first and the search stops as soon as no remaining
+# pair can beat the current top-N.
+#
+# Discount offers (CSV or JSON, one per row):
+#   supplier,electricity_pct,gas_pct,bundle_credit,dual_fuel_only
+#   AGL,7,3,50,yes
+#   Red,5,0,0,no
+# electricity_pct / gas_pct are percent off that fuel's usage charges,
+# bundle_credit is dollars off when both fuels come from the supplier, and
+# dual_fuel_only offers only apply when both fuels come from the supplier.
+# A bundle uses at most one offer (the best one that applies).
+
+import heapq
+
+import pandas as pd
+
+from comparison_inputs import load_table
+
+
+def _truthy(value):
+    return str(value).strip().lower() in ["1", "true", "yes", "y"]
+
+
+def _number(value):
+    return 0.0 if value is None or pd.isna(value) or value == "" else float(value)
+
+
+def load_discounts(path):
+    df = load_table(path, "discounts")
+    offers = []
+    for row in df.to_dict("records"):
+        offers.append({
+            "supplier": str(row["supplier"]).strip(),
+            "electricity_pct": _number(row.get("electricity_pct")),
+            "gas_pct": _number(row.get("gas_pct")),
+            "bundle_credit": _number(row.get("bundle_credit")),
+            "dual_fuel_only": _truthy(row.get("dual_fuel_only", False)),
+        })
+    return offers
+
+
+def options_from_results(df, service):
+    """Bundle options for one service from a comparison results table."""
+    rows = df[df["Service"].astype(str).str.strip().str.capitalize() == service]
+    usage_charge = rows["Gross Bill ($)"] - \
+        rows["Billing Days"] * rows["Daily Supply (c)"].astype(float) / 100
+    return [{
+        "supplier": str(supplier).strip(),
+        "supplier_type": str(supplier_type).strip(),
+        "net": float(net),
+        "usage_charge": float(usage),
+    } for supplier, supplier_type, net, usage in zip(
+        rows["Supplier"], rows["Supplier Type"], rows["Net Bill ($)"], usage_charge)]
+
+
+def _saving(electricity, gas, offer):
+    same_e = electricity["supplier"] == offer["supplier"]
+    same_g = gas["supplier"] == offer["supplier"]
+    if offer["dual_fuel_only"] and not (same_e and same_g):
+        return 0.0
+    saving = 0.0
+    if same_e:
+        saving += electricity["usage_charge"] * offer["electricity_pct"] / 100
+    if same_g:
+        saving += gas["usage_charge"] * offer["gas_pct"] / 100
+    if same_e and same_g:
+        saving += offer["bundle_credit"]
+    return saving
+
+
+def optimise_bundles(electricity, gas, offers=(), top_n=5):
+    """Cheapest ``top_n`` (electricity, gas, offer) bundles, cheapest first.
+
+    ``electricity`` and ``gas`` are lists of options with supplier, net and
+    usage_charge (see options_from_results()).
+    """
+    by_supplier = {}
+    for offer in offers:
+        by_supplier.setdefault(offer["supplier"], []).append(offer)
+
+    def lower_bound(option, fuel):
+        best = 0.0
+        for offer in by_supplier.get(option["supplier"], []):
+            saving = option["usage_charge"] * offer[f"{fuel}_pct"] / 100
+            if fuel == "electricity":
+                saving += offer["bundle_credit"]
+            best = max(best, saving)
+        return option["net"] - best
+
+    elec = sorted(((lower_bound(e, "electricity"), i, e)
+                  for i, e in enumerate(electricity)), key=lambda item: item[:2])
+    gas_sorted = sorted(((lower_bound(g, "gas"), i, g)
+                        for i, g in enumerate(gas)), key=lambda item: item[:2])
+    if not elec or not gas_sorted:
+        return []
+
+    best = []  # heap of (-total, -tiebreak, bundle); best[0] is the worst kept
+    for e_bound, e_idx, e in elec:
+        if len(best) == top_n and e_bound + gas_sorted[0][0] >= -best[0][0]:
+            break
+        for g_bound, g_idx, g in gas_sorted:
+            if len(best) == top_n and e_bound + g_bound >= -best[0][0]:
+                break
+            candidates = by_supplier.get(e["supplier"], []) + (
+                by_supplier.get(g["supplier"], []) if g["supplier"] != e["supplier"] else [])
+            offer, saving = None, 0.0
+            for candidate in candidates:
+                candidate_saving = _saving(e, g, candidate)
+                if candidate_saving > saving:
+                    offer, saving = candidate, candidate_saving
+            total = e["net"] + g["net"] - saving
+            bundle = {
+                "Electricity Supplier": e["supplier"],
+                "Gas Supplier": g["supplier"],
+                "Offer": offer["supplier"] if offer else "",
+                "Electricity Net ($)": round(e["net"], 2),
+                "Gas Net ($)": round(g["net"], 2),
+                "Discount ($)": round(saving, 2),
+                "Bundle Total ($)": round(total, 2),
+            }
+            item = (-total, -(e_idx * len(gas) + g_idx), bundle)
+            if len(best) < top_n:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
+
+    bundles = [bundle for _, _, bundle in sorted(best, reverse=True)]
+    for rank, bundle in enumerate(bundles, start=1):
+        bundle["Rank"] = rank
+    return bundles
@@ -0,0 +1,157 @@
+# Loaders for the non-interactive (batch) mode of the utility comparison tool.
+#
+# Households file: one row per household per service, e.g.
+#   household,service,billing_days,peak_usage,offpeak_usage,solar_export_kwh,tier1_units,tier2_units,tier3_units
+#   H001,electricity,91,820,410,150,,,
+#   H001,gas,91,,,,1200,800,0
+#
+# Tariffs file: one row per tariff. Rows with a household id only apply to
+# that household (typically its current supplier); rows without one are
+# compared against every household for that service.
+#   household,service,supplier_type,supplier_name,peak_rate,offpeak_rate,daily_supply_charge,feed_in_rate,tier1_rate,tier2_rate,tier3_rate
+#   H001,electricity,current,Origin,32.1,18.4,105,5,,,
+#   ,electricity,prospective,AGL,29.9,17.2,110,6,,,
+#
+# Gas rows may give a single "total_units" instead of the three tier columns;
+# it is split into blocks by each tariff's "tier_limits" (block sizes such as
+# "7.5;7.5", per day unless "tier_limit_basis" is "period", with the rate for
+# tier N in tierN_rate). Tariffs without tier_limits charge a total at their
+# tier 1 rate.
+#
+# Electricity rows may give a "meter_file" (smart-meter interval export,
+# relative to the households file) instead of usage totals; it is streamed
+# through meter_data.read_interval_usage() and bucketed into peak, shoulder,
+# off-peak and export kWh.
+#
+# JSON files hold the same fields as a list of objects (or an object with a
+# "households" / "tariffs" list).
+
+import json
+import os
+
+import pandas as pd
+
+from block_tariff import parse_limits
+from meter_data import read_interval_usage
+
+USAGE_COLUMNS = {
+    "Electricity": ["billing_days", "peak_usage", "offpeak_usage"],
+    "Gas": ["billing_days", "tier1_units", "tier2_units", "tier3_units"],
+}
+RATE_COLUMNS = {
+    "Electricity": ["peak_rate", "offpeak_rate", "daily_supply_charge"],
+    "Gas": ["daily_supply_charge", "tier1_rate", "tier2_rate", "tier3_rate"],
+}
+
+
+def load_table(path, key=None):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".json":
+        with open(path, "r") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get(key, [])
+        return pd.DataFrame(data)
+    if ext in [".csv", ".txt"]:
+        return pd.read_csv(path, dtype={"household": str})
+    raise ValueError(f"Unsupported file type '{ext}' for {path} (use .csv or .json)")
+
+
+def _normalise_household(df):
+    if "household" not in df.columns:
+        df["household"] = None
+    df["household"] = df["household"].map(
+        lambda value: None if pd.isna(value) or str(value).strip() == "" else str(value).strip())
+    return df
+
+
+def _normalise_service(df, path):
+    if "service" not in df.columns:
+        raise ValueError(f"{path} is missing the 'service' column")
+    df["service"] = df["service"].astype(str).str.strip().str.capitalize()
+    unknown = set(df["service"]) - set(USAGE_COLUMNS)
+    if unknown:
+        raise ValueError(
+            f"{path} has unknown service(s): {', '.join(sorted(unknown))}")
+    return df
+
+
+def _check_columns(df, required, path):
+    for service, columns in required.items():
+        rows = df[df["service"] == service]
+        if rows.empty:
+            continue
+        missing = [col for col in columns
+                   if col not in rows.columns or rows[col].isna().any()]
+        if missing:
+            raise ValueError(
+                f"{path}: {service} rows need values for {', '.join(missing)}")
+
+
+def _check_tier_rates(df, path):
+    # Block tariffs need a rate for each tier their limits define.
+    for idx, limits in df["tier_limits"].items():
+        columns = ["daily_supply_charge"] + \
+            [f"tier{tier}_rate" for tier in range(1, len(parse_limits(limits)) + 2)]
+        missing = [col for col in columns if col not in df.columns or pd.isna(df.at[idx, col])]
+        if missing:
+            raise ValueError(
+                f"{path}: Gas tariff {df.at[idx, 'supplier_name']} needs values for {', '.join(missing)}")
+
+
+def _ingest_meter_files(df, path, tou_windows):
+    has_meter = df["meter_file"].notna() & (
+        df["meter_file"].astype(str).str.strip() != "") & (df["service"] == "Electricity")
+    base_dir = os.path.dirname(os.path.abspath(path))
+    for idx in df.index[has_meter]:
+        meter_path = os.path.join(base_dir, str(df.at[idx, "meter_file"]).strip())
+        for col, value in read_interval_usage(meter_path, tou_windows).items():
+            if col not in df.columns:
+                df[col] = None
+            df.at[idx, col] = value
+    return df
+
+
+def load_households(path, tou_windows=None):
+    return prepare_households(load_table(path, "households"), path, tou_windows)
+
+
+def prepare_households(df, path, tou_windows=None):
+    """Validate household usage rows already read from ``path``."""
+    df = _normalise_service(df, path)
+    df = _normalise_household(df)
+    if df["household"].isna().any():
+        raise ValueError(f"{path}: every row needs a household id")
+    if "meter_file" in df.columns:
+        df = _ingest_meter_files(df, path, tou_windows)
+    if "total_units" in df.columns:
+        has_total = (df["service"] == "Gas") & df["total_units"].notna()
+        _check_columns(df[has_total], {"Gas": ["billing_days"]}, path)
+        _check_columns(df[~has_total], USAGE_COLUMNS, path)
+    else:
+        _check_columns(df, USAGE_COLUMNS, path)
+    for col in ["solar_export_kwh", "shoulder_usage"]:
+        if col not in df.columns:
+            df[col] = 0.0
+        df[col] = df[col].fillna(0.0)
+    return df.reset_index(drop=True)
+
+
+def load_tariffs(path):
+    df = _normalise_service(load_table(path, "tariffs"), path)
+    df = _normalise_household(df)
+    if "tier_limits" in df.columns:
+        blocks = (df["service"] == "Gas") & df["tier_limits"].notna()
+        _check_columns(df[~blocks], RATE_COLUMNS, path)
+        _check_tier_rates(df[blocks], path)
+    else:
+        _check_columns(df, RATE_COLUMNS, path)
+    if "supplier_type" not in df.columns:
+        df["supplier_type"] = "prospective"
+    df["supplier_type"] = df["supplier_type"].fillna(
+        "prospective").astype(str).str.strip().str.capitalize()
+    df["supplier_name"] = df["supplier_name"].astype(str).str.strip()
+    if "feed_in_rate" not in df.columns:
+        df["feed_in_rate"] = 0.0
+    df["feed_in_rate"] = df["feed_in_rate"].fillna(0.0)
+    return df.reset_index(drop=True)
@@ -0,0 +1,317 @@
+# Local HTTP/JSON pricing service for the utility comparison tool.
+#
+# Lets other internal apps run the calculate_bill() / ranking logic
+# without driving the interactive script. Requests that arrive within a few
+# milliseconds of each other are priced together in one vectorised
+# bill_engine batch, then split back out and ranked per request.
+#
+# POST /compare with one comparison per request:
+#   {"service": "electricity",
+#    "usage": {"billing_days": 91, "peak_usage": 820, "offpeak_usage": 410},
+#    "tariffs": [{"supplier_name": "Origin", "supplier_type": "current",
+#                 "peak_rate": 32.1, "offpeak_rate": 18.4, "daily_supply_charge": 105},
+#                {"supplier_name": "AGL", "peak_rate": 29.9, ...}]}
+# Usage and tariff fields are the same as the batch-mode households and
+# tariffs files (see comparison_inputs.py); supplier_type defaults to
+# prospective. The reply is {"results": [...]}, one calculate_bill() row per
+# tariff ordered by rank, with "Rank" and "% Saved vs Current" filled in.
+#
+# GET /health answers {"status": "ok"}. Use service_load_test.py to measure
+# throughput and latency.
+
+import argparse
+import asyncio
+import concurrent.futures
+import importlib.util
+import json
+import os
+import sys
+import time
+
+from block_tariff import parse_limits
+from comparison_inputs import RATE_COLUMNS, USAGE_COLUMNS
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      "Electricity&GasPriceComparison_with_output.py")
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+MAX_BODY = 10 * 1024 * 1024
+
+
+class RequestError(ValueError):
+    pass
+
+
+def load_comparison_script():
+    """Import the comparison script as a module (its filename isn't importable)."""
+    spec = importlib.util.spec_from_file_location("price_comparison", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _missing(value):
+    return value is None or value != value or value == ""
+
+
+def validate_request(request):
+    """Normalised copy of one comparison request; raises RequestError if unusable."""
+    if not isinstance(request, dict):
+        raise RequestError("request body must be a JSON object")
+    service = str(request.get("service", "")).strip().capitalize()
+    if service not in USAGE_COLUMNS:
+        raise RequestError("service must be 'electricity' or 'gas'")
+    usage = request.get("usage")
+    tariffs = request.get("tariffs")
+    if not isinstance(usage, dict):
+        raise RequestError("usage must be an object")
+    if not isinstance(tariffs, list) or not tariffs or \
+            not all(isinstance(tariff, dict) for tariff in tariffs):
+        raise RequestError("tariffs must be a non-empty list of objects")
+
+    required = USAGE_COLUMNS[service]
+    if service == "Gas" and not _missing(usage.get("total_units")):
+        required = ["billing_days"]
+    missing = [col for col in required if _missing(usage.get(col))]
+    if missing:
+        raise RequestError(f"usage needs values for {', '.join(missing)}")
+
+    normalised = []
+    for i, tariff in enumerate(tariffs):
+        tariff = dict(tariff)
+        if _missing(tariff.get("supplier_name")):
+            raise RequestError(f"tariff {i} needs a supplier_name")
+        required = RATE_COLUMNS[service]
+        if service == "Gas" and not _missing(tariff.get("tier_limits")):
+            n_tiers = len(parse_limits(tariff["tier_limits"])) + 1
+            required = ["daily_supply_charge"] + \
+                [f"tier{tier}_rate" for tier in range(1, n_tiers + 1)]
+        missing = [col for col in required if _missing(tariff.get(col))]
+        if missing:
+            raise RequestError(f"tariff {i} needs values for {', '.join(missing)}")
+        tariff["supplier_name"] = str(tariff["supplier_name"]).strip()
+        tariff["supplier_type"] = str(
+            tariff.get("supplier_type") or "prospective").strip().capitalize()
+        normalised.append(tariff)
+    return {"service": service, "usage": usage, "tariffs": normalised}
+
+
+def price_requests(requests, comparison):
+    """Ranked result rows for each validated request, priced in one batch per service."""
+    import pandas as pd
+    from bill_engine import calculate_bills
+
+    frames = []
+    for service in USAGE_COLUMNS:
+        usage_rows, rate_rows = [], []
+        for idx, request in enumerate(requests):
+            if request["service"] != service:
+                continue
+            for tariff in request["tariffs"]:
+                usage_rows.append(dict(request["usage"], household=idx))
+                rate_rows.append(tariff)
+        if usage_rows:
+            # Row i of each table is priced together, so every request's
+            # tariffs go through a single calculate_bills() call.
+            frames.append(calculate_bills(service, pd.DataFrame(usage_rows),
+                                          pd.DataFrame(rate_rows), aligned=True))
+
+    df = comparison.rank_results(pd.concat(frames, ignore_index=True), ["Household"])
+    df = df.astype(object).where(df.notna(), None)
+    results = [[] for _ in requests]
+    for row in df.to_dict("records"):
+        results[row.pop("Household")].append(row)
+    return results
+
+
+class MicroBatcher:
+    """Collects requests for up to ``max_wait`` seconds (or ``max_batch`` requests) and prices them together."""
+
+    def __init__(self, price, max_batch=256, max_wait=0.005):
+        self.price = price
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.priced = 0
+        self._pending = []
+        self._timer = None
+        self._running = False
+        # The loop only keeps weak references to tasks; hold running batches here.
+        self._tasks = set()
+        # One worker: batches are priced in turn while the event loop keeps
+        # accepting and queueing the next one.
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    async def submit(self, request):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((request, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._running:
+            # Requests keep queueing while a batch is priced; the next batch
+            # starts as soon as it finishes, so batches grow with load.
+            return
+        batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+        if batch:
+            self._running = True
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        loop = asyncio.get_running_loop()
+        requests = [request for request, _ in batch]
+        try:
+            try:
+                results = await loop.run_in_executor(self._executor, self.price, requests)
+            except Exception:
+                # Price one at a time so a single bad request only fails itself.
+                results = []
+                for request in requests:
+                    try:
+                        results.append((await loop.run_in_executor(
+                            self._executor, self.price, [request]))[0])
+                    except Exception as e:
+                        results.append(e)
+            self.batches += 1
+            self.priced += len(batch)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        finally:
+            self._running = False
+            if self._pending:
+                self._flush()
+
+    async def close(self):
+        """Wait for batches in flight, then stop the pricing thread."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False)
+
+
+def _json_default(value):
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+class ComparisonService:
+    def __init__(self, host="127.0.0.1", port=8765, max_batch=256, max_wait_ms=5.0):
+        self.host = host
+        self.port = port
+        comparison = load_comparison_script()
+        self.batcher = MicroBatcher(lambda requests: price_requests(requests, comparison),
+                                    max_batch, max_wait_ms / 1000)
+        self.started = time.time()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = (request_line.decode("latin-1").split() + ["", "", ""])[:3]
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {"error": "invalid Content-Length"}, close=True)
+                    break
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {"error": "request body too large"}, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, payload = await self.route(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, payload, close=not keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        if path == "/health":
+            return 200, {"status": "ok", "batches": self.batcher.batches,
+                         "priced": self.batcher.priced,
+                         "uptime_s": round(time.time() - self.started, 1)}
+        if path != "/compare":
+            return 404, {"error": f"unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST for /compare"}
+        try:
+            request = validate_request(json.loads(body or b"null"))
+        except (RequestError, ValueError) as e:
+            return 400, {"error": str(e)}
+        try:
+            return 200, {"results": await self.batcher.submit(request)}
+        except (KeyError, ValueError, TypeError) as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"pricing failed: {e}"}
+
+    @staticmethod
+    async def _respond(writer, status, payload, close=False):
+        body = json.dumps(payload, default=_json_default).encode()
+        head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def serve_forever(self):
+        server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        print(f"🔌 Comparison service listening on http://{self.host}:{self.port}", file=sys.stderr)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON utility comparison service")
+    parser.add_argument("--host", type=str, default="127.0.0.1",
+                        help="Interface to listen on (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--max-batch", type=int, default=256,
+                        help="Most requests priced together in one batch")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0,
+                        help="How long the first request in a batch waits for others")
+    args = parser.parse_args()
+
+    service = ComparisonService(args.host, args.port, args.max_batch, args.max_wait_ms)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print("\n✅ Comparison service stopped.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
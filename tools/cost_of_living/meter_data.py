@@ -0,0 +1,114 @@
+# Smart-meter interval data ingestion for the utility comparison tool.
+#
+# Streams half-hourly / 5-minute interval exports in fixed-size chunks and
+# buckets the readings into time-of-use bands, so memory use stays flat no
+# matter how long the meter history is. The result has the same keys as
+# get_electricity_usage() (plus shoulder_usage) and can go straight into
+# calculate_bill().
+#
+# Expected CSV layout (column names are configurable):
+#   timestamp,import_kwh,export_kwh
+#   2024-07-01 00:00,0.21,0
+#   2024-07-01 00:30,0.18,0
+# Each timestamp marks the start of its interval.
+
+import json
+
+import numpy as np
+import pandas as pd
+
+BANDS = ["peak", "offpeak", "shoulder"]
+WEEKDAYS = [0, 1, 2, 3, 4]
+ALL_DAYS = [0, 1, 2, 3, 4, 5, 6]
+
+# Any minute not covered by a window is off-peak.
+DEFAULT_TOU_WINDOWS = {
+    "peak": [{"start": "15:00", "end": "21:00", "days": WEEKDAYS}],
+    "shoulder": [
+        {"start": "07:00", "end": "15:00", "days": ALL_DAYS},
+        {"start": "21:00", "end": "22:00", "days": ALL_DAYS},
+        {"start": "15:00", "end": "21:00", "days": [5, 6]},
+    ],
+}
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def _minute_of_day(hhmm):
+    hours, minutes = hhmm.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def load_tou_windows(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def build_band_lookup(windows=None):
+    """Band index (into BANDS) for every minute of the week, Monday 00:00 first."""
+    windows = DEFAULT_TOU_WINDOWS if windows is None else windows
+    lookup = np.full(7 * MINUTES_PER_DAY, BANDS.index("offpeak"), dtype=np.int8)
+    for band, band_windows in windows.items():
+        if band not in BANDS:
+            raise ValueError(
+                f"Unknown time-of-use band '{band}' (expected one of {', '.join(BANDS)})")
+        for window in band_windows:
+            start = _minute_of_day(window["start"])
+            end = _minute_of_day(window["end"]) or MINUTES_PER_DAY
+            for day in window.get("days", ALL_DAYS):
+                offset = day * MINUTES_PER_DAY
+                if start < end:
+                    lookup[offset + start:offset + end] = BANDS.index(band)
+                else:  # wraps past midnight
+                    lookup[offset + start:offset + MINUTES_PER_DAY] = BANDS.index(band)
+                    lookup[offset:offset + end] = BANDS.index(band)
+    return lookup
+
+
+def minute_of_week(timestamps):
+    """Minutes since Monday 00:00 for each timestamp (a datetime Series)."""
+    return (timestamps.dt.dayofweek.to_numpy() * MINUTES_PER_DAY +
+            timestamps.dt.hour.to_numpy() * 60 +
+            timestamps.dt.minute.to_numpy())
+
+
+def read_interval_usage(path, windows=None, timestamp_col="timestamp",
+                        import_col="import_kwh", export_col="export_kwh",
+                        chunksize=100_000):
+    """Stream an interval meter export and total it by time-of-use band.
+
+    Returns peak_usage, offpeak_usage, shoulder_usage, solar_export_kwh and
+    billing_days (calendar days from first to last reading, inclusive).
+    """
+    lookup = build_band_lookup(windows)
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [timestamp_col, import_col] + \
+        ([export_col] if export_col in header else [])
+
+    band_totals = np.zeros(len(BANDS))
+    export_total = 0.0
+    first_day = last_day = None
+
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunksize):
+        timestamps = pd.to_datetime(chunk[timestamp_col])
+        imports = chunk[import_col].fillna(0).to_numpy(dtype=float)
+        band_totals += np.bincount(lookup[minute_of_week(timestamps)],
+                                   weights=imports, minlength=len(BANDS))
+        if export_col in chunk.columns:
+            export_total += chunk[export_col].fillna(0).to_numpy(dtype=float).sum()
+
+        days = timestamps.dt.normalize()
+        chunk_first, chunk_last = days.min(), days.max()
+        first_day = chunk_first if first_day is None else min(first_day, chunk_first)
+        last_day = chunk_last if last_day is None else max(last_day, chunk_last)
+
+    if first_day is None:
+        raise ValueError(f"No interval readings found in {path}")
+
+    return {
+        "peak_usage": round(float(band_totals[BANDS.index("peak")]), 3),
+        "offpeak_usage": round(float(band_totals[BANDS.index("offpeak")]), 3),
+        "shoulder_usage": round(float(band_totals[BANDS.index("shoulder")]), 3),
+        "billing_days": float((last_day - first_day).days + 1),
+        "solar_export_kwh": round(float(export_total), 3),
+    }
@@ -0,0 +1,76 @@
+# Process-pool execution for batch mode of the utility comparison tool.
+#
+# The tariff table is shared with every worker once: its numeric columns go
+# into a single shared-memory block and the few text columns (supplier
+# names, types, tier limits) are handed over when each worker starts.
+# Tasks then only carry a shard of households, and results come back in
+# shard order, so the output is identical to a single-process run with the
+# same chunk size.
+
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from comparison_service import load_comparison_script
+
+_worker = {}
+
+
+class SharedTariffs:
+    """A tariff table with its numeric columns in shared memory."""
+
+    def __init__(self, tariffs):
+        numeric = [col for col in tariffs.columns
+                   if pd.api.types.is_numeric_dtype(tariffs[col])]
+        # One row per column, so each column is a contiguous view.
+        values = tariffs[numeric].to_numpy(dtype=float).T
+        self.shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        np.ndarray(values.shape, dtype=float, buffer=self.shm.buf)[:] = values
+        self.spec = {
+            "name": self.shm.name,
+            "shape": values.shape,
+            "columns": list(tariffs.columns),
+            "numeric": numeric,
+            "text": {col: tariffs[col].tolist() for col in tariffs.columns if col not in numeric},
+        }
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_tariffs(spec):
+    """Rebuild the tariff table from a SharedTariffs spec without copying the numeric data."""
+    shm = shared_memory.SharedMemory(name=spec["name"])
+    matrix = np.ndarray(spec["shape"], dtype=float, buffer=shm.buf)
+    data = dict(zip(spec["numeric"], matrix))
+    data.update(spec["text"])
+    return shm, pd.DataFrame(data, columns=spec["columns"], copy=False)
+
+
+def _init_worker(spec, as_csv):
+    _worker["shm"], _worker["tariffs"] = attach_tariffs(spec)
+    _worker["script"] = load_comparison_script()
+    _worker["as_csv"] = as_csv
+
+
+def _compare_shard(households):
+    script = _worker["script"]
+    return script.ranked_output(script.compare_households(households, _worker["tariffs"]),
+                                _worker["as_csv"])
+
+
+def compare_in_pool(shards, tariffs, workers, as_csv=False):
+    """Yield ranked_output() of compare_households() for each household shard, in shard order."""
+    with SharedTariffs(tariffs) as shared:
+        with multiprocessing.Pool(workers, initializer=_init_worker,
+                                  initargs=(shared.spec, as_csv)) as pool:
+            yield from pool.imap(_compare_shard, shards)
@@ -0,0 +1,218 @@
+# Results sink for the utility comparison tool.
+#
+# Rows are buffered in memory and written in bulk. CSV output starts with a
+# schema line followed by the column header, and every flush takes an
+# exclusive lock (a sidecar .lock file) so several processes can append to
+# the same file without interleaving rows. Appending rows whose columns do
+# not match the file's header raises instead of silently misaligning them.
+# A results file from before the schema line (plain header and rows) is
+# migrated in place on the first append, as long as its columns are ones
+# the schema knows; columns it lacks are left blank.
+#
+# With format="parquet" (needs pyarrow) the path is a dataset directory and
+# each flush writes its own part file, so concurrent writers never touch the
+# same file and downstream tools can read the columns directly. Every part
+# gets the same column types from the column list (text for the names and
+# labels below, float64 for bills and rates), so a chunk where a column is
+# all blank - e.g. tier rates in an electricity-only batch - still matches.
+
+import csv
+import os
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+SCHEMA_VERSION = 1
+SCHEMA_PREFIX = "# comparison_results schema_version="
+
+TEXT_COLUMNS = {"Household", "Service", "Supplier Type", "Supplier", "Period End",
+                "% Saved vs Current"}
+INTEGER_COLUMNS = {"Rank"}
+
+
+@contextmanager
+def _locked(path):
+    with open(path + ".lock", "a+") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def read_csv_schema(path):
+    """(schema_version, columns) from a results CSV; version is None for files without a schema line."""
+    with open(path, "r", newline="") as f:
+        first = f.readline().rstrip("\r\n")
+        if first.startswith(SCHEMA_PREFIX):
+            version = int(first[len(SCHEMA_PREFIX):])
+            header = f.readline().rstrip("\r\n")
+        else:
+            version, header = None, first
+    return version, next(csv.reader([header]), [])
+
+
+def parquet_schema(columns):
+    """pyarrow schema for results with these columns, tagged with the schema version."""
+    import pyarrow as pa
+
+    def column_type(col):
+        if col in TEXT_COLUMNS:
+            return pa.string()
+        return pa.int64() if col in INTEGER_COLUMNS else pa.float64()
+
+    return pa.schema([(col, column_type(col)) for col in columns],
+                     metadata={b"schema_version": str(SCHEMA_VERSION).encode()})
+
+
+def read_results(path):
+    """Load results written by ResultsSink (CSV file or Parquet dataset directory)."""
+    if os.path.isdir(path):
+        return pd.read_parquet(path)
+    version, _ = read_csv_schema(path)
+    return pd.read_csv(path, skiprows=1 if version is not None else 0)
+
+
+class ResultsSink:
+    def __init__(self, path, columns=None, format="csv", buffer_rows=5000):
+        if format not in ["csv", "parquet"]:
+            raise ValueError("format must be 'csv' or 'parquet'")
+        if format == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError(
+                    "Parquet output needs pyarrow (pip install pyarrow)") from None
+        self.path = path
+        self.columns = list(columns) if columns is not None else None
+        self.format = format
+        self.buffer_rows = buffer_rows
+        self._buffer = []
+        self._buffered = 0
+        self._parquet_schema = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, rows):
+        """Buffer a DataFrame or list of row dicts; flushes once buffer_rows is reached."""
+        df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows)
+        if df.empty:
+            return
+        if self.columns is None:
+            self.columns = list(df.columns)
+        unexpected = [col for col in df.columns if col not in self.columns]
+        if unexpected:
+            raise ValueError(
+                f"Columns not in the results schema: {', '.join(unexpected)}")
+        self._buffer.append(df.reindex(columns=self.columns))
+        self._buffered += len(df)
+        if self._buffered >= self.buffer_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        df = pd.concat(self._buffer, ignore_index=True)
+        if self.format == "parquet":
+            self._write_parquet(df)
+        else:
+            self._write_csv(df)
+        self._buffer = []
+        self._buffered = 0
+
+    def close(self):
+        self.flush()
+
+    def write_csv(self, columns, text):
+        """Append rows already rendered as header-less CSV text (e.g. by worker processes)."""
+        if self.format != "csv":
+            raise ValueError("write_csv() needs a csv sink")
+        if self.columns is None:
+            self.columns = list(columns)
+        if list(columns) != self.columns:
+            raise ValueError("CSV text columns do not match the results schema")
+        self.flush()
+        if text:
+            self._append_csv(text)
+
+    def _write_csv(self, df):
+        self._append_csv(df.to_csv(index=False, header=False))
+
+    def _append_csv(self, text):
+        with _locked(self.path):
+            if os.path.isfile(self.path) and os.path.getsize(self.path) > 0:
+                version, columns = read_csv_schema(self.path)
+                if version is None and set(columns) <= set(self.columns):
+                    self._migrate_legacy_csv()
+                    version, columns = SCHEMA_VERSION, self.columns
+                if version != SCHEMA_VERSION or columns != self.columns:
+                    raise ValueError(
+                        f"{self.path} was written with a different results schema "
+                        f"(version {version}); write to a new file instead")
+                with open(self.path, "a", newline="") as f:
+                    f.write(text)
+            else:
+                with open(self.path, "w", newline="") as f:
+                    f.write(f"{SCHEMA_PREFIX}{SCHEMA_VERSION}\n")
+                    f.write(pd.DataFrame(columns=self.columns).to_csv(index=False))
+                    f.write(text)
+
+    def _migrate_legacy_csv(self):
+        """Rewrite a schema-less results file with the schema line and this sink's columns."""
+        legacy = pd.read_csv(self.path, dtype=str, keep_default_na=False)
+        tmp = self.path + ".migrating"
+        with open(tmp, "w", newline="") as f:
+            f.write(f"{SCHEMA_PREFIX}{SCHEMA_VERSION}\n")
+            f.write(legacy.reindex(columns=self.columns, fill_value="").to_csv(index=False))
+        os.replace(tmp, self.path)
+
+    def _check_parquet_parts(self, schema):
+        """Raise if a part already in the dataset has other columns or types."""
+        import pyarrow.parquet as pq
+
+        for name in sorted(os.listdir(self.path)):
+            if name.startswith(".") or not name.endswith(".parquet"):
+                continue
+            existing = pq.read_schema(os.path.join(self.path, name))
+            version = (existing.metadata or {}).get(b"schema_version", b"").decode() or None
+            if version != str(SCHEMA_VERSION) or not existing.equals(schema):
+                raise ValueError(
+                    f"{self.path} was written with a different results schema "
+                    f"(version {version}); write to a new dataset instead")
+
+    def _write_parquet(self, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        os.makedirs(self.path, exist_ok=True)
+        if self._parquet_schema is None:
+            schema = parquet_schema(self.columns)
+            self._check_parquet_parts(schema)
+            self._parquet_schema = schema
+        df = df.astype({col: "string" if col in TEXT_COLUMNS else
+                        int if col in INTEGER_COLUMNS else float for col in df.columns})
+        table = pa.Table.from_pandas(df, schema=self._parquet_schema, preserve_index=False)
+        name = f"part-{os.getpid()}-{uuid.uuid4().hex}.parquet"
+        # Readers skip dot-files, so a half-written part is never picked up.
+        tmp = os.path.join(self.path, "." + name)
+        pq.write_table(table, tmp)
+        os.replace(tmp, os.path.join(self.path, name))
@@ -0,0 +1,203 @@
+# Lightweight results table for the interactive comparison loop.
+#
+# Keeps calculate_bill() rows as plain dicts and ranks / renders them in
+# pure Python, so a short interactive run never has to import pandas.
+# Rankings are maintained incrementally, so adding one more supplier in a
+# long continue-mode session only touches that service's rows.
+# to_dataframe() loads pandas only when a DataFrame-only feature (export,
+# bundles, simulation) actually asks for one.
+
+import bisect
+
+from colorama import Fore, Style
+
+BASE_FIELDS = [("Service", 15), ("Supplier Type", 15),
+               ("Supplier", 15), ("Billing Days", 14)]
+RATE_FIELDS = [
+    ("Peak Rate (c/kWh)", 20),
+    ("Off-peak Rate (c/kWh)", 24),
+    ("Shoulder Rate (c/kWh)", 23),
+    ("Daily Supply (c)", 17),
+    ("Feed-in Rate (c/kWh)", 22),
+    ("Tier1 Rate (c/unit)", 21),
+    ("Tier2 Rate (c/unit)", 21),
+    ("Tier3 Rate (c/unit)", 21)
+]
+TAIL_FIELDS = [("Gross Bill ($)", 16), ("Solar Credit ($)", 18),
+               ("Net Bill ($)", 14), ("Cost Per Day ($)", 18), ("% Saved vs Current", 20)]
+
+
+def _blank(value):
+    return value is None or value != value or value == ""
+
+
+def _supplier_type(row):
+    return str(row["Supplier Type"]).strip().lower()
+
+
+def _savings(row, current_net):
+    if current_net is None or current_net == 0 or _supplier_type(row) != "prospective":
+        return row.get("% Saved vs Current")
+    return f"{(1 - row['Net Bill ($)'] / current_net) * 100:.1f}%"
+
+
+def _current_net(rows):
+    for row in rows:
+        if _supplier_type(row) == "current":
+            return row["Net Bill ($)"]
+    return None
+
+
+class ResultsTable:
+    """Rows kept ranked per service as they are appended.
+
+    Each append inserts into its service's net-bill order, updates that
+    service's min / max and current bill, and marks only the rows whose
+    rendered line changed; formatted rows are cached between renders.
+    """
+
+    def __init__(self, rows=None):
+        self.clear()
+        self.extend(rows or [])
+
+    def __len__(self):
+        return len(self.rows)
+
+    def append(self, row):
+        key = str(row["Service"]).strip().capitalize()
+        group = self._groups.setdefault(
+            key, {"keys": [], "ranked": [], "current_net": None})
+        sort_key = (row["Net Bill ($)"], len(self.rows))
+        self.rows.append(row)
+
+        ranked = group["ranked"]
+        position = bisect.bisect_right(group["keys"], sort_key)
+        group["keys"].insert(position, sort_key)
+        ranked.insert(position, row)
+        # Rows below the new one move down a rank (which covers a displaced
+        # cheapest row); a new dearest row takes the red off the old ones.
+        self._changed.update(id(other) for other in ranked[position:])
+        above = position - 1
+        if position == len(ranked) - 1 and above >= 0 and \
+                ranked[above]["Net Bill ($)"] < row["Net Bill ($)"]:
+            old_max = ranked[above]["Net Bill ($)"]
+            while above >= 0 and ranked[above]["Net Bill ($)"] == old_max:
+                self._changed.add(id(ranked[above]))
+                above -= 1
+
+        if group["current_net"] is None and _supplier_type(row) == "current":
+            group["current_net"] = row["Net Bill ($)"]
+            for other in ranked:
+                self._bodies.pop(id(other), None)
+                self._changed.add(id(other))
+        for col, _ in RATE_FIELDS:
+            if col not in self._has_data and not _blank(row.get(col)):
+                # A new rate column shifts every line.
+                self._has_data.add(col)
+                self._bodies.clear()
+                self._changed.update(id(other) for other in self.rows)
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def clear(self):
+        self.rows = []
+        self._groups = {}
+        self._bodies = {}
+        self._changed = set()
+        self._has_data = set()
+
+    def groups(self, key=lambda row: str(row["Service"]).strip().capitalize()):
+        grouped = {}
+        for row in self.rows:
+            grouped.setdefault(key(row), []).append(row)
+        return grouped
+
+    def with_savings(self):
+        """Rows in their original order with % Saved vs Current filled."""
+        current = {service: _current_net(rows)
+                   for service, rows in self.groups(key=lambda row: row["Service"]).items()}
+        return [dict(row, **{"% Saved vs Current": _savings(row, current[row["Service"]])})
+                for row in self.rows]
+
+    def to_dataframe(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.with_savings())
+
+    def _display_fields(self):
+        return BASE_FIELDS + \
+            [(col, width) for col, width in RATE_FIELDS if col in self._has_data] + TAIL_FIELDS
+
+    def _line(self, group, rank, row, display_fields):
+        body = self._bodies.get(id(row))
+        if body is None:
+            body = self._bodies[id(row)] = self.format_row(
+                row, group["current_net"], display_fields)
+        net = row["Net Bill ($)"]
+        min_net = group["ranked"][0]["Net Bill ($)"]
+        max_net = group["ranked"][-1]["Net Bill ($)"]
+        color = Fore.RED if net == max_net else Fore.GREEN if net == min_net else \
+            Fore.BLUE if _supplier_type(row) == "current" else ""
+        bold = Style.BRIGHT if net == min_net else ""
+        return color + f"{bold}{rank:<4}  " + body + Style.RESET_ALL + Style.RESET_ALL
+
+    def render(self):
+        """The colour-coded comparison summary as a single string."""
+        if not self.rows:
+            return Fore.YELLOW + "⚠️ No data to display." + Style.RESET_ALL
+
+        display_fields = self._display_fields()
+        header = f"{'Rank':>4}  " + \
+            "".join(f"{name:<{width}}" for name, width in display_fields)
+        lines = [header, "-" * len(header)]
+        warnings = []
+
+        for service, group in self._groups.items():
+            current_net = group["current_net"]
+            if current_net is None:
+                warnings.append(
+                    f"No current supplier for {service}; showing prospective options without savings.")
+            elif current_net == 0:
+                warnings.append(
+                    f"Current {service} net bill is $0; showing entries without savings.")
+            lines.extend(self._line(group, rank, row, display_fields)
+                         for rank, row in enumerate(group["ranked"], start=1))
+        self._changed.clear()
+
+        if warnings:
+            lines.append("\nNotes:")
+            lines.extend(f"- {note}" for note in warnings)
+        return "\n".join(lines)
+
+    def render_changes(self):
+        """Lines for rows appended or re-ranked since the last render, with each service's range."""
+        display_fields = self._display_fields()
+        lines = []
+        for service, group in self._groups.items():
+            changed = [(rank, row) for rank, row in enumerate(group["ranked"], start=1)
+                       if id(row) in self._changed]
+            if not changed:
+                continue
+            lines.append(f"{service}: {len(group['ranked'])} option(s), net "
+                         f"${group['ranked'][0]['Net Bill ($)']} to ${group['ranked'][-1]['Net Bill ($)']}")
+            lines.extend(self._line(group, rank, row, display_fields) for rank, row in changed)
+        self._changed.clear()
+        return "\n".join(lines)
+
+    def mark_rendered(self):
+        """Forget pending changes, e.g. after a bulk extend() that shouldn't be echoed."""
+        self._changed.clear()
+
+    @staticmethod
+    def format_row(row, current_net, display_fields):
+        values = dict(row, **{"% Saved vs Current": _savings(row, current_net)})
+        parts = []
+        for name, width in display_fields:
+            value = values.get(name)
+            value = "" if _blank(value) else value
+            if name in ["Service", "Supplier Type", "Supplier"]:
+                value = str(value).strip().ljust(15)
+            parts.append(f"{str(value):<{width}}")
+        return "".join(parts)
@@ -0,0 +1,152 @@
+# Load-test client for comparison_service.py.
+#
+# Opens --concurrency keep-alive connections to the service, sends
+# --requests randomised comparison requests between them and reports
+# throughput plus p50 / p95 / p99 latency. --spawn starts a service on a
+# free local port for the duration of the test.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from usage_simulation import nearest_rank
+
+SERVICE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "comparison_service.py")
+
+
+def make_request(rng, n_tariffs):
+    tariffs = [{"supplier_name": "Current", "supplier_type": "current",
+                "peak_rate": 32.0, "offpeak_rate": 18.0,
+                "daily_supply_charge": 105.0, "feed_in_rate": 5.0}]
+    for i in range(n_tariffs - 1):
+        tariffs.append({"supplier_name": f"Offer {i + 1}",
+                        "peak_rate": round(rng.uniform(24, 38), 2),
+                        "offpeak_rate": round(rng.uniform(12, 22), 2),
+                        "daily_supply_charge": round(rng.uniform(80, 130), 2),
+                        "feed_in_rate": round(rng.uniform(2, 8), 2)})
+    return {"service": "electricity",
+            "usage": {"billing_days": rng.choice([30, 61, 91]),
+                      "peak_usage": round(rng.uniform(200, 1200), 1),
+                      "offpeak_usage": round(rng.uniform(100, 800), 1),
+                      "solar_export_kwh": round(rng.uniform(0, 300), 1)},
+            "tariffs": tariffs}
+
+
+async def post_json(reader, writer, host, path, payload):
+    body = json.dumps(payload).encode()
+    writer.write((f"POST {path} HTTP/1.1\r\nHost: {host}\r\n"
+                  f"Content-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def worker(host, port, queue, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            try:
+                payload = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            start = time.perf_counter()
+            status, reply = await post_json(reader, writer, host, "/compare", payload)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(reply.get("error", status))
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, n_requests, concurrency, n_tariffs, seed):
+    rng = random.Random(seed)
+    queue = asyncio.Queue()
+    for _ in range(n_requests):
+        queue.put_nowait(make_request(rng, n_tariffs))
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*[worker(host, port, queue, latencies, errors)
+                           for _ in range(concurrency)])
+    return time.perf_counter() - start, latencies, errors
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[nearest_rank(pct, len(ordered))]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(host, port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"service did not start on {host}:{port}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the comparison service")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=5000, help="Total requests to send")
+    parser.add_argument("--concurrency", type=int, default=64,
+                        help="Simultaneous keep-alive connections")
+    parser.add_argument("--tariffs", type=int, default=20, help="Tariffs per request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spawn", action="store_true",
+                        help="Start comparison_service.py on a free port for the test")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0,
+                        help="Batching window passed to a spawned service")
+    args = parser.parse_args()
+
+    service = None
+    if args.spawn:
+        args.port = free_port()
+        service = subprocess.Popen([sys.executable, SERVICE, "--host", args.host,
+                                    "--port", str(args.port),
+                                    "--max-wait-ms", str(args.max_wait_ms)],
+                                   cwd=os.path.dirname(SERVICE))
+    try:
+        wait_for_port(args.host, args.port)
+        elapsed, latencies, errors = asyncio.run(run_load(
+            args.host, args.port, args.requests, args.concurrency, args.tariffs, args.seed))
+    finally:
+        if service is not None:
+            service.terminate()
+            service.wait()
+
+    print(f"Requests:     {len(latencies)} ({len(errors)} failed)")
+    print(f"Elapsed:      {elapsed:8.2f} s")
+    print(f"Throughput:   {len(latencies) / elapsed:8.1f} req/s")
+    for pct in (50, 95, 99):
+        print(f"p{pct} latency:  {percentile(latencies, pct) * 1000:8.1f} ms")
+    if errors:
+        print(f"❌ First error: {errors[0]}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# Solar and battery simulation for the utility comparison tool.
+#
+# Takes hourly or half-hourly household consumption and solar generation
+# profiles, works out per interval how much solar is used on site, stored in
+# an optional battery, exported or made up from the grid, and prices the
+# resulting grid flows under every tariff's time-of-use and feed-in rates.
+#
+# The battery runs a self-consumption strategy (charge from surplus solar,
+# discharge to cover load), so the dispatch does not depend on the tariff
+# and is simulated once. Grid flows are then bucketed into time-of-use
+# bands and priced for all tariffs at once with bill_engine.
+#
+# Profile CSV (column names are configurable):
+#   timestamp,consumption_kwh,generation_kwh
+#   2024-07-01 00:00,0.21,0
+#   2024-07-01 00:30,0.18,0
+# Each timestamp marks the start of its interval.
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from bill_engine import calculate_bills
+from meter_data import BANDS, build_band_lookup, minute_of_week
+
+
+def read_profiles(path, timestamp_col="timestamp", load_col="consumption_kwh",
+                  solar_col="generation_kwh"):
+    """Timestamps (a datetime Series), consumption and generation arrays in kWh per interval."""
+    df = pd.read_csv(path, usecols=[timestamp_col, load_col, solar_col])
+    if df.empty:
+        raise ValueError(f"No intervals found in {path}")
+    df[timestamp_col] = pd.to_datetime(df[timestamp_col])
+    df = df.sort_values(timestamp_col, kind="stable").reset_index(drop=True)
+    return (df[timestamp_col],
+            df[load_col].fillna(0).to_numpy(dtype=float),
+            df[solar_col].fillna(0).to_numpy(dtype=float))
+
+
+def interval_hours(timestamps):
+    if len(timestamps) < 2:
+        return 0.5
+    return float(timestamps.diff().dropna().median() / pd.Timedelta(hours=1))
+
+
+def dispatch(load, solar, hours=0.5, capacity_kwh=0.0, power_kw=None,
+             efficiency=0.9, initial_soc=0.0):
+    """Per-interval energy flows (kWh) for a self-consumption battery strategy.
+
+    ``efficiency`` is the battery's round-trip efficiency, split evenly
+    between charging and discharging; ``power_kw`` caps the energy moved in
+    or out per interval and ``initial_soc`` is the starting charge as a
+    fraction of capacity.
+    """
+    self_consumed = np.minimum(load, solar)
+    surplus = solar - self_consumed
+    deficit = load - self_consumed
+    charge = np.zeros(len(load))
+    discharge = np.zeros(len(load))
+    soc = np.zeros(len(load))
+
+    if capacity_kwh > 0:
+        step = math.inf if not power_kw else power_kw * hours
+        one_way = math.sqrt(efficiency)
+        stored = initial_soc * capacity_kwh
+        # State of charge carries from one interval to the next, so this is
+        # the one sequential step; it runs once and is shared by every tariff.
+        for i, (spare, short) in enumerate(zip(surplus.tolist(), deficit.tolist())):
+            if spare > 0:
+                taken = min(spare, step, (capacity_kwh - stored) / one_way)
+                charge[i] = taken
+                stored += taken * one_way
+            elif short > 0:
+                given = min(short, step, stored * one_way)
+                discharge[i] = given
+                stored -= given / one_way
+            soc[i] = stored
+
+    return {
+        "self_consumed": self_consumed + discharge,
+        "grid_import": deficit - discharge,
+        "grid_export": surplus - charge,
+        "battery_charge": charge,
+        "battery_discharge": discharge,
+        "state_of_charge": soc,
+    }
+
+
+def band_usage(timestamps, grid_import, grid_export, windows=None):
+    """calculate_bill() usage from per-interval grid flows."""
+    totals = np.bincount(build_band_lookup(windows)[minute_of_week(timestamps)],
+                         weights=grid_import, minlength=len(BANDS))
+    days = timestamps.dt.normalize()
+    return {
+        "peak_usage": float(totals[BANDS.index("peak")]),
+        "offpeak_usage": float(totals[BANDS.index("offpeak")]),
+        "shoulder_usage": float(totals[BANDS.index("shoulder")]),
+        "billing_days": float((days.max() - days.min()).days + 1),
+        "solar_export_kwh": float(np.sum(grid_export)),
+    }
+
+
+def summarise(load, solar, flows):
+    generated = float(solar.sum())
+    self_consumed = float(flows["self_consumed"].sum())
+    return {
+        "consumption_kwh": round(float(load.sum()), 3),
+        "generation_kwh": round(generated, 3),
+        "self_consumed_kwh": round(self_consumed, 3),
+        "self_consumption_pct": round(self_consumed / generated * 100, 1) if generated else 0.0,
+        "grid_import_kwh": round(float(flows["grid_import"].sum()), 3),
+        "grid_export_kwh": round(float(flows["grid_export"].sum()), 3),
+        "battery_throughput_kwh": round(float(flows["battery_discharge"].sum()), 3),
+    }
+
+
+def price_profiles(timestamps, load, solar, tariffs, windows=None, **battery):
+    """Bills for every electricity tariff with the solar/battery system and on grid alone.
+
+    ``battery`` takes dispatch()'s capacity_kwh, power_kw, efficiency and
+    initial_soc. Returns (results, summary): one row per tariff, cheapest
+    first, and the energy totals from summarise().
+    """
+    flows = dispatch(load, solar, interval_hours(timestamps), **battery)
+    with_system = band_usage(timestamps, flows["grid_import"], flows["grid_export"], windows)
+    grid_only = band_usage(timestamps, load, np.zeros(len(load)), windows)
+
+    bills = calculate_bills("Electricity", pd.DataFrame([with_system, grid_only]),
+                            tariffs.reset_index(drop=True))
+    n_tariffs = len(tariffs)
+    with_rows = bills.iloc[:n_tariffs].reset_index(drop=True)
+    grid_net = bills["Net Bill ($)"].iloc[n_tariffs:].to_numpy()
+    results = with_rows.drop(columns=["Household", "% Saved vs Current", "Tier1 Rate (c/unit)",
+                                      "Tier2 Rate (c/unit)", "Tier3 Rate (c/unit)"])
+    results = results.assign(**{
+        "Grid-only Net ($)": grid_net,
+        "System Saving ($)": np.round(grid_net - with_rows["Net Bill ($)"].to_numpy(), 2),
+    })
+    results = results.sort_values("Net Bill ($)", kind="stable").reset_index(drop=True)
+    results.insert(0, "Rank", np.arange(1, n_tariffs + 1))
+    return results, summarise(load, solar, flows)
@@ -0,0 +1,186 @@
+# Local tariff catalogue for the utility comparison tool.
+#
+# Prospective tariffs are kept in a SQLite file indexed by service, supplier
+# and effective date, so market offers only have to be entered once. The
+# database is opened on first use and rows are only read for the service
+# and date being compared. pandas is only imported for the table helpers.
+#
+# Block tariffs can have any number of tiers: besides the tier1-3 rate
+# columns, every tier's rate is kept in the "tier_rates" text column (like
+# tier_limits, e.g. "3.1;2.9;2.5;2.2") and read back as tierN_rate keys.
+
+import datetime
+import math
+import os
+import re
+import sqlite3
+
+RATE_FIELDS = [
+    "peak_rate", "offpeak_rate", "shoulder_rate", "daily_supply_charge",
+    "feed_in_rate", "tier1_rate", "tier2_rate", "tier3_rate"
+]
+# Block-tariff thresholds and rates, stored as text ("7.5;7.5", "day" / "period"
+# and "3.1;2.9;2.5").
+TEXT_FIELDS = ["tier_limits", "tier_limit_basis", "tier_rates"]
+_TIER_RATE = re.compile(r"tier(\d+)_rate")
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS tariffs (
+    id INTEGER PRIMARY KEY,
+    service TEXT NOT NULL,
+    supplier_name TEXT NOT NULL,
+    effective_from TEXT NOT NULL,
+    effective_to TEXT,
+    {", ".join(f"{field} REAL" for field in RATE_FIELDS)},
+    {", ".join(f"{field} TEXT" for field in TEXT_FIELDS)},
+    UNIQUE (service, supplier_name, effective_from)
+);
+CREATE INDEX IF NOT EXISTS idx_tariffs_service_date
+    ON tariffs (service, effective_from);
+"""
+
+
+def _missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value)) or str(value).strip() == ""
+
+
+def _join_tier_rates(tariff):
+    """All tierN_rate values of a tariff as "r1;r2;...", or None without any."""
+    rates = {int(match.group(1)): value for match, value in
+             ((_TIER_RATE.fullmatch(str(key)), value) for key, value in tariff.items())
+             if match and not _missing(value)}
+    if not rates:
+        return None
+    return ";".join("" if tier not in rates else f"{float(rates[tier]):.17g}"
+                    for tier in range(1, max(rates) + 1))
+
+
+def _split_tier_rates(row):
+    """``row`` with a tierN_rate key for every rate in its tier_rates text."""
+    for tier, rate in enumerate((row.get("tier_rates") or "").split(";"), start=1):
+        if rate.strip():
+            row[f"tier{tier}_rate"] = float(rate)
+    return row
+
+
+def _iso(day):
+    if _missing(day):
+        return datetime.date.today().isoformat()
+    if isinstance(day, (datetime.date, datetime.datetime)):
+        return day.strftime("%Y-%m-%d")
+    return datetime.date.fromisoformat(str(day)).isoformat()
+
+
+class TariffCatalogue:
+    def __init__(self, path="tariff_catalogue.db"):
+        self.path = path
+        self._conn = None
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.executescript(SCHEMA)
+            self._migrate()
+        return self._conn
+
+    def _migrate(self):
+        # Catalogues created before block tariffs lack the text columns.
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(tariffs)")}
+        with self._conn:
+            for field in TEXT_FIELDS:
+                if field not in existing:
+                    self._conn.execute(f"ALTER TABLE tariffs ADD COLUMN {field} TEXT")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, service, supplier_name, rate_data, effective_from=None, effective_to=None):
+        """Insert or replace the tariff for this service/supplier/effective date."""
+        self.add_many([dict(rate_data, service=service, supplier_name=supplier_name,
+                            effective_from=effective_from, effective_to=effective_to)])
+
+    def add_many(self, tariffs):
+        columns = ["service", "supplier_name",
+                   "effective_from", "effective_to"] + RATE_FIELDS + TEXT_FIELDS
+        rows = []
+        for tariff in tariffs:
+            row = {field: tariff.get(field) for field in RATE_FIELDS + TEXT_FIELDS}
+            if isinstance(row["tier_limits"], (list, tuple)):
+                row["tier_limits"] = ";".join(f"{limit:g}" for limit in row["tier_limits"])
+            row["tier_rates"] = _join_tier_rates(tariff)
+            row.update(
+                service=str(tariff["service"]).strip().capitalize(),
+                supplier_name=str(tariff["supplier_name"]).strip(),
+                effective_from=_iso(tariff.get("effective_from")),
+                effective_to=None if _missing(tariff.get("effective_to")) else _iso(
+                    tariff["effective_to"]),
+            )
+            rows.append([None if _missing(row[col]) else row[col] for col in columns])
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO tariffs ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})", rows)
+        return len(rows)
+
+    def import_file(self, path):
+        """Add every shared (non-household) tariff from a batch-mode tariffs file."""
+        from comparison_inputs import load_tariffs
+
+        tariffs = load_tariffs(path)
+        tariffs = tariffs[tariffs["household"].isna()]
+        return self.add_many(tariffs.to_dict("records"))
+
+    def count(self, service, on_date=None, supplier=None):
+        if self._conn is None and not os.path.isfile(self.path):
+            return 0
+        return sum(1 for _ in self.iter_tariffs(service, on_date, supplier))
+
+    def iter_tariffs(self, service, on_date=None, supplier=None):
+        """Yield the tariff in force on ``on_date`` (default today) for each supplier.
+
+        When a supplier has several versions, only the latest one that has
+        started by that date is returned.
+        """
+        day = _iso(on_date)
+        query = """
+            SELECT * FROM tariffs t
+            WHERE t.service = ? AND t.effective_from <= ?
+              AND (t.effective_to IS NULL OR t.effective_to >= ?)
+              AND t.effective_from = (
+                  SELECT MAX(effective_from) FROM tariffs
+                  WHERE service = t.service AND supplier_name = t.supplier_name
+                    AND effective_from <= ?)
+        """
+        params = [service.strip().capitalize(), day, day, day]
+        if supplier is not None:
+            query += " AND t.supplier_name = ?"
+            params.append(supplier)
+        query += " ORDER BY t.supplier_name"
+        for row in self.conn.execute(query, params):
+            yield _split_tier_rates(dict(row))
+
+    def rate_table(self, service, on_date=None, supplier=None):
+        """Matching tariffs as a rate table for bill_engine.calculate_bills()."""
+        import pandas as pd
+
+        tariffs = list(self.iter_tariffs(service, on_date, supplier))
+        # Rates of tiers beyond the fixed columns, e.g. tier4_rate.
+        extra = sorted({key for tariff in tariffs for key in tariff
+                        if _TIER_RATE.fullmatch(key) and key not in RATE_FIELDS},
+                       key=lambda key: int(_TIER_RATE.fullmatch(key).group(1)))
+        df = pd.DataFrame(tariffs,
+                          columns=["id", "service", "supplier_name", "effective_from",
+                                   "effective_to"] + RATE_FIELDS + extra + TEXT_FIELDS)
+        df["supplier_type"] = "Prospective"
+        df["household"] = None
+        return df.astype({field: float for field in RATE_FIELDS + extra})
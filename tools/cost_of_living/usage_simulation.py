@@ -0,0 +1,136 @@
+# Monte Carlo usage-uncertainty simulation for the utility comparison tool.
+#
+# A single billing period is projected over a horizon (a year by default)
+# and many usage scenarios are drawn around it: a year-to-year level shift,
+# quarter-by-quarter seasonal swings and independent solar export variance.
+# Every tariff is priced against every scenario with the bill_engine
+# kernels. Tariffs are processed in blocks so the full tariff x scenario
+# matrix never has to be held in memory at once.
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from bill_engine import (ELECTRICITY_RATE_COLUMNS, GAS_RATE_COLUMNS, OPTIONAL_COLUMNS,
+                         electricity_costs, gas_costs)
+
+USAGE_KEYS = {
+    "Electricity": ["peak_usage", "offpeak_usage", "shoulder_usage"],
+    "Gas": ["tier1_units", "tier2_units", "tier3_units"],
+}
+
+# Maps calculate_bill() result columns back to rate_data keys.
+RATE_RESULT_COLUMNS = {
+    "peak_rate": "Peak Rate (c/kWh)",
+    "offpeak_rate": "Off-peak Rate (c/kWh)",
+    "shoulder_rate": "Shoulder Rate (c/kWh)",
+    "daily_supply_charge": "Daily Supply (c)",
+    "feed_in_rate": "Feed-in Rate (c/kWh)",
+    "tier1_rate": "Tier1 Rate (c/unit)",
+    "tier2_rate": "Tier2 Rate (c/unit)",
+    "tier3_rate": "Tier3 Rate (c/unit)",
+}
+
+
+def _lognormal(rng, sd, size):
+    # Mean-one multiplicative noise.
+    return rng.lognormal(mean=-sd ** 2 / 2, sigma=sd, size=size)
+
+
+def draw_scenarios(service, usage, n_scenarios=100_000, horizon_days=365,
+                   level_sd=0.10, seasonal_sd=0.20, solar_sd=0.25, seed=None):
+    """Usage arrays (one value per scenario) over ``horizon_days``."""
+    rng = np.random.default_rng(seed)
+    scale = horizon_days / usage["billing_days"]
+    seasonal = _lognormal(rng, seasonal_sd, (n_scenarios, 4)).mean(axis=1)
+    factor = _lognormal(rng, level_sd, n_scenarios) * seasonal * scale
+
+    scenarios = {key: usage.get(key, 0) * factor for key in USAGE_KEYS[service]}
+    scenarios["billing_days"] = np.full(n_scenarios, float(horizon_days))
+    if service == "Electricity":
+        scenarios["solar_export_kwh"] = usage.get("solar_export_kwh", 0) * scale * \
+            _lognormal(rng, solar_sd, n_scenarios)
+    return scenarios
+
+
+def rates_from_results(df, service):
+    """Rate table (one row per supplier) rebuilt from a comparison results table."""
+    rows = df[df["Service"].astype(str).str.strip().str.capitalize() == service]
+    rates = pd.DataFrame({
+        "supplier_name": rows["Supplier"].astype(str).str.strip().to_numpy(),
+        "supplier_type": rows["Supplier Type"].astype(str).str.strip().to_numpy(),
+    })
+    for key, col in RATE_RESULT_COLUMNS.items():
+        if col in rows.columns:
+            rates[key] = pd.to_numeric(rows[col], errors="coerce").to_numpy()
+    return rates
+
+
+def _price_block(service, scenarios, rates):
+    # Shaped (tariffs, scenarios) so per-tariff reductions run along contiguous memory.
+    if service == "Electricity":
+        u = [scenarios["peak_usage"], scenarios["offpeak_usage"], scenarios["billing_days"],
+             scenarios["solar_export_kwh"], scenarios["shoulder_usage"]]
+        r = []
+        for col in ELECTRICITY_RATE_COLUMNS:
+            values = rates[col] if col in rates else np.full(len(rates), np.nan)
+            values = np.asarray(values, dtype=float)
+            if col == "shoulder_rate":
+                values = np.where(np.isnan(values), np.asarray(rates["peak_rate"], dtype=float), values)
+            elif col in OPTIONAL_COLUMNS:
+                values = np.nan_to_num(values)
+            r.append(values)
+        net = electricity_costs(*[x[None, :] for x in u], *[x[:, None] for x in r])[2]
+    else:
+        u = [scenarios[col] for col in ["billing_days", "tier1_units", "tier2_units", "tier3_units"]]
+        r = [np.asarray(rates[col], dtype=float) for col in GAS_RATE_COLUMNS]
+        net = gas_costs(*[x[None, :] for x in u], *[x[:, None] for x in r])[2]
+    return net
+
+
+def nearest_rank(pct, n):
+    """0-based index of the nearest-rank ``pct`` percentile of ``n`` sorted values."""
+    # The smallest value with at least pct% of the values at or below it.
+    return min(max(math.ceil(pct * n / 100) - 1, 0), n - 1)
+
+
+def simulate_tariffs(service, usage, rates, n_scenarios=100_000, percentiles=(5, 50, 95),
+                     block_size=None, seed=None, **variation):
+    """Expected bill, percentiles and P(beats current) for every tariff.
+
+    ``rates`` is a rate table with supplier_name / supplier_type columns; the
+    first "Current" row is the baseline for "P(Beats Current)".
+    """
+    rates = rates.reset_index(drop=True)
+    scenarios = draw_scenarios(service, usage, n_scenarios, seed=seed, **variation)
+    # Keep each scenario x tariff block around 2M cells.
+    block_size = block_size or max(1, 2_000_000 // n_scenarios)
+
+    is_current = rates["supplier_type"].astype(str).str.strip().str.lower() == "current"
+    current_net = None
+    if is_current.any():
+        current_net = _price_block(service, scenarios, rates[is_current].iloc[:1])[0]
+
+    summaries = []
+    for start in range(0, len(rates), block_size):
+        block = rates.iloc[start:start + block_size]
+        net = _price_block(service, scenarios, block)
+        summary = {
+            "Supplier": block["supplier_name"].to_numpy(),
+            "Supplier Type": block["supplier_type"].to_numpy(),
+            "Expected Net ($)": net.mean(axis=1).round(2),
+        }
+        beats_current = None if current_net is None else (net < current_net).mean(axis=1)
+        ranks = [nearest_rank(pct, n_scenarios) for pct in percentiles]
+        net.partition(ranks, axis=1)
+        for pct, rank in zip(percentiles, ranks):
+            # Nearest-rank percentile read straight off the partitioned rows.
+            summary[f"P{pct:g} Net ($)"] = net[:, rank].round(2)
+        if beats_current is not None:
+            summary["P(Beats Current)"] = beats_current.round(3)
+        summaries.append(pd.DataFrame(summary))
+
+    result = pd.concat(summaries, ignore_index=True)
+    result.insert(0, "Service", service)
+    return result.sort_values("Expected Net ($)", kind="stable").reset_index(drop=True)
@@ -0,0 +1,139 @@
+# Integer-cents money arithmetic shared by the calculators in tools/.
+#
+# Amounts are held as whole cents: a Python int for a single amount or an
+# int64 NumPy array for many, and every function takes either. Sums and
+# differences of cents are exact; anything that multiplies or divides
+# (rates, days, super percentages) goes through one rounding step with an
+# explicit mode from the decimal module (ROUND_HALF_UP by default).
+#
+# Dollar floats are read as the decimal amount they were written as, so
+# 1.005 is a tie at half a cent even though its binary value is a little
+# under it. Scalar and array paths make the same decisions, so a batch run
+# gives the same cents as pricing each row on its own.
+#
+# NumPy is only imported for array arguments; scripts that import this
+# module for single amounts start without it.
+
+import math
+from decimal import (ROUND_CEILING, ROUND_DOWN, ROUND_FLOOR, ROUND_HALF_DOWN,
+                     ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_UP)
+from numbers import Real
+
+ROUNDING_MODES = (ROUND_HALF_UP, ROUND_HALF_EVEN, ROUND_HALF_DOWN,
+                  ROUND_DOWN, ROUND_UP, ROUND_FLOOR, ROUND_CEILING)
+_HALF_MODES = (ROUND_HALF_UP, ROUND_HALF_EVEN, ROUND_HALF_DOWN)
+
+# Relative distance within which a value counts as a whole number or an exact
+# half: float noise from multiplying decimal amounts is far smaller than this.
+_TOLERANCE = 1e-12
+
+
+def _is_scalar(value):
+    return type(value) in (int, float) or isinstance(value, Real)
+
+
+def _check_mode(rounding):
+    if rounding not in ROUNDING_MODES:
+        raise ValueError(f"Unknown rounding mode '{rounding}'")
+
+
+def _round_scalar(value, rounding):
+    if not math.isfinite(value):
+        raise ValueError(f"Cannot round {value} to cents")
+    tolerance = _TOLERANCE * abs(value) if abs(value) > 1.0 else _TOLERANCE
+    nearest = round(value)
+    off = abs(value - nearest)
+    if off <= tolerance:
+        return nearest
+    if rounding in _HALF_MODES:
+        if abs(off - 0.5) > tolerance:
+            return nearest
+        floor = math.floor(value)
+        if rounding == ROUND_HALF_UP:
+            return floor + 1 if value > 0 else floor
+        if rounding == ROUND_HALF_DOWN:
+            return floor if value > 0 else floor + 1
+        return floor + floor % 2  # ROUND_HALF_EVEN
+    floor = math.floor(value)
+    if rounding == ROUND_FLOOR:
+        return floor
+    if rounding == ROUND_CEILING:
+        return floor + 1
+    if rounding == ROUND_DOWN:
+        return floor if value > 0 else floor + 1
+    return floor + 1 if value > 0 else floor  # ROUND_UP
+
+
+def _round_array(values, rounding):
+    import numpy as np
+
+    _check_mode(rounding)
+    values = np.asarray(values, dtype=float)
+    if not np.isfinite(values).all():
+        raise ValueError("Cannot round NaN or infinite amounts to cents")
+    tolerance = _TOLERANCE * np.maximum(1.0, np.abs(values))
+    nearest = np.rint(values)
+    floor = np.floor(values)
+    positive = values > 0
+    if rounding == ROUND_FLOOR:
+        result = floor
+    elif rounding == ROUND_CEILING:
+        result = floor + 1
+    elif rounding == ROUND_DOWN:
+        result = np.where(positive, floor, floor + 1)
+    elif rounding == ROUND_UP:
+        result = np.where(positive, floor + 1, floor)
+    else:
+        if rounding == ROUND_HALF_UP:
+            tie = np.where(positive, floor + 1, floor)
+        elif rounding == ROUND_HALF_DOWN:
+            tie = np.where(positive, floor, floor + 1)
+        else:
+            tie = floor + floor % 2
+        result = np.where(np.abs(values - floor - 0.5) <= tolerance, tie, nearest)
+    result = np.where(np.abs(values - nearest) <= tolerance, nearest, result)
+    return result.astype(np.int64)
+
+
+def to_cents(amounts, rounding=ROUND_HALF_UP):
+    """Whole cents (int, or int64 array) for dollar amounts."""
+    if _is_scalar(amounts):
+        _check_mode(rounding)
+        return _round_scalar(float(amounts) * 100, rounding)
+    import numpy as np
+
+    return _round_array(np.asarray(amounts, dtype=float) * 100, rounding)
+
+
+def from_cents(cents):
+    """Dollars (float, or float array) for whole cents."""
+    if _is_scalar(cents):
+        return int(cents) / 100
+    import numpy as np
+
+    return np.asarray(cents, dtype=np.int64) / 100
+
+
+def round_money(amounts, rounding=ROUND_HALF_UP):
+    """Dollar amounts rounded to whole cents, still in dollars."""
+    return from_cents(to_cents(amounts, rounding))
+
+
+def scale_cents(cents, factor, rounding=ROUND_HALF_UP):
+    """cents x factor (a rate, day count or percentage), rounded to whole cents."""
+    if _is_scalar(cents) and _is_scalar(factor):
+        _check_mode(rounding)
+        return _round_scalar(int(cents) * float(factor), rounding)
+    import numpy as np
+
+    return _round_array(np.asarray(cents, dtype=np.int64) * np.asarray(factor, dtype=float), rounding)
+
+
+def divide_cents(cents, divisor, rounding=ROUND_HALF_UP):
+    """cents / divisor, rounded to whole cents."""
+    if _is_scalar(cents) and _is_scalar(divisor):
+        _check_mode(rounding)
+        return _round_scalar(int(cents) / float(divisor), rounding)
+    import numpy as np
+
+    return _round_array(np.asarray(cents, dtype=np.int64) / np.asarray(divisor, dtype=float), rounding)
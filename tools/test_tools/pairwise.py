@@ -1,20 +1,13 @@
 import csv
 import argparse
+import contextlib
 import os
-from itertools import combinations, product
-from random import choice
+import secrets
+import sys
+import time
 
-
-def generate_pairs(parameters):
-    pairs = []
-    for i in range(len(parameters)):
-        for j in range(i + 1, len(parameters)):
-            param1_name, param1_values = parameters[i]
-            param2_name, param2_values = parameters[j]
-            for value1 in param1_values:
-                for value2 in param2_values:
-                    pairs.append({param1_name: value1, param2_name: value2})
-    return pairs
+from pairwise_constraints import read_constraints
+from pairwise_engine import RowStream, covering_rows, decode, encode, seeded_runs
 
 
 def read_parameters_from_csv(filename):
@@ -25,7 +18,9 @@ def read_parameters_from_csv(filename):
         values_by_column = {header: [] for header in headers}
         for row in reader:
             for idx, value in enumerate(row):
-                values_by_column[headers[idx]].append(value)
+                # Shorter columns leave blank cells; a value listed twice is one value.
+                if value.strip() and value not in values_by_column[headers[idx]]:
+                    values_by_column[headers[idx]].append(value)
     for header in headers:
         parameters.append((header, values_by_column[header]))
     return parameters
@@ -40,66 +35,78 @@ def write_to_csv(filename, test_cases):
     print(f"Test cases successfully written to {filename}")
 
 
-def calculate_pairwise_test_cases(parameters):
-    pairs = generate_pairs(parameters)
-    uncovered_pairs = set(frozenset(pair.items()) for pair in pairs)
-    test_cases = []
+def stream_to_csv(filename, stream, out=None):
+    """Write a RowStream's test cases as each is generated; returns how many.
+
+    With ``out`` given (e.g. sys.stdout) rows go there and ``filename`` is
+    not opened. Every row is flushed so a reader can start on it at once.
+    """
+    csvfile = out or open(filename, 'w', newline='')
+    try:
+        writer = csv.writer(csvfile)
+        writer.writerow(stream.names)
+        count = 0
+        for row in stream:
+            writer.writerow([stream.values[p][v] for p, v in enumerate(row)])
+            csvfile.flush()
+            count += 1
+    finally:
+        if out is None:
+            csvfile.close()
+    return count
+
+
+class ProgressReporter:
+    """progress(cases, done, total) callback writing to stderr at most every ``interval`` seconds."""
+
+    def __init__(self, interval=1.0, file=sys.stderr):
+        self.interval = interval
+        self.file = file
+        self._last = None
+
+    def __call__(self, cases, done, total):
+        now = time.monotonic()
+        finished = done >= total
+        if not finished and self._last is not None and now - self._last < self.interval:
+            return
+        self._last = now
+        percent = 100.0 * done / total if total else 100.0
+        line = f"{cases} test cases, {percent:.1f}% done"
+        if self.file.isatty():
+            print("\r" + line, end="\n" if finished else "", file=self.file, flush=True)
+        else:
+            print(line, file=self.file, flush=True)
+
 
-    while uncovered_pairs:
-        test_case = {}
-        covered_in_this_case = set()
+def _report_test_cases(names, values, rows, excluded, constraints):
+    if constraints:
+        print(f"Combinations excluded by constraints: {excluded}")
+    return decode(rows, names, values)
 
-        # Iterate through each parameter to select values
-        for param, values in parameters:
-            value_coverage = {value: 0 for value in values}
 
-            for pair_set in uncovered_pairs:
-                pair_dict = dict(pair_set)
-                for value in values:
-                    if param in pair_dict and pair_dict[param] == value:
-                        value_coverage[value] += 1
+def calculate_pairwise_test_cases(parameters, strength=2, constraints=None, seed=None,
+                                  progress=None):
+    """Test cases covering every allowed combination of values of any ``strength`` parameters."""
+    return _report_test_cases(
+        *covering_rows(parameters, strength, constraints, seed, progress), constraints)
 
-            # Select value that covers the most uncovered pairs
-            selected_value = max(value_coverage, key=value_coverage.get)
-            test_case[param] = selected_value
 
-        # Identify pairs covered by this test case
-        for pair in pairs:
-            pair_set = frozenset(pair.items())
-            if pair_set in uncovered_pairs and all(test_case.get(k) == v for k, v in pair.items()):
-                covered_in_this_case.add(pair_set)
+def calculate_smallest_test_cases(parameters, seeds, strength=2, constraints=None, workers=None):
+    """Smallest suite of one randomized run per seed: (winning seed, test cases).
 
-        # Add test case only if it covers new pairs
-        if covered_in_this_case:
-            test_cases.append(test_case)
-            uncovered_pairs -= covered_in_this_case
-        else:
-            # Final pass to target specific remaining pairs
-            for pair_set in uncovered_pairs.copy():
-                pair_dict = dict(pair_set)
-                new_test_case = {param: choice(values)
-                                 for param, values in parameters}
-                new_test_case.update(pair_dict)
-                test_cases.append(new_test_case)
-                uncovered_pairs -= {pair_set}
-                break
-
-        print(f"Generated test case: {test_case}")
-        print(f"Remaining uncovered pairs: {len(uncovered_pairs)}")
-
-    # Consolidation pass to further reduce test cases
-    print("Consolidating test cases to minimize redundancy...")
-    consolidated_cases = []
-    seen_pairs = set()
-
-    for case in test_cases:
-        new_pairs = set(frozenset(pair.items()) for pair in generate_pairs(
-            [(k, [v]) for k, v in case.items()]))
-        if not seen_pairs.intersection(new_pairs):
-            consolidated_cases.append(case)
-            seen_pairs.update(new_pairs)
-
-    return consolidated_cases
+    A seed of None is the plain deterministic run. Every seed is reported,
+    so any run can be regenerated exactly with
+    calculate_pairwise_test_cases(..., seed=seed).
+    """
+    best = None
+    for seed, rows, excluded in seeded_runs(parameters, seeds, strength, constraints, workers):
+        print(f"Seed {seed}: {len(rows)} test cases")
+        if best is None or len(rows) < len(best[1]):
+            best = (seed, rows, excluded)
+    seed, rows, excluded = best
+    print(f"Smallest suite: seed {seed} ({len(rows)} test cases)")
+    names, values, _ = encode(parameters)
+    return seed, _report_test_cases(names, values, rows, excluded, constraints)
 
 
 def main():
@@ -109,26 +116,98 @@ def main():
     parser.add_argument('--input', type=str,
                         help='Input CSV file path', default=input_file)
     parser.add_argument('--output', type=str,
-                        help='Output CSV file path', default=output_file)
+                        help="Output CSV file path ('-' streams to stdout)", default=output_file)
+    parser.add_argument('--strength', type=int, default=2,
+                        help='Cover every combination of this many parameters (2 = pairwise, 3, 4 ...)')
+    parser.add_argument('--constraints', type=str,
+                        help='File of forbidden combinations and IF ... THEN ... rules')
+    parser.add_argument('--runs', type=int, default=1,
+                        help='Randomized runs to try, keeping the smallest suite')
+    parser.add_argument('--seed', type=int,
+                        help='Seed of a randomized run; with --runs, the first of seed, seed+1 ...')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='Worker processes for --runs (1 runs in this process)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Write each test case as soon as it is generated')
+    parser.add_argument('--quiet', action='store_true', help='No progress reports')
     args = parser.parse_args()
-
+    if args.strength < 2:
+        parser.error("--strength must be at least 2")
+    if args.runs < 1:
+        parser.error("--runs must be at least 1")
+    if args.output == '-':
+        args.stream = True
+    if args.stream and args.runs > 1:
+        parser.error("--stream writes a single run; use --runs 1")
+
+    if args.output == '-':
+        # stdout carries only the test cases; messages go to stderr.
+        out = sys.stdout
+        try:
+            with contextlib.redirect_stdout(sys.stderr):
+                _run(parser, args, out)
+        except BrokenPipeError:
+            # The reader stopped early (e.g. "| head"), which is not an error:
+            # drop the unwritten rows quietly and exit with status 0.
+            os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+            sys.exit(0)
+    else:
+        _run(parser, args)
+
+
+def _run(parser, args, out=None):
+    """Generate and write the suite; ``out`` is the stream for '-' output."""
     parameters = read_parameters_from_csv(args.input)
+    constraints = None
+    if args.constraints:
+        try:
+            constraints = read_constraints(args.constraints, parameters)
+        except ValueError as e:
+            parser.error(str(e))
 
     total_combinations = 1
     for param in parameters:
         total_combinations *= len(param[1])
 
-    pairwise_test_cases = calculate_pairwise_test_cases(parameters)
+    method = "pairwise" if args.strength == 2 else f"{args.strength}-way"
+    progress = None if args.quiet else ProgressReporter()
+    if args.stream:
+        output_file = args.output if out else _prefixed(args.output)
+        stream = RowStream(parameters, args.strength, constraints, args.seed, progress)
+        count = stream_to_csv(output_file, stream, out)
+        if constraints:
+            print(f"Combinations excluded by constraints: {stream.excluded}")
+        print(f"Total combinations without {method}: {total_combinations}")
+        print(f"Total test cases using {method}: {count}")
+        if not out:
+            print(f"Test cases successfully written to {output_file}")
+        return
+
+    if args.runs > 1:
+        first_seed = args.seed if args.seed is not None else secrets.randbits(32)
+        # The deterministic run takes part too, so more runs never do worse.
+        seeds = [None] + list(range(first_seed, first_seed + args.runs - 1))
+        seed, pairwise_test_cases = calculate_smallest_test_cases(
+            parameters, seeds, args.strength, constraints, args.workers)
+        if seed is None:
+            print("Regenerate this suite with --runs 1 and no --seed")
+        else:
+            print(f"Regenerate this suite with --seed {seed} --runs 1")
+    else:
+        pairwise_test_cases = calculate_pairwise_test_cases(
+            parameters, args.strength, constraints, args.seed, progress)
     pairwise_test_cases_count = len(pairwise_test_cases)
 
-    print(f"Total combinations without pairwise: {total_combinations}")
-    print(f"Total test cases using pairwise: {pairwise_test_cases_count}")
+    print(f"Total combinations without {method}: {total_combinations}")
+    print(f"Total test cases using {method}: {pairwise_test_cases_count}")
+
+    write_to_csv(_prefixed(args.output), pairwise_test_cases)
+
 
-    output_dir = os.path.dirname(output_file)
-    output_filename = os.path.basename(output_file)
-    pairwise_output_file = os.path.join(
-        output_dir, 'pairwise_' + output_filename)
-    write_to_csv(pairwise_output_file, pairwise_test_cases)
+def _prefixed(output):
+    output_dir = os.path.dirname(output)
+    output_filename = os.path.basename(output)
+    return os.path.join(output_dir, 'pairwise_' + output_filename)
 
 
 if __name__ == "__main__":
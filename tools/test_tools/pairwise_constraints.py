@@ -0,0 +1,189 @@
+# Constraints for pairwise.py: combinations of values that must never be
+# put in a test case.
+#
+# A constraints file lists one rule per line; blank lines and lines starting
+# with "#" are ignored. A rule is either a forbidden combination (all of its
+# conditions together are invalid) or an IF ... THEN ... predicate:
+#   Browser = Safari, OS = Windows
+#   Browser = IE AND OS in (macOS, Linux)
+#   IF Browser = Safari THEN OS = macOS
+#   IF OS = Linux THEN Browser not in (IE, Safari)
+# Conditions are "Parameter = value", "!=", "in (a, b)" or "not in (a, b)",
+# separated by "," or "AND"; "in" takes a parenthesised list. Values may be
+# quoted if they contain commas.
+#
+# Every rule is compiled to forbidden clauses: for each parameter in the
+# clause, the set of its values (a boolean mask) that takes part. A partial
+# test case breaks a clause only when all of the clause's parameters are
+# set to values in their masks, so the engine can ask which values of one
+# parameter are still allowed by checking just the clauses on it.
+
+import csv
+import re
+
+import numpy as np
+
+from pairwise_engine import DONT_CARE
+
+_EQUALS = re.compile(r"!=|=")
+_IN = re.compile(r"\s+(?:not\s+)?in\s*(?=\()", re.IGNORECASE)
+_PREDICATE = re.compile(r"^\s*IF\s+(.+?)\s+THEN\s+(.+?)\s*$", re.IGNORECASE)
+_AND = re.compile(r"\s+AND\s+", re.IGNORECASE)
+
+
+def _split_conditions(text):
+    """Top-level "," / AND separated conditions (commas inside (...) or quotes are kept)."""
+    parts, depth, quoted, current = [], 0, False, ""
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == "," and not depth and not quoted:
+            parts.append(current)
+            current = ""
+        else:
+            current += char
+    parts.append(current)
+    return [piece.strip() for part in parts for piece in _AND.split(part) if piece.strip()]
+
+
+def _values(text):
+    text = text.strip()
+    if text.startswith("(") and text.endswith(")"):
+        return next(csv.reader([text[1:-1]], skipinitialspace=True))
+    return [text]
+
+
+class Constraints:
+    """Forbidden clauses over a [(name, [values])] model."""
+
+    def __init__(self, parameters):
+        self.names = [name for name, _ in parameters]
+        self.values = [list(values) for _, values in parameters]
+        k = max((len(values) for values in self.values), default=0)
+        self.valid = [np.arange(k) < len(values) for values in self.values]
+        self.clauses = []
+        # by_param[p]: (mask of p's values, [(other param, its mask)]) per clause on p.
+        self.by_param = [[] for _ in parameters]
+
+    def __bool__(self):
+        return bool(self.clauses)
+
+    def _condition(self, text):
+        """(param, mask) of values that satisfy "Name op value(s)"."""
+        match = _EQUALS.search(text) or _IN.search(text)
+        if not match:
+            raise ValueError(f"expected 'Parameter = value', got '{text}'")
+        name = text[:match.start()].strip()
+        if name not in self.names:
+            raise ValueError(f"unknown parameter '{name}'")
+        param = self.names.index(name)
+        mask = np.zeros(len(self.valid[param]), dtype=bool)
+        for value in _values(text[match.end():]):
+            value = value.strip().strip('"')
+            if value not in self.values[param]:
+                raise ValueError(f"'{value}' is not a value of {name}")
+            mask[self.values[param].index(value)] = True
+        if " ".join(match.group().split()).lower() in ("!=", "not in"):
+            mask = self.valid[param] & ~mask
+        return param, mask
+
+    def add_clause(self, conditions):
+        """Forbid every test case that meets all (param, mask) conditions."""
+        masks = {}
+        for param, mask in conditions:
+            masks[param] = masks.get(param, self.valid[param]) & mask
+        if not all(mask.any() for mask in masks.values()):
+            return  # can never match
+        clause = sorted(masks.items())
+        self.clauses.append(clause)
+        for param, mask in clause:
+            self.by_param[param].append(
+                (mask, [(other, other_mask) for other, other_mask in clause if other != param]))
+
+    def add_rule(self, text):
+        predicate = _PREDICATE.match(text)
+        if predicate:
+            condition = [self._condition(part) for part in _split_conditions(predicate.group(1))]
+            # IF A THEN B1, B2 forbids A with the opposite of each Bi.
+            for param, mask in (self._condition(part)
+                                for part in _split_conditions(predicate.group(2))):
+                self.add_clause(condition + [(param, self.valid[param] & ~mask)])
+        else:
+            self.add_clause([self._condition(part) for part in _split_conditions(text)])
+
+    def reordered(self, order):
+        """The same constraints over the model's parameters taken in ``order``."""
+        constraints = Constraints([(self.names[p], self.values[p]) for p in order])
+        position = {p: i for i, p in enumerate(order)}
+        for clause in self.clauses:
+            constraints.add_clause([(position[p], mask) for p, mask in clause])
+        return constraints
+
+    def involves(self, param):
+        return bool(self.by_param[param])
+
+    def allowed(self, param, row):
+        """Mask of the values of ``param`` that break no clause given the other values set in ``row``."""
+        allowed = self.valid[param]
+        for mask, others in self.by_param[param]:
+            for other, other_mask in others:
+                value = row[other]
+                if value == DONT_CARE or not other_mask[value]:
+                    break
+            else:
+                allowed = allowed & ~mask
+        return allowed
+
+    def accepts(self, row):
+        """True when the fully set ``row`` breaks no clause."""
+        return not any(all(mask[row[param]] for param, mask in clause)
+                       for clause in self.clauses)
+
+    def complete(self, row, budget=10000):
+        """Copy of ``row`` with its constrained don't-cares filled so no clause is broken.
+
+        Returns None when no such completion exists (or none is found within
+        ``budget`` search steps). Unconstrained parameters are left as they are.
+        """
+        row = np.array(row, dtype=np.int64)
+        for param, value in enumerate(row):
+            if value != DONT_CARE and self.by_param[param] and not self.allowed(param, row)[value]:
+                return None
+        todo = [param for param in range(len(row))
+                if row[param] == DONT_CARE and self.by_param[param]]
+        steps = [budget]
+
+        def search(i):
+            if i == len(todo):
+                return True
+            param = todo[i]
+            for value in np.flatnonzero(self.allowed(param, row)):
+                steps[0] -= 1
+                if steps[0] < 0:
+                    return False
+                row[param] = value
+                if search(i + 1):
+                    return True
+            row[param] = DONT_CARE
+            return False
+
+        return row if search(0) else None
+
+
+def read_constraints(filename, parameters):
+    """Constraints for ``parameters`` from a rules file (see the top of this module)."""
+    constraints = Constraints(parameters)
+    with open(filename, 'r') as rules:
+        for line_number, line in enumerate(rules, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                constraints.add_rule(line)
+            except ValueError as e:
+                raise ValueError(f"{filename}:{line_number}: {e}") from None
+    return constraints
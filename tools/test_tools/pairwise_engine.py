@@ -0,0 +1,453 @@
+# Integer-encoded coverage engine for pairwise.py.
+#
+# Parameters and their values are encoded as integers (parameter p, value
+# index v < sizes[p]) and the uncovered pairs are kept in one boolean array
+# indexed [p, q, v, w], filled in both orientations so that "which values of
+# q still pair with value v of p" is a single slice. Alongside it the engine
+# keeps, for every parameter value, how many uncovered pairs it still takes
+# part in.
+#
+# Test cases are built greedily, AETG style: start from an uncovered pair
+# through the parameter value with the most uncovered pairs, then give every
+# other parameter the value that covers the most new pairs with the values
+# already chosen (ties go to the value with more pairs still to cover, then
+# the first). Each case is an indexed lookup per parameter and always covers
+# at least one new pair.
+#
+# Given a random generator the remaining ties are broken at random and the
+# parameters are visited in a random order, so differently seeded runs give
+# different (often smaller) suites while the same seed always gives the
+# same suite. seeded_runs() tries many seeds in a process pool.
+#
+# Generators take an optional progress(cases, done, total) callback, called
+# as work completes: pairs covered (or excluded) of all pairs for pairwise,
+# parameters added of all parameters for IPOG. RowStream yields rows as soon
+# as they are final instead of collecting the suite first.
+
+import multiprocessing
+from itertools import combinations, product
+
+import numpy as np
+
+# Value of a parameter not chosen yet (or free to take any value).
+DONT_CARE = -1
+
+
+def encode(parameters):
+    """(names, values, sizes) for a [(name, [values])] model."""
+    names = [name for name, _ in parameters]
+    values = [list(param_values) for _, param_values in parameters]
+    sizes = [len(param_values) for param_values in values]
+    if any(size == 0 for size in sizes):
+        empty = [name for name, size in zip(names, sizes) if size == 0]
+        raise ValueError(f"Parameters with no values: {', '.join(empty)}")
+    return names, values, sizes
+
+
+def decode(rows, names, values):
+    """Test case dicts for encoded rows."""
+    return [{name: values[p][v] for p, (name, v) in enumerate(zip(names, row))}
+            for row in rows]
+
+
+def _shuffle_ties(score, rng):
+    """Integer scores with equal ones put in random order (negatives stay negative)."""
+    return np.where(score >= 0, score + rng.random(len(score)), -1.0)
+
+
+def choose_value(score, param, row, constraints=None, rng=None):
+    """Highest-scoring value of ``param`` for ``row`` (negative scores are never chosen).
+
+    With constraints only values allowed next to the rest of the row are
+    considered, and only if the row can still be completed validly.
+    Returns DONT_CARE when no value qualifies; ties are broken by ``rng``
+    if given, else by value order.
+    """
+    if rng is not None:
+        score = _shuffle_ties(score, rng)
+    if constraints and constraints.involves(param):
+        score = np.where(constraints.allowed(param, row)[:len(score)], score, -1)
+        trial = row.copy()
+        for value in np.argsort(-score, kind="stable"):
+            if score[value] < 0:
+                break
+            trial[param] = value
+            if constraints.complete(trial) is not None:
+                return int(value)
+        return DONT_CARE
+    value = int(np.argmax(score))
+    return value if score[value] >= 0 else DONT_CARE
+
+
+class PairCoverage:
+    """Uncovered pairs of a model with ``sizes[p]`` values per parameter."""
+
+    def __init__(self, sizes, constraints=None):
+        self.sizes = np.asarray(sizes, dtype=np.int64)
+        n = len(sizes)
+        k = int(self.sizes.max()) if n else 0
+        valid = np.arange(k)[None, :] < self.sizes[:, None]  # (n, k)
+        self.uncovered = valid[:, None, :, None] & valid[None, :, None, :]
+        self.uncovered[np.arange(n), np.arange(n)] = False
+        self.first, self.second = np.triu_indices(n, 1)
+        pairs = int(self.uncovered.sum()) // 2
+        # Pairs a constraint on one or two parameters forbids are never coverable.
+        for clause in (constraints.clauses if constraints else []):
+            if len(clause) == 1:
+                (param, mask), = clause
+                self.uncovered[param, :, mask, :] = False
+                self.uncovered[:, param, :, mask] = False
+            elif len(clause) == 2:
+                (param, mask), (other, other_mask) = clause
+                forbidden = mask[:, None] & other_mask[None, :]
+                self.uncovered[param, other] &= ~forbidden
+                self.uncovered[other, param] &= ~forbidden.T
+        # Uncovered pairs each parameter value takes part in.
+        self.remaining = self.uncovered.sum(axis=(1, 3))
+        self.total = int(self.remaining.sum()) // 2
+        self.excluded = pairs - self.total
+        self._invalid = ~valid
+
+    def pair_gains(self, param, value):
+        """(parameters, values) array: 1 where pairing with ``value`` of ``param`` is new.
+
+        Summing these over the values fixed so far in a test case gives, for
+        every other parameter value, the new pairs it would cover.
+        """
+        return self.uncovered[param, :, value, :]
+
+    def best_value(self, param, gains, row, constraints=None, rng=None):
+        """Value of ``param`` to choose, given its row of the summed pair gains."""
+        # Most new pairs, then most pairs left to cover, then the first value.
+        score = gains * (self.total + 1) + self.remaining[param]
+        score[self._invalid[param]] = -1
+        return choose_value(score, param, row, constraints, rng)
+
+    def seed(self, rng=None):
+        """An uncovered pair ((param, value), (param, value)) to start a test case from.
+
+        The first value is the one with the most uncovered pairs, its partner
+        the one of those with the most pairs left itself.
+        """
+        remaining = self.remaining
+        if rng is not None:
+            remaining = remaining + rng.random(remaining.shape)
+        param, value = np.unravel_index(np.argmax(remaining), remaining.shape)
+        partners = np.where(self.uncovered[param, :, value, :], remaining, -1)
+        other, other_value = np.unravel_index(np.argmax(partners), partners.shape)
+        return (int(param), int(value)), (int(other), int(other_value))
+
+    def exclude(self, pair):
+        """Stop tracking a pair no valid test case can hold."""
+        (param, value), (other, other_value) = pair
+        self.uncovered[param, other, value, other_value] = False
+        self.uncovered[other, param, other_value, value] = False
+        self.remaining[param, value] -= 1
+        self.remaining[other, other_value] -= 1
+        self.total -= 1
+        self.excluded += 1
+
+    def row_pairs(self, row):
+        return row[self.first], row[self.second]
+
+    def cover(self, row):
+        """Mark every pair in ``row`` (an int array) covered; returns how many were new."""
+        a, b = self.row_pairs(row)
+        new = self.uncovered[self.first, self.second, a, b]
+        p, q, a, b = self.first[new], self.second[new], a[new], b[new]
+        self.uncovered[p, q, a, b] = False
+        self.uncovered[q, p, b, a] = False
+        np.subtract.at(self.remaining, (p, a), 1)
+        np.subtract.at(self.remaining, (q, b), 1)
+        count = int(new.sum())
+        self.total -= count
+        return count
+
+
+def greedy_rows(sizes, coverage=None, constraints=None, rng=None, progress=None):
+    """Yield encoded test cases (int arrays) until every coverable pair is covered."""
+    coverage = coverage or PairCoverage(sizes, constraints)
+    n = len(sizes)
+    total = coverage.total
+    cases = 0
+    while coverage.total:
+        row = np.full(n, DONT_CARE, dtype=np.int64)
+        seed = coverage.seed(rng)
+        for param, value in seed:
+            row[param] = value
+        if constraints and constraints.complete(row) is None:
+            coverage.exclude(seed)
+            continue
+        gains = np.zeros(coverage.remaining.shape, dtype=np.int64)
+        for param, value in seed:
+            gains += coverage.pair_gains(param, value)
+        order = range(n) if rng is None else rng.permutation(n)
+        for i, param in enumerate(order):
+            if row[param] != DONT_CARE:
+                continue
+            row[param] = coverage.best_value(param, gains[param], row, constraints, rng)
+            if row[param] == DONT_CARE:
+                # No value could be checked against the constraints (the
+                # completion search ran out of budget); complete() fills it below.
+                continue
+            # Parameters visited before this one already have their values.
+            later = slice(param + 1, None) if rng is None else order[i + 1:]
+            gains[later] += coverage.pair_gains(param, row[param])[later]
+        if constraints:
+            completed = constraints.complete(row)
+            if completed is None:
+                coverage.exclude(seed)
+                continue
+            row = completed
+            assert constraints.accepts(row), "greedy_rows built a test case that breaks a constraint"
+        coverage.cover(row)
+        cases += 1
+        if progress:
+            progress(cases, total - coverage.total, total)
+        yield row
+
+
+def drop_redundant(rows, sizes):
+    """Rows without those whose every pair is also covered by another kept row.
+
+    Later rows (the small greedy fill-ins) are considered for removal first.
+    """
+    if len(sizes) < 2 or not rows:
+        return list(rows)
+    k = max(sizes)
+    first, second = np.triu_indices(len(sizes), 1)
+    base = np.arange(len(first)) * k * k
+    ids = [base + row[first] * k + row[second] for row in rows]
+    counts = np.zeros(len(first) * k * k, dtype=np.int32)
+    for row_ids in ids:
+        counts[row_ids] += 1  # ids within a row are distinct
+    keep = [True] * len(rows)
+    for r in range(len(rows) - 1, -1, -1):
+        if counts[ids[r]].min() >= 2:
+            counts[ids[r]] -= 1
+            keep[r] = False
+    return [row for row, kept in zip(rows, keep) if kept]
+
+
+def pairwise_rows(parameters, constraints=None, rng=None, progress=None):
+    """Encoded pairwise suite for a [(name, [values])] model.
+
+    Returns (names, values, rows, excluded), ``excluded`` being the number
+    of pairs the constraints rule out.
+    """
+    names, values, sizes = encode(parameters)
+    if len(sizes) < 2:
+        # No pairs to cover; still use every (allowed) value once.
+        rows = [np.array([v]) for v in range(sizes[0])] if sizes else []
+        if constraints:
+            rows = [row for row in rows if constraints.complete(row) is not None]
+        return names, values, rows, 0
+    coverage = PairCoverage(sizes, constraints)
+    rows = drop_redundant(list(greedy_rows(sizes, coverage, constraints, rng, progress)), sizes)
+    return names, values, rows, coverage.excluded
+
+
+# === t-way (IPOG) ===
+#
+# For strength t > 2 suites grow in parameter order (IPOG). The first t
+# parameters start as every combination of their values; each further
+# parameter p is then added in two steps:
+#   horizontal - every existing row gets the value of p that covers the
+#                most uncovered t-tuples (left as don't-care if none does);
+#   vertical   - each tuple still uncovered goes into the first row whose
+#                don't-cares allow it, or into a new row.
+# Only tuples involving p are tracked while p is added: one boolean array
+# per combination of t-1 earlier parameters, with the earlier values packed
+# into one mixed-radix code, so memory is bounded by the current step
+# rather than by every t-tuple of the model.
+#
+# With constraints, values are only chosen and tuples only placed where the
+# row can still be completed validly; tuples that cannot are dropped.
+
+
+class TupleCoverage:
+    """Uncovered t-tuples between parameter ``param`` and every t-1 earlier parameters."""
+
+    def __init__(self, sizes, param, strength):
+        k = max(sizes)
+        self.combos = np.array(list(combinations(range(param), strength - 1)), dtype=np.int64)
+        self.radix = k ** np.arange(strength - 1, dtype=np.int64)
+        digits = (np.arange(k ** (strength - 1))[:, None] // self.radix) % k
+        earlier = np.asarray(sizes, dtype=np.int64)[self.combos]  # (combos, t-1)
+        valid = (digits[None, :, :] < earlier[:, None, :]).all(axis=2)
+        # uncovered[combo, code of the earlier values, value of param]
+        self.uncovered = np.repeat(valid[:, :, None], sizes[param], axis=2)
+        self.digits = digits
+        self.param = param
+
+    def codes(self, row):
+        """(combos whose earlier values are all set in ``row``, their codes)."""
+        earlier = row[self.combos]
+        known = np.flatnonzero((earlier != DONT_CARE).all(axis=1))
+        return known, earlier[known] @ self.radix
+
+    def best_value(self, row, constraints=None, rng=None):
+        """Value of the parameter covering the most tuples with ``row``, or DONT_CARE."""
+        known, codes = self.codes(row)
+        gains = self.uncovered[known, codes, :].sum(axis=0)
+        return choose_value(np.where(gains > 0, gains, -1), self.param, row, constraints, rng)
+
+    def cover(self, row):
+        if row[self.param] == DONT_CARE:
+            return
+        known, codes = self.codes(row)
+        self.uncovered[known, codes, row[self.param]] = False
+
+    def remaining(self):
+        """(combo, code, value) index arrays of the tuples uncovered right now."""
+        return np.nonzero(self.uncovered)
+
+    def tuple_at(self, combo, code, value):
+        """(columns, values) of one tracked tuple."""
+        return (np.append(self.combos[combo], self.param),
+                np.append(self.digits[code], value))
+
+
+def ipog_rows(sizes, strength, constraints=None, rng=None, progress=None):
+    """Encoded t-way suite for ``sizes`` values per parameter: (rows, excluded tuples)."""
+    n = len(sizes)
+    if n <= strength:
+        rows = [np.array(values) for values in product(*(range(size) for size in sizes))]
+        valid = [row for row in rows if not constraints or constraints.complete(row) is not None]
+        return valid, len(rows) - len(valid)
+    # Largest parameters first, as IPOG does (equal sizes in random order
+    # given a generator); columns go back in model order.
+    order = np.arange(n) if rng is None else rng.permutation(n)
+    order = order[np.argsort(-np.asarray(sizes)[order], kind="stable")]
+    restore = np.argsort(order)
+    if constraints:
+        constraints = constraints.reordered(order)
+    rows, excluded = _ipog([sizes[p] for p in order], strength, constraints, rng, progress)
+    return list(rows[:, restore]), excluded
+
+
+def _ipog(sizes, strength, constraints, rng, progress):
+    n = len(sizes)
+    rows = np.full((int(np.prod(sizes[:strength])), n), DONT_CARE, dtype=np.int64)
+    rows[:, :strength] = list(product(*(range(size) for size in sizes[:strength])))
+    if constraints:
+        rows = rows[[constraints.complete(row) is not None for row in rows]]
+    count = len(rows)
+    excluded = int(np.prod(sizes[:strength])) - count
+
+    for param in range(strength, n):
+        coverage = TupleCoverage(sizes, param, strength)
+
+        # Horizontal growth: extend every existing row.
+        for row in rows[:count]:
+            row[param] = coverage.best_value(row, constraints, rng)
+            coverage.cover(row)
+
+        # Vertical growth: place each tuple still uncovered. Filling a
+        # don't-care can cover later tuples too, so each is checked again.
+        for combo, code, value in zip(*coverage.remaining()):
+            if not coverage.uncovered[combo, code, value]:
+                continue
+            columns, values = coverage.tuple_at(combo, code, value)
+            if constraints:
+                alone = np.full(n, DONT_CARE, dtype=np.int64)
+                alone[columns] = values
+                if constraints.complete(alone) is None:
+                    coverage.uncovered[combo, code, value] = False
+                    excluded += 1
+                    continue
+            cells = rows[:count, columns]
+            target = None
+            for fit in np.flatnonzero(((cells == values) | (cells == DONT_CARE)).all(axis=1)):
+                trial = rows[fit].copy()
+                trial[columns] = values
+                if not constraints or constraints.complete(trial) is not None:
+                    target = fit
+                    break
+            if target is None:
+                if count == len(rows):
+                    rows = np.vstack([rows, np.full_like(rows, DONT_CARE)])
+                target = count
+                count += 1
+            rows[target, columns] = values
+            coverage.cover(rows[target])
+        if progress:
+            progress(count, param + 1, n)
+
+    rows = rows[:count]
+    if constraints:
+        for r in range(count):
+            rows[r] = constraints.complete(rows[r])
+    # Remaining don't-cares can take any value; use the first.
+    rows[rows == DONT_CARE] = 0
+    return rows, excluded
+
+
+def covering_rows(parameters, strength=2, constraints=None, seed=None, progress=None):
+    """Encoded suite covering every ``strength``-way combination the constraints allow.
+
+    Returns (names, values, rows, excluded), ``excluded`` being the number of
+    combinations ruled out. Strength 2 uses the greedy pair engine, higher
+    strengths IPOG. With a ``seed`` ties are broken at random, reproducibly.
+    """
+    if strength < 2:
+        raise ValueError("strength must be at least 2")
+    rng = None if seed is None else np.random.default_rng(seed)
+    if strength == 2:
+        return pairwise_rows(parameters, constraints, rng, progress)
+    names, values, sizes = encode(parameters)
+    rows, excluded = ipog_rows(sizes, strength, constraints, rng, progress)
+    return names, values, rows, excluded
+
+
+class RowStream:
+    """Encoded rows of a covering_rows() suite, yielded as soon as each is final.
+
+    Pairwise rows come straight from the greedy generator, so the
+    redundant-row pass is skipped and the suite can be a little larger;
+    IPOG rows only become final once every parameter is added. ``excluded``
+    is complete once the stream is exhausted.
+    """
+
+    def __init__(self, parameters, strength=2, constraints=None, seed=None, progress=None):
+        if strength < 2:
+            raise ValueError("strength must be at least 2")
+        self.parameters = parameters
+        self.names, self.values, self.sizes = encode(parameters)
+        self.strength = strength
+        self.constraints = constraints
+        self.seed = seed
+        self.progress = progress
+        self.excluded = 0
+
+    def __iter__(self):
+        if self.strength > 2 or len(self.sizes) < 2:
+            _, _, rows, self.excluded = covering_rows(
+                self.parameters, self.strength, self.constraints, self.seed, self.progress)
+            yield from rows
+            return
+        rng = None if self.seed is None else np.random.default_rng(self.seed)
+        coverage = PairCoverage(self.sizes, self.constraints)
+        for row in greedy_rows(self.sizes, coverage, self.constraints, rng, self.progress):
+            self.excluded = coverage.excluded
+            yield row
+        self.excluded = coverage.excluded
+
+
+# === Multi-run ===
+
+
+def _seeded_run(task):
+    parameters, strength, constraints, seed = task
+    _, _, rows, excluded = covering_rows(parameters, strength, constraints, seed)
+    return seed, rows, excluded
+
+
+def seeded_runs(parameters, seeds, strength=2, constraints=None, workers=None):
+    """Yield (seed, rows, excluded) for one randomized covering_rows() run per seed, in seed order."""
+    tasks = ((parameters, strength, constraints, seed) for seed in seeds)
+    if workers == 1:
+        yield from map(_seeded_run, tasks)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap(_seeded_run, tasks)